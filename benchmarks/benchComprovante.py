@@ -0,0 +1,81 @@
+"""
+Compara o pico de memória da conversão de um comprovante em PDF para imagem na forma
+antiga (todas as páginas na resolução padrão, concatenadas em uma imagem do tamanho
+da soma das alturas) com a conversão atual, limitada por `config.*_COMPROVANTE`.
+
+Cada conversão é executada em um processo separado, para que o pico de memória
+residente (ru_maxrss) de uma não influencie a outra. Requer o poppler instalado, como
+a própria aplicação.
+
+Uso: python -m benchmarks.benchComprovante [quantidade de páginas]
+"""
+
+import io
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from pdf2image import convert_from_bytes
+from PIL import Image, ImageDraw
+
+from src.img.operacoesImagem import armazenaComprovante
+
+
+def geraPdf(paginas: int) -> bytes:
+    """
+    Gera um PDF com `paginas` páginas A4 com algum conteúdo.
+    """
+    imagens = []
+    for i in range(paginas):
+        imagem = Image.new("RGB", (1240, 1754), "white")
+        ImageDraw.Draw(imagem).text((100, 100), f"Comprovante - página {i + 1}", fill="black")
+        imagens.append(imagem)
+
+    saida = io.BytesIO()
+    imagens[0].save(saida, "PDF", save_all=True, append_images=imagens[1:], resolution=150)
+    return saida.getvalue()
+
+
+def converteAntigo(arquivoPdf: bytes, destino: Path) -> None:
+    imagens = convert_from_bytes(arquivoPdf)
+    largura = max(imagem.width for imagem in imagens)
+    altura = sum(imagem.height for imagem in imagens)
+    saida = Image.new("RGB", (largura, altura))
+    posY = 0
+    for imagem in imagens:
+        saida.paste(imagem, (0, posY))
+        posY += imagem.height
+    saida.save(destino / "antigo.png")
+
+
+def converteAtual(arquivoPdf: bytes, destino: Path) -> None:
+    from src.config import config
+
+    config.ARMAZENAMENTO = "local"
+    config.CAMINHO_IMAGEM = destino
+    assert armazenaComprovante(arquivoPdf) is not None
+
+
+def mede(funcao, arquivoPdf: bytes, destino: str, fila) -> None:
+    inicio = time.perf_counter()
+    funcao(arquivoPdf, Path(destino))
+    fila.put((time.perf_counter() - inicio, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+
+
+if __name__ == "__main__":
+    paginas = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    arquivoPdf = geraPdf(paginas)
+    print(f"PDF com {paginas} páginas ({len(arquivoPdf) / 1024:.0f} KiB)")
+
+    contexto = multiprocessing.get_context("spawn")
+    for nome, funcao in [("antigo", converteAntigo), ("atual", converteAtual)]:
+        with tempfile.TemporaryDirectory() as destino:
+            fila = contexto.Queue()
+            processo = contexto.Process(target=mede, args=(funcao, arquivoPdf, destino, fila))
+            processo.start()
+            duracao, picoKb = fila.get()
+            processo.join()
+        print(f"{nome:>7}: {duracao:6.2f} s, pico de memória {picoKb / 1024:7.1f} MiB")
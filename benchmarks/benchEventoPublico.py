@@ -0,0 +1,167 @@
+"""
+Compara, para um evento com 5.000 inscrições na coleção `inscricoes`, três leituras:
+
+- `inscritos`: o evento completo com as suas inscrições (`EventoBD.buscar` +
+  `EventoBD.listarInscritosEvento`), equivalente à leitura do documento com as
+  inscrições embutidas, antes da coleção `inscricoes`;
+- `completa`: o evento completo (`EventoBD.buscar` + `Evento`);
+- `projeção`: os dados públicos do evento (`EventoBD.buscarPublico` + `EventoLer`).
+
+Mede o tempo médio por leitura e a quantidade de bytes transferidos do banco de dados
+(tamanho BSON dos documentos lidos) e devolvidos ao cliente (tamanho do JSON).
+
+Requer um MongoDB acessível em `PET_API_URI_BD`. Os dados são gravados no banco
+`petBD-bench`, que é removido ao final.
+
+Uso: python -m benchmarks.benchEventoPublico [quantidade de inscrições] [repetições]
+"""
+
+import asyncio
+import os
+import secrets
+import sys
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("PET_API_NOME_BD", "petBD-bench")
+
+import bson
+
+from src.config import config
+from src.modelos.bd import (
+    EventoBD,
+    _projecao,
+    cliente,
+    colecaoEventos,
+    colecaoInscricoes,
+)
+from src.modelos.evento.enums import NivelConhecimento, TipoEvento, TipoVaga
+from src.modelos.evento.eventoClad import EventoLer
+
+
+def criaDocumentoEvento(quantidadeInscritos: int) -> dict:
+    """
+    Cria o documento de um evento com vagas para `quantidadeInscritos` inscrições.
+    """
+    inicio = datetime.now() + timedelta(days=30)
+    return {
+        "_id": secrets.token_hex(16),
+        "titulo": "SECOMP (benchmark)",
+        "tipoEvento": TipoEvento.SECOMP.value,
+        "descricao": "Semana da computação. " * 20,
+        "preRequisitos": "Nenhum",
+        "inicioInscricao": datetime.now() - timedelta(days=1),
+        "fimInscricao": inicio - timedelta(days=1),
+        "dias": [(inicio, inicio + timedelta(hours=4))],
+        "inicioEvento": inicio,
+        "fimEvento": inicio + timedelta(hours=4),
+        "local": "Bloco C56",
+        "vagasComNote": quantidadeInscritos,
+        "vagasSemNote": quantidadeInscritos,
+        "vagasDisponiveisComNote": quantidadeInscritos // 2,
+        "vagasDisponiveisSemNote": quantidadeInscritos // 2,
+        "organizadores": [],
+        "cargaHoraria": 20,
+        "chavePIX": None,
+        "valor": 0.0,
+        "arte": None,
+        "cracha": None,
+    }
+
+
+def criaDocumentosInscricoes(idEvento: str, quantidadeInscritos: int) -> list[dict]:
+    """
+    Cria os documentos de `quantidadeInscritos` inscrições no evento `idEvento`.
+    """
+    niveis = list(NivelConhecimento)
+    return [
+        {
+            "idEvento": idEvento,
+            "idUsuario": secrets.token_hex(16),
+            "tipoVaga": (TipoVaga.COM_NOTE if i % 2 else TipoVaga.SEM_NOTE).value,
+            "nivelConhecimento": niveis[i % len(niveis)].value,
+            "comprovante": f"{config.CAMINHO_IMAGEM}/eventos/x/comprovantes/{i}.jpg",
+            "estadoDeVerificacao": None,
+            "dataInscricao": datetime.now(),
+        }
+        for i in range(quantidadeInscritos)
+    ]
+
+
+async def mede(funcao, repeticoes: int) -> float:
+    """
+    Executa `funcao` `repeticoes` vezes e retorna o tempo médio em milissegundos.
+    """
+    await funcao()
+
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        await funcao()
+    return (time.perf_counter() - inicio) / repeticoes * 1000
+
+
+async def main(quantidadeInscritos: int, repeticoes: int) -> None:
+    documento = criaDocumentoEvento(quantidadeInscritos)
+    id = documento["_id"]
+    await colecaoEventos.insert_one(documento)
+    await colecaoInscricoes.create_index(
+        [("idEvento", 1), ("idUsuario", 1)], unique=True
+    )
+    await colecaoInscricoes.insert_many(
+        criaDocumentosInscricoes(id, quantidadeInscritos)
+    )
+
+    try:
+
+        async def leituraInscritos():
+            evento = await EventoBD.buscar("_id", id)
+            inscritos = await EventoBD.listarInscritosEvento(id)
+            return evento.model_dump_json(by_alias=True) + "".join(
+                inscrito.model_dump_json() for inscrito in inscritos
+            )
+
+        async def leituraCompleta():
+            evento = await EventoBD.buscar("_id", id)
+            return evento.model_dump_json(by_alias=True)
+
+        async def leituraProjetada():
+            evento = await EventoBD.buscarPublico(id)
+            return evento.model_dump_json(by_alias=True)
+
+        bytesCompleto = len(bson.encode(await colecaoEventos.find_one({"_id": id})))
+        bytesInscritos = bytesCompleto + sum(
+            [
+                len(bson.encode(inscricao))
+                async for inscricao in colecaoInscricoes.find(
+                    {"idEvento": id}, {"_id": 0, "idEvento": 0}
+                )
+            ]
+        )
+        bytesProjetado = len(
+            bson.encode(
+                await colecaoEventos.find_one({"_id": id}, _projecao(EventoLer))
+            )
+        )
+
+        linhas = []
+        for nome, leitura, bytesBD in (
+            ("inscritos", leituraInscritos, bytesInscritos),
+            ("completa", leituraCompleta, bytesCompleto),
+            ("projeção", leituraProjetada, bytesProjetado),
+        ):
+            resposta = len(await leitura())
+            tempo = await mede(leitura, repeticoes)
+            linhas.append(f"{nome:>12} {tempo:>11.2f} {bytesBD:>13} {resposta:>13}")
+
+        print(f"evento com {quantidadeInscritos} inscrições, {repeticoes} leituras")
+        print(f"{'':>12} {'tempo (ms)':>11} {'BSON (bytes)':>13} {'JSON (bytes)':>13}")
+        print("\n".join(linhas))
+    finally:
+        await cliente.drop_database(config.NOME_BD)
+        cliente.close()
+
+
+if __name__ == "__main__":
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    repeticoes = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    asyncio.run(main(quantidade, repeticoes))
@@ -0,0 +1,117 @@
+"""
+Compara o custo por requisição da pilha de *middlewares* antiga (BaseHTTPMiddleware)
+com a pilha atual (ASGI puro).
+
+Ambas as pilhas envolvem uma rota trivial, de modo que a diferença medida é o custo
+dos próprios *middlewares*. Não é necessário banco de dados.
+
+Uso: python -m benchmarks.benchMiddlewares [quantidade de requisições]
+"""
+
+import asyncio
+import logging
+import sys
+import time
+
+import anyio
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from src.middleware.excecoes import ExcecaoAPIMiddleware
+from src.middleware.logger import LoggerMiddleware
+from src.middleware.tamanhoLimite import TamanhoLimiteMiddleware
+from src.middleware.tempoLimite import TempoLimiteMiddleware
+from src.modelos.excecao import APIExcecaoBase, TempoLimiteExcedidoExcecao
+
+
+class ExcecaoAntigoMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        try:
+            return await call_next(request)
+        except APIExcecaoBase as e:
+            return e.response()
+
+
+class LoggerAntigoMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        log_dict = {
+            "ip": request.client.host,  # type: ignore
+            "usuario": getattr(request.state, "idUsuario", None),
+            "path": request.url.path,
+            "method": request.method,
+            "status_code": response.status_code,
+        }
+        logging.info(log_dict, extra=log_dict)
+        return response
+
+
+class TempoLimiteAntigoMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        try:
+            with anyio.fail_after(30):
+                return await call_next(request)
+        except TimeoutError:
+            raise TempoLimiteExcedidoExcecao()
+
+
+def criaApp(excecao, logger, tempoLimite) -> FastAPI:
+    """
+    Cria uma aplicação com uma rota trivial e a pilha de *middlewares* do site.
+    """
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    app.add_middleware(excecao)
+    app.add_middleware(logger)
+    app.add_middleware(tempoLimite)
+    app.add_middleware(TamanhoLimiteMiddleware, size_limit=5 * 1024 * 1024)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    return app
+
+
+async def mede(app: FastAPI, quantidade: int, concorrencia: int) -> float:
+    """
+    Envia `quantidade` requisições, `concorrencia` por vez, e retorna o tempo médio
+    por requisição em microssegundos.
+    """
+    transporte = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://bench") as cliente:
+        # aquecimento
+        for _ in range(100):
+            await cliente.get("/ping")
+
+        inicio = time.perf_counter()
+        for _ in range(quantidade // concorrencia):
+            await asyncio.gather(*(cliente.get("/ping") for _ in range(concorrencia)))
+        fim = time.perf_counter()
+
+    return (fim - inicio) / quantidade * 1e6
+
+
+async def main(quantidade: int) -> None:
+    logging.disable(logging.CRITICAL)
+
+    antigo = criaApp(ExcecaoAntigoMiddleware, LoggerAntigoMiddleware, TempoLimiteAntigoMiddleware)
+    atual = criaApp(ExcecaoAPIMiddleware, LoggerMiddleware, TempoLimiteMiddleware)
+
+    print(f"{'concorrência':>12} {'BaseHTTP (µs)':>14} {'ASGI (µs)':>10} {'ganho':>7}")
+    for concorrencia in (1, 10, 50):
+        tAntigo = await mede(antigo, quantidade, concorrencia)
+        tAtual = await mede(atual, quantidade, concorrencia)
+        print(f"{concorrencia:>12} {tAntigo:>14.1f} {tAtual:>10.1f} {tAntigo / tAtual:>6.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
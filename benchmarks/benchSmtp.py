@@ -0,0 +1,106 @@
+"""
+Compara a vazão de envio de e-mails abrindo uma sessão SMTP por mensagem (como era
+feito antes) com o pool de sessões autenticadas (`src/email/conexaoSmtp.py`).
+
+Os e-mails são enviados a um servidor SMTP local mínimo, iniciado pelo próprio
+script, que aceita qualquer autenticação e descarta as mensagens. Para aproximar o
+custo de um servidor real, cada resposta do servidor é atrasada em `latência`
+milissegundos (o round-trip da rede); o handshake TLS, que custa ainda mais round-trips,
+não é simulado, então o ganho real com STARTTLS é maior que o medido.
+
+Uso: python -m benchmarks.benchSmtp [quantidade de mensagens] [latência em ms]
+"""
+
+import smtplib
+import socketserver
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config import config
+from src.email.conexaoSmtp import PoolSmtp
+
+
+class ServidorSmtp(socketserver.StreamRequestHandler):
+    """
+    Servidor SMTP mínimo: responde aos comandos usados pelo smtplib e descarta as
+    mensagens recebidas.
+    """
+
+    latencia: float = 0
+
+    def responde(self, linha: str) -> None:
+        time.sleep(self.latencia)
+        self.wfile.write(linha.encode() + b"\r\n")
+
+    def handle(self) -> None:
+        self.responde("220 bench ESMTP")
+        while linha := self.rfile.readline():
+            comando = linha.decode().strip().upper()
+            if comando.startswith(("EHLO", "HELO")):
+                self.responde("250-bench\r\n250-AUTH PLAIN LOGIN\r\n250 8BITMIME")
+            elif comando.startswith("AUTH"):
+                self.responde("235 ok")
+            elif comando == "DATA":
+                self.responde("354 fim com <CRLF>.<CRLF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                self.responde("250 ok")
+            elif comando == "QUIT":
+                self.responde("221 tchau")
+                return
+            else:
+                self.responde("250 ok")
+
+
+def enviaSemPool(remetente: str, destinatario: str, mensagem: str) -> None:
+    """
+    Envio como era feito antes do pool: uma sessão por mensagem.
+    """
+    with smtplib.SMTP(config.SERVIDOR_SMTP, config.PORTA_SMTP) as server:
+        if config.SMTP_TLS:
+            server.starttls()
+        server.login(config.EMAIL_SMTP, config.SENHA_SMTP)
+        server.sendmail(remetente, destinatario, mensagem)
+
+
+def mede(envia, quantidade: int, concorrencia: int) -> float:
+    """
+    Envia `quantidade` mensagens por `concorrencia` threads e retorna a vazão em
+    mensagens por segundo.
+    """
+    mensagem = "Subject: bench\r\n\r\nmensagem de teste"
+    with ThreadPoolExecutor(concorrencia) as executor:
+        inicio = time.perf_counter()
+        list(
+            executor.map(
+                lambda i: envia(config.EMAIL_SMTP, f"destino{i}@pet.com", mensagem),
+                range(quantidade),
+            )
+        )
+        return quantidade / (time.perf_counter() - inicio)
+
+
+if __name__ == "__main__":
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    ServidorSmtp.latencia = (float(sys.argv[2]) if len(sys.argv) > 2 else 5) / 1000
+
+    servidor = socketserver.ThreadingTCPServer(("127.0.0.1", 0), ServidorSmtp)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+
+    config.SERVIDOR_SMTP, config.PORTA_SMTP = servidor.server_address  # type: ignore
+    config.SMTP_TLS = False
+    config.EMAIL_SMTP, config.SENHA_SMTP = "bench@pet.com", "bench"
+
+    print(f"{quantidade} mensagens, latência {ServidorSmtp.latencia * 1000:.0f} ms")
+    print(f"{'concorrência':>12} {'sem pool (msg/s)':>17} {'pool (msg/s)':>13} {'ganho':>7}")
+    for concorrencia in (1, 4):
+        pool = PoolSmtp(concorrencia)
+        semPool = mede(enviaSemPool, quantidade, concorrencia)
+        comPool = mede(pool.envia, quantidade, concorrencia)
+        pool.fecha()
+        print(f"{concorrencia:>12} {semPool:>17.1f} {comPool:>13.1f} {comPool / semPool:>6.2f}x")
+
+    servidor.shutdown()
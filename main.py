@@ -1,13 +1,21 @@
+import atexit
 import locale
 import logging
 import logging.handlers
+import queue
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from rotinas import encerraRotinas, iniciaRotinas
 from src.config import config
+from src.email.conexaoSmtp import encerraConexoesSmtp
+from src.email.filaEmails import encerraEntregadorEmails, iniciaEntregadorEmails
 from src.img.criaPastas import criaPastas
+from src.img.processamento import encerraProcessamento, iniciaProcessamento
 from src.limiter import limiter
+from src.modelos.bd import carregaIndiceImagens, cliente, inicializaBD
 from src.middleware.excecoes import ExcecaoAPIMiddleware
 from src.middleware.logger import LoggerMiddleware
 from src.middleware.tamanhoLimite import TamanhoLimiteMiddleware
@@ -15,19 +23,30 @@ from src.middleware.tempoLimite import TempoLimiteMiddleware
 from src.rotas.avaliacao.avaliacaoRotas import roteador as roteadorAvaliacao
 from src.rotas.evento.eventoRotas import roteador as roteadorEvento
 from src.rotas.img.imgRotas import roteador as roteadorImg
+from src.rotas.metricas.metricasRotas import roteador as roteadorMetricas
 from src.rotas.usuario.usuarioRotas import roteador as roteadorUsuario
 
 ## Configuração dos logs.
 criaPastas()
 
+## Os registros são apenas enfileirados pela aplicação; uma thread separada os grava
+## no arquivo e na saída padrão, para que a escrita não bloqueie o event loop. A
+## thread acompanha o processo, e não o ciclo de vida da aplicação, que pode ser
+## iniciado mais de uma vez (ex: nos testes); ela é encerrada na saída do processo,
+## gravando os registros pendentes.
+filaLogs: queue.SimpleQueue = queue.SimpleQueue()
+ouvinteLogs = logging.handlers.QueueListener(
+    filaLogs,
+    logging.handlers.TimedRotatingFileHandler(
+        "logs/output.log", when="midnight", interval=1, encoding="utf-8"
+    ),
+    logging.StreamHandler(),
+)
+ouvinteLogs.start()
+atexit.register(ouvinteLogs.stop)
+
 logging.basicConfig(
-    handlers=[
-        logging.handlers.TimedRotatingFileHandler(
-            "logs/output.log", when="midnight", interval=1
-        ),
-        logging.StreamHandler(),
-    ],
-    encoding="utf-8",
+    handlers=[logging.handlers.QueueHandler(filaLogs)],
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
@@ -46,7 +65,26 @@ origins = [
     "https://www.petinfouem.com.br",
 ]
 
-petBack = FastAPI(root_path=config.ROOT_PATH)
+
+@asynccontextmanager
+async def cicloDeVida(app: FastAPI):
+    """
+    Executa as rotinas de inicialização e encerramento da aplicação.
+    """
+    await inicializaBD()
+    await carregaIndiceImagens()
+    iniciaProcessamento()
+    iniciaEntregadorEmails()
+    iniciaRotinas()
+    yield
+    encerraRotinas()
+    await encerraEntregadorEmails()
+    encerraProcessamento()
+    encerraConexoesSmtp()
+    cliente.close()
+
+
+petBack = FastAPI(root_path=config.ROOT_PATH, lifespan=cicloDeVida)
 petBack.state.limiter = limiter
 
 ## Configura os middlewares. Para mais detalhes, confira o documento
@@ -61,6 +99,7 @@ petBack.include_router(roteadorUsuario)
 petBack.include_router(roteadorEvento)
 petBack.include_router(roteadorAvaliacao)
 petBack.include_router(roteadorImg)
+petBack.include_router(roteadorMetricas)
 
 petBack.add_middleware(
     CORSMiddleware,
@@ -72,16 +111,3 @@ petBack.add_middleware(
 
 
 logging.info("Backend inicializado")
-
-# Quando rotinas forem necessárias no futuro, usar o código abaixo como exemplo.
-# # Inicializa o scheduler
-# scheduler = BackgroundScheduler()
-# scheduler.start()
-
-# # Adiciona a rotina de verificação de eventos finalizados
-# scheduler.add_job(
-#     verificaEventosFinalizados,
-#     "interval",
-#     days=1,
-#     start_date=config.HORARIO_INICIO_ROTINAS,  # Inicia a rotina no horário definido
-# )
@@ -1 +1,285 @@
-# Adicionar futuras funções para rotinas aqui
+"""
+Rotinas agendadas da aplicação:
+
+- lembrete aos inscritos `config.ANTECEDENCIA_LEMBRETE_EVENTO` horas antes do início
+  de cada evento;
+- aviso aos inscritos quando a avaliação do evento é liberada (`liberarApos`);
+- resumo diário aos organizadores, com as novas inscrições e os comprovantes
+  aguardando verificação dos seus eventos;
+- retomada da distribuição dos avisos aos inscritos interrompida (ex: o processo foi
+  encerrado antes de colocar todos os e-mails na fila).
+
+Todos os processos da API agendam as rotinas, mas cada execução é reservada por um
+único processo (ver `RotinaBD`). Cada rotina guarda uma marca de até onde os dados já
+foram processados e a próxima execução continua a partir dela, então nenhum evento é
+esquecido ou avisado duas vezes, mesmo que uma execução atrase. Durante a execução, a
+reserva é renovada a cada lote e a marca avança a cada evento concluído; caso uma
+execução falhe ou seja interrompida, apenas os eventos após a marca são processados
+novamente (quem já havia recebido o e-mail do evento em andamento pode recebê-lo de
+novo).
+
+Os destinatários são lidos em lotes e os e-mails, colocados na fila de envio com a
+prioridade de e-mails em massa.
+"""
+
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+from src.config import config
+from src.email.filaEmails import RESPONSAVEL
+from src.email.operacoesEmail import (
+    distribuirAviso,
+    enviarEmailResumoOrganizador,
+    enviarEmailsAvaliacaoLiberada,
+    enviarEmailsLembreteEvento,
+)
+from src.modelos.bd import AvaliacaoBD, AvisoBD, EventoBD, RotinaBD, UsuarioBD
+from src.modelos.excecao import NaoEncontradoExcecao
+
+agendador: AsyncIOScheduler | None = None
+"""Agendador das rotinas, caso estejam agendadas neste processo."""
+
+Avanca = Callable[[datetime | None], Awaitable[None]]
+"""
+Função passada às rotinas para renovar a reserva e, opcionalmente, registrar a marca
+até a qual os dados já foram processados.
+"""
+
+
+class ReservaPerdida(Exception):
+    """
+    Lançada quando a reserva de uma rotina em execução foi assumida por outro processo.
+    """
+
+
+async def executaRotina(
+    nome: str,
+    intervalo: timedelta,
+    rotina: Callable[[datetime | None, Avanca], Awaitable[datetime]],
+) -> None:
+    """
+    Executa uma rotina caso nenhum outro processo a esteja executando ou a tenha
+    executado neste período.
+
+    :param nome: Nome da rotina.
+    :param intervalo: Intervalo entre as execuções da rotina.
+    :param rotina: Função que recebe a marca da execução anterior (None na primeira) e
+        uma função `avanca`, e retorna a nova marca. A rotina deve chamar `avanca`
+        periodicamente (ex: a cada lote) para renovar a reserva e, ao concluir parte dos
+        dados, passar a marca até onde já foram processados. Se a reserva foi assumida
+        por outro processo, `avanca` lança `ReservaPerdida`.
+    """
+    concessao = timedelta(seconds=config.CONCESSAO_ROTINAS)
+    documento = await RotinaBD.adquirir(
+        nome,
+        RESPONSAVEL,
+        concessao,
+        # tolera pequenas diferenças entre os horários de disparo dos processos
+        intervalo / 2,
+    )
+    if documento is None:
+        return
+
+    async def avanca(marca: datetime | None = None) -> None:
+        if not await RotinaBD.renovar(nome, RESPONSAVEL, concessao, marca):
+            raise ReservaPerdida(nome)
+
+    try:
+        marca = await rotina(documento.get("marca"), avanca)
+    except ReservaPerdida:
+        logging.warning(f"Rotina {nome} assumida por outro processo")
+        return
+    except Exception:
+        logging.exception(f"Erro na rotina {nome}")
+        await RotinaBD.liberar(nome, RESPONSAVEL)
+        return
+
+    await RotinaBD.concluir(nome, RESPONSAVEL, marca)
+
+
+async def enviaLembretesEventos(marca: datetime | None, avanca: Avanca) -> datetime:
+    """
+    Envia o lembrete aos inscritos dos eventos que começam nas próximas
+    `config.ANTECEDENCIA_LEMBRETE_EVENTO` horas e ainda não foram lembrados.
+
+    Os eventos são lembrados em ordem de início, e a marca avança para o início de cada
+    evento assim que todos os eventos que começam nesse momento são lembrados.
+
+    :param marca: Início do evento mais tardio já considerado na execução anterior.
+    :param avanca: Renova a reserva da rotina e registra a marca (ver `executaRotina`).
+    :return marca: Início do evento mais tardio considerado nesta execução.
+    """
+    agora = datetime.now()
+    fim = agora + timedelta(hours=config.ANTECEDENCIA_LEMBRETE_EVENTO)
+    if marca is None:
+        marca = fim - timedelta(minutes=config.INTERVALO_ROTINAS)
+
+    # eventos que já começaram (ex: após a aplicação ficar fora do ar) não são lembrados
+    inicioAnterior = None
+    for evento in await EventoBD.buscarIniciandoEntre(max(marca, agora), fim):
+        # a marca só avança após todos os eventos com o mesmo início
+        if inicioAnterior is not None and evento["inicioEvento"] != inicioAnterior:
+            await avanca(inicioAnterior)
+        inicioAnterior = evento["inicioEvento"]
+
+        quantidade = 0
+        async for destinatarios in EventoBD.iterarDestinatarios(
+            evento["_id"], config.LOTE_AVISOS
+        ):
+            quantidade += await enviarEmailsLembreteEvento(destinatarios, evento)
+            await avanca(None)
+        logging.info(f"Lembrete do evento {evento['_id']} enviado a {quantidade} inscritos")
+
+    return fim
+
+
+async def enviaAvisosAvaliacao(marca: datetime | None, avanca: Avanca) -> datetime:
+    """
+    Avisa os inscritos dos eventos cuja avaliação foi liberada desde a execução anterior.
+
+    Os formulários são processados em ordem de liberação, e a marca avança para a
+    liberação de cada um assim que todos os liberados nesse momento são anunciados.
+
+    :param marca: Momento da execução anterior.
+    :param avanca: Renova a reserva da rotina e registra a marca (ver `executaRotina`).
+    :return marca: Momento desta execução.
+    """
+    agora = datetime.now()
+    if marca is None:
+        marca = agora - timedelta(minutes=config.INTERVALO_ROTINAS)
+
+    anterior = None
+    for formulario in await AvaliacaoBD.buscarFormulariosLiberadosEntre(marca, agora):
+        # a marca só avança após todos os formulários com a mesma liberação
+        if anterior is not None and formulario["liberarApos"] != anterior:
+            await avanca(anterior)
+        anterior = formulario["liberarApos"]
+
+        idEvento = formulario["idEvento"]
+        try:
+            evento = await EventoBD.buscarDadosEmail(idEvento)
+        except NaoEncontradoExcecao:
+            logging.warning(f"Evento {idEvento} do formulário de avaliação não encontrado")
+            continue
+
+        quantidade = 0
+        async for destinatarios in EventoBD.iterarDestinatarios(idEvento, config.LOTE_AVISOS):
+            quantidade += await enviarEmailsAvaliacaoLiberada(
+                destinatarios, evento["titulo"]
+            )
+            await avanca(None)
+        logging.info(f"Avaliação do evento {idEvento} anunciada a {quantidade} inscritos")
+
+    return agora
+
+
+async def enviaResumoOrganizadores(marca: datetime | None, avanca: Avanca) -> datetime:
+    """
+    Envia a cada organizador o resumo das inscrições dos seus eventos ainda não
+    encerrados: as feitas desde a execução anterior e os comprovantes aguardando
+    verificação. Organizadores sem novidades não recebem o resumo.
+
+    :param marca: Momento da execução anterior.
+    :param avanca: Renova a reserva da rotina (ver `executaRotina`).
+    :return marca: Momento desta execução.
+    """
+    agora = datetime.now()
+    if marca is None:
+        marca = agora - timedelta(days=1)
+
+    eventosPorOrganizador: dict[str, list[dict]] = {}
+    for evento in await EventoBD.resumirInscricoesOrganizadas(marca, agora):
+        for idOrganizador in evento["organizadores"]:
+            eventosPorOrganizador.setdefault(idOrganizador, []).append(evento)
+
+    organizadores = await UsuarioBD.buscarVarios(
+        list(eventosPorOrganizador), ["nome", "email"]
+    )
+    for idOrganizador, eventos in eventosPorOrganizador.items():
+        organizador = organizadores.get(idOrganizador)
+        if organizador is None:
+            logging.warning(f"Organizador {idOrganizador} não encontrado")
+            continue
+        await enviarEmailResumoOrganizador(organizador["email"], organizador["nome"], eventos)
+        await avanca(None)
+
+    return agora
+
+
+async def retomaAvisosInterrompidos(marca: datetime | None, avanca: Avanca) -> datetime:
+    """
+    Retoma a distribuição dos avisos que não foram concluídos. Os inscritos cujos
+    e-mails já estão na fila não recebem o aviso novamente (ver `distribuirAviso`).
+
+    :param marca: Momento da execução anterior (não utilizado).
+    :param avanca: Renova a reserva da rotina (ver `executaRotina`).
+    :return marca: Momento desta execução.
+    """
+    agora = datetime.now()
+
+    # avisos recentes ainda podem estar sendo distribuídos pelo processo que os criou
+    limite = agora - timedelta(minutes=config.INTERVALO_ROTINAS)
+    for aviso in await AvisoBD.buscarInterrompidos(limite):
+        try:
+            quantidade = await distribuirAviso(aviso)
+        except NaoEncontradoExcecao:
+            logging.warning(f"Evento do aviso {aviso.id} não encontrado")
+            await AvisoBD.concluir(aviso.id)
+            continue
+        logging.info(f"Aviso {aviso.id} retomado: {quantidade} e-mails na fila")
+        await avanca(None)
+
+    return agora
+
+
+def iniciaRotinas() -> None:
+    """
+    Agenda as rotinas neste processo, caso `config.ROTINAS_ATIVAS`. Deve ser chamada na
+    inicialização da aplicação, com o event loop em execução.
+    """
+    global agendador
+    if not config.ROTINAS_ATIVAS or agendador is not None:
+        return
+
+    agendador = AsyncIOScheduler(job_defaults={"coalesce": True, "max_instances": 1})
+
+    intervalo = timedelta(minutes=config.INTERVALO_ROTINAS)
+    for nome, rotina in (
+        ("lembretesEventos", enviaLembretesEventos),
+        ("avisosAvaliacao", enviaAvisosAvaliacao),
+        ("avisosInterrompidos", retomaAvisosInterrompidos),
+    ):
+        agendador.add_job(
+            executaRotina,
+            "interval",
+            args=[nome, intervalo, rotina],
+            id=nome,
+            minutes=config.INTERVALO_ROTINAS,
+            next_run_time=datetime.now(),
+        )
+
+    agendador.add_job(
+        executaRotina,
+        "interval",
+        args=["resumoOrganizadores", timedelta(days=1), enviaResumoOrganizadores],
+        id="resumoOrganizadores",
+        days=1,
+        start_date=config.HORARIO_INICIO_ROTINAS,
+    )
+
+    agendador.start()
+
+
+def encerraRotinas() -> None:
+    """
+    Cancela o agendamento das rotinas. Execuções em andamento não são aguardadas; caso
+    sejam interrompidas, a marca não avança e elas são refeitas por outro processo após
+    o fim da concessão.
+    """
+    global agendador
+    if agendador is not None:
+        agendador.shutdown(wait=False)
+        agendador = None
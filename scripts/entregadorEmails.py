@@ -0,0 +1,38 @@
+"""
+Executa o entregador da fila de e-mails fora dos processos da API.
+
+Útil quando a API é executada com `PET_API_ENTREGADOR_EMAILS_NA_API=false`, para que o
+envio de e-mails não concorra com as requisições. Vários entregadores podem ser
+executados ao mesmo tempo. O script é encerrado com SIGINT (Ctrl+C) ou SIGTERM, após
+o envio do lote em andamento.
+
+Uso: python -m scripts.entregadorEmails
+"""
+
+import asyncio
+import logging
+import signal
+
+from src.email import filaEmails
+from src.email.conexaoSmtp import encerraConexoesSmtp
+from src.modelos.bd import cliente, inicializaBD
+
+
+async def main():
+    await inicializaBD()
+
+    loop = asyncio.get_running_loop()
+    for sinal in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sinal, filaEmails.paraEntregador)
+
+    logging.info(f"Entregador de e-mails {filaEmails.RESPONSAVEL} iniciado")
+    await filaEmails.executaEntregador()
+
+    encerraConexoesSmtp()
+    cliente.close()
+    logging.info("Entregador de e-mails encerrado")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
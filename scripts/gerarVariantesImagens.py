@@ -0,0 +1,63 @@
+"""
+Gera as variantes (tamanhos reduzidos e WebP) das fotos de usuários e das artes de
+eventos armazenadas antes da introdução das variantes.
+
+Imagens que já possuem todas as variantes são ignoradas, a menos que `--refazer` seja
+informado.
+
+Uso: python -m scripts.gerarVariantesImagens [--refazer]
+"""
+
+import argparse
+import asyncio
+import logging
+
+from src.img.operacoesImagem import TamanhoImagem, caminhoVariante, geraVariantes
+from src.img.repositorio import obtemRepositorio
+from src.modelos.bd import cliente, colecaoEventos, colecaoUsuarios
+
+
+def possuiVariantes(caminho: str) -> bool:
+    return all(
+        obtemRepositorio().existe(caminhoVariante(caminho, tamanho, "webp"))
+        for tamanho in TamanhoImagem
+    )
+
+
+async def main(refazer: bool) -> None:
+    caminhos: list[str] = []
+    async for usuario in colecaoUsuarios.find({"foto": {"$nin": [None, ""]}}, {"foto": 1}):
+        caminhos.append(usuario["foto"])
+    async for evento in colecaoEventos.find({"arte": {"$nin": [None, ""]}}, {"arte": 1}):
+        caminhos.append(evento["arte"])
+    cliente.close()
+
+    geradas = 0
+    for caminho in caminhos:
+        if not await asyncio.to_thread(obtemRepositorio().existe, caminho):
+            logging.warning(f"{caminho}: imagem não encontrada")
+            continue
+        if not refazer and await asyncio.to_thread(possuiVariantes, caminho):
+            continue
+
+        try:
+            await asyncio.to_thread(geraVariantes, caminho)
+            geradas += 1
+        except OSError:
+            logging.exception(f"{caminho}: não foi possível gerar as variantes")
+
+    logging.info(f"{len(caminhos)} imagens verificadas, variantes geradas para {geradas}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--refazer",
+        action="store_true",
+        help="gera novamente as variantes de imagens que já as possuem",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(main(args.refazer))
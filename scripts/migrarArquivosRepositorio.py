@@ -0,0 +1,94 @@
+"""
+Migra as imagens e os comprovantes para o repositório de arquivos configurado
+(`PET_API_ARMAZENAMENTO`).
+
+Os documentos gravados antes dos repositórios guardam o caminho absoluto do arquivo no
+disco local. Para cada um deles, o script copia o arquivo (e as suas variantes) do
+disco local, em `PET_API_CAMINHO_IMAGEM`, para o repositório, caso ele não seja local, e
+substitui o caminho no banco de dados pela chave relativa. Arquivos já migrados são
+ignorados, então o script pode ser executado mais de uma vez.
+
+Uso: python -m scripts.migrarArquivosRepositorio [--simular]
+"""
+
+import argparse
+import asyncio
+import logging
+from pathlib import Path
+
+from src.config import config
+from src.img.operacoesImagem import caminhosVariantes
+from src.img.repositorio import obtemRepositorio
+from src.modelos.bd import cliente, colecaoEventos, colecaoInscricoes, colecaoUsuarios
+
+CAMPOS = [
+    (colecaoUsuarios, "foto"),
+    (colecaoEventos, "arte"),
+    (colecaoEventos, "cracha"),
+    (colecaoInscricoes, "comprovante"),
+]
+"Coleções e campos que referenciam arquivos."
+
+
+def copiaArquivos(chave: str) -> int:
+    """
+    Copia um arquivo e as suas variantes do disco local para o repositório.
+
+    :param chave: Chave do arquivo, relativa a `config.CAMINHO_IMAGEM`.
+    :return quantidade: Quantidade de arquivos copiados.
+    """
+    repositorio = obtemRepositorio()
+    copiados = 0
+    for chaveArquivo in [chave, *caminhosVariantes(chave)]:
+        origem = config.CAMINHO_IMAGEM / chaveArquivo
+        if not origem.is_file() or repositorio.existe(chaveArquivo):
+            continue
+        with open(origem, "rb") as arquivo:
+            repositorio.grava(chaveArquivo, arquivo)
+        copiados += 1
+    return copiados
+
+
+async def main(simular: bool) -> None:
+    repositorio = obtemRepositorio()
+    raiz = config.CAMINHO_IMAGEM.resolve()
+
+    migrados = copiados = 0
+    for colecao, campo in CAMPOS:
+        caminhos = await colecao.distinct(campo, {campo: {"$regex": "^/"}})
+        for caminho in caminhos:
+            try:
+                chave = Path(caminho).resolve().relative_to(raiz).as_posix()
+            except ValueError:
+                logging.warning(f"{caminho}: fora de {raiz}, ignorado")
+                continue
+
+            if simular:
+                logging.info(f"{campo}: {caminho} -> {chave}")
+                continue
+
+            if not repositorio.local:
+                copiados += await asyncio.to_thread(copiaArquivos, chave)
+            if not await asyncio.to_thread(repositorio.existe, chave):
+                logging.warning(f"{caminho}: arquivo não encontrado, referência mantida")
+                continue
+
+            resultado = await colecao.update_many({campo: caminho}, {"$set": {campo: chave}})
+            migrados += resultado.modified_count
+
+    cliente.close()
+    logging.info(f"{migrados} referências migradas, {copiados} arquivos copiados")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--simular",
+        action="store_true",
+        help="apenas lista as referências que seriam migradas",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(main(args.simular))
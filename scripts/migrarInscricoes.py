@@ -0,0 +1,69 @@
+"""
+Migra as inscrições embutidas nos documentos de eventos (campo `inscritos`) para a
+coleção `inscricoes`.
+
+Para cada evento que ainda possui o campo `inscritos`, copia cada inscrição para a
+coleção `inscricoes` e remove o campo do evento. Inscrições já migradas são
+ignoradas, então o script pode ser executado mais de uma vez.
+
+Uso: python -m scripts.migrarInscricoes
+"""
+
+import asyncio
+import logging
+
+from pymongo.errors import BulkWriteError
+
+from src.modelos.bd import cliente, colecaoEventos, colecaoInscricoes, inicializaBD
+
+CODIGO_CHAVE_DUPLICADA = 11000
+"Código de erro do MongoDB para violação de índice único."
+
+
+async def migraEvento(evento: dict) -> int:
+    """
+    Migra as inscrições de um evento.
+
+    :param evento: Documento do evento, contendo `_id` e `inscritos`.
+    :return quantidade: Quantidade de inscrições inseridas na coleção `inscricoes`.
+    """
+    documentos = [
+        {"idEvento": evento["_id"], **inscrito} for inscrito in evento["inscritos"]
+    ]
+
+    inseridos = 0
+    if documentos:
+        try:
+            resultado = await colecaoInscricoes.insert_many(documentos, ordered=False)
+            inseridos = len(resultado.inserted_ids)
+        except BulkWriteError as e:
+            erros = e.details["writeErrors"]
+            if any(erro["code"] != CODIGO_CHAVE_DUPLICADA for erro in erros):
+                raise
+            inseridos = e.details["nInserted"]
+
+    await colecaoEventos.update_one({"_id": evento["_id"]}, {"$unset": {"inscritos": ""}})
+    return inseridos
+
+
+async def main():
+    # garante o índice único antes de inserir
+    await inicializaBD()
+
+    eventos = colecaoEventos.find(
+        {"inscritos": {"$exists": True}}, {"_id": 1, "titulo": 1, "inscritos": 1}
+    )
+
+    async for evento in eventos:
+        inseridos = await migraEvento(evento)
+        logging.info(
+            f"{evento.get('titulo', evento['_id'])}: {inseridos} de "
+            f"{len(evento['inscritos'])} inscrições migradas"
+        )
+
+    cliente.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
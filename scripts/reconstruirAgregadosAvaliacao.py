@@ -0,0 +1,64 @@
+"""
+Recalcula os agregados de avaliação (coleção `agregadosAvaliacao`) a partir das
+submissões armazenadas em `submissoesAvaliacao`.
+
+Por padrão, reconstrói os agregados de todos os eventos que possuem formulário de
+avaliação. Com `--verificar`, apenas compara os agregados armazenados com os
+recalculados e lista os eventos divergentes, sem alterar o banco de dados.
+
+Os agregados são criados junto com o formulário e a API não os reconstrói; este script
+deve ser executado na implantação, para criar os agregados dos formulários anteriores a
+eles. Como submissões enviadas durante a reconstrução podem não ser contabilizadas, ele
+deve ser executado sem submissões em andamento (a divergência pode ser conferida
+depois com `--verificar`).
+
+Uso: python -m scripts.reconstruirAgregadosAvaliacao [--verificar] [idEvento ...]
+"""
+
+import argparse
+import asyncio
+import logging
+
+from src.modelos.bd import AvaliacaoBD, cliente, colecaoFormulariosAvaliacao
+
+
+async def main(idsEventos: list[str], verificar: bool) -> int:
+    """
+    :return divergentes: Quantidade de eventos cujos agregados estavam divergentes.
+    """
+    if not idsEventos:
+        idsEventos = await colecaoFormulariosAvaliacao.distinct("idEvento")
+
+    divergentes = 0
+    for idEvento in idsEventos:
+        armazenados = await AvaliacaoBD.buscarAgregados(idEvento)
+        calculados = await AvaliacaoBD.calcularAgregados(idEvento)
+
+        if armazenados != calculados:
+            divergentes += 1
+            logging.warning(f"{idEvento}: agregados divergentes")
+
+            if not verificar:
+                await AvaliacaoBD.reconstruirAgregados(idEvento)
+                logging.info(f"{idEvento}: agregados reconstruídos")
+
+    logging.info(f"{len(idsEventos)} eventos verificados, {divergentes} divergentes")
+
+    cliente.close()
+    return divergentes
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("idsEventos", nargs="*", help="eventos a reconstruir (padrão: todos)")
+    parser.add_argument(
+        "--verificar",
+        action="store_true",
+        help="apenas compara os agregados, sem alterá-los",
+    )
+    args = parser.parse_args()
+
+    divergentes = asyncio.run(main(args.idsEventos, args.verificar))
+    raise SystemExit(1 if args.verificar and divergentes else 0)
@@ -0,0 +1,232 @@
+"""
+Cache em memória utilizado na autenticação de requisições.
+
+Cada requisição autenticada precisa descobrir a qual usuário pertence o token
+fornecido e carregar os dados desse usuário. Para evitar consultas repetidas ao banco
+de dados, os resultados são mantidos em dois caches limitados (LRU) e com tempo de
+expiração (TTL):
+
+- `cacheTokens`: token -> (id do usuário, validade do token);
+- `cacheUsuarios`: id do usuário -> `Usuario`.
+
+As entradas são invalidadas explicitamente pelas operações de banco de dados que
+alteram usuários ou removem tokens. Como o cache é local a cada processo, o TTL
+limita o tempo em que outro processo pode enxergar dados desatualizados.
+
+Quem lê do banco de dados para preencher o cache deve obter a geração do cache
+(`CacheTTL.geracao`) antes da leitura e informá-la em `CacheTTL.inserir`: caso a
+entrada tenha sido invalidada nesse meio tempo, o valor lido pode estar desatualizado
+e não é armazenado.
+"""
+
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Generic, Hashable, TypeVar
+
+from src.config import config
+from src.modelos.usuario.usuario import Usuario
+
+C = TypeVar("C", bound=Hashable)
+V = TypeVar("V")
+
+
+class CacheTTL(Generic[C, V]):
+    """
+    Cache LRU de tamanho limitado cujas entradas expiram após `ttl` segundos.
+    """
+
+    tamanhoMaximo: int
+    "Quantidade máxima de entradas. Ao ser excedida, a entrada menos usada é descartada."
+
+    ttl: float
+    "Tempo de vida, em segundos, de cada entrada."
+
+    acertos: int
+    "Quantidade de buscas que encontraram uma entrada válida."
+
+    falhas: int
+    "Quantidade de buscas que não encontraram uma entrada válida."
+
+    descartes: int
+    "Quantidade de inserções descartadas por terem sido invalidadas durante a leitura."
+
+    def __init__(self, tamanhoMaximo: int, ttl: float) -> None:
+        """
+        Inicializa um cache vazio.
+
+        :param tamanhoMaximo: Quantidade máxima de entradas.
+        :param ttl: Tempo de vida, em segundos, de cada entrada.
+        """
+        self.tamanhoMaximo = tamanhoMaximo
+        self.ttl = ttl
+        self.acertos = 0
+        self.falhas = 0
+        self.descartes = 0
+        self._entradas: OrderedDict[C, tuple[float, V]] = OrderedDict()
+
+        # contador incrementado a cada invalidação
+        self._geracao = 0
+        # geração da invalidação mais recente de cada chave (limitado a `tamanhoMaximo`
+        # chaves; as mais antigas são esquecidas e elevam `_geracaoMinima`)
+        self._invalidacoes: OrderedDict[C, int] = OrderedDict()
+        # inserções com geração anterior a esta são sempre descartadas
+        self._geracaoMinima = 0
+
+    def obter(self, chave: C) -> V | None:
+        """
+        Retorna o valor associado a `chave`, ou None caso não exista ou tenha expirado.
+
+        :param chave: Chave buscada.
+        :return valor: Valor armazenado, ou None.
+        """
+        entrada = self._entradas.get(chave)
+        if entrada is None:
+            self.falhas += 1
+            return None
+
+        expiracao, valor = entrada
+        if expiracao < time.monotonic():
+            del self._entradas[chave]
+            self.falhas += 1
+            return None
+
+        self._entradas.move_to_end(chave)
+        self.acertos += 1
+        return valor
+
+    def geracao(self) -> int:
+        """
+        Retorna a geração atual do cache, a ser obtida antes de ler do banco de dados o
+        valor que será inserido (ver `inserir`).
+
+        :return geracao: Geração atual.
+        """
+        return self._geracao
+
+    def inserir(self, chave: C, valor: V, geracao: int | None = None) -> None:
+        """
+        Armazena `valor` associado a `chave`, descartando a entrada menos usada caso o
+        cache esteja cheio.
+
+        :param chave: Chave do valor.
+        :param valor: Valor a ser armazenado.
+        :param geracao: Geração do cache obtida antes da leitura do valor. Caso `chave`
+            tenha sido invalidada depois dela, o valor não é armazenado. Se None, o
+            valor é sempre armazenado.
+        """
+        if geracao is not None and (
+            geracao < self._geracaoMinima or geracao < self._invalidacoes.get(chave, 0)
+        ):
+            self.descartes += 1
+            return
+
+        self._entradas[chave] = (time.monotonic() + self.ttl, valor)
+        self._entradas.move_to_end(chave)
+
+        while len(self._entradas) > self.tamanhoMaximo:
+            self._entradas.popitem(last=False)
+
+    def remover(self, chave: C) -> None:
+        """
+        Remove a entrada associada a `chave`, caso exista.
+
+        :param chave: Chave a ser removida.
+        """
+        self._entradas.pop(chave, None)
+
+        self._geracao += 1
+        self._invalidacoes[chave] = self._geracao
+        self._invalidacoes.move_to_end(chave)
+        while len(self._invalidacoes) > self.tamanhoMaximo:
+            _, self._geracaoMinima = self._invalidacoes.popitem(last=False)
+
+    def removerSe(self, condicao: Callable[[V], bool]) -> None:
+        """
+        Remove todas as entradas cujo valor satisfaz `condicao`.
+
+        Como valores em leitura podem satisfazer a condição, as inserções de todas as
+        leituras em andamento são descartadas.
+
+        :param condicao: Função que recebe um valor e retorna se ele deve ser removido.
+        """
+        for chave in [c for c, (_, v) in self._entradas.items() if condicao(v)]:
+            del self._entradas[chave]
+        self._invalidaTudo()
+
+    def limpar(self) -> None:
+        """
+        Remove todas as entradas do cache e descarta as inserções das leituras em
+        andamento.
+        """
+        self._entradas.clear()
+        self._invalidaTudo()
+
+    def _invalidaTudo(self) -> None:
+        self._geracao += 1
+        self._geracaoMinima = self._geracao
+        self._invalidacoes.clear()
+
+    def estatisticas(self) -> dict[str, int]:
+        """
+        Retorna os contadores de uso do cache.
+
+        :return estatisticas: Dicionário com as chaves `acertos`, `falhas`, `descartes`
+            e `tamanho`.
+        """
+        return {
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "descartes": self.descartes,
+            "tamanho": len(self._entradas),
+        }
+
+
+cacheTokens: CacheTTL[str, tuple[str, datetime]] = CacheTTL(
+    config.TAMANHO_CACHE_AUTENTICACAO, config.TTL_CACHE_AUTENTICACAO
+)
+"""Cache token -> (id do usuário, validade do token)."""
+
+cacheUsuarios: CacheTTL[str, Usuario] = CacheTTL(
+    config.TAMANHO_CACHE_AUTENTICACAO, config.TTL_CACHE_AUTENTICACAO
+)
+"""Cache id do usuário -> usuário."""
+
+
+def invalidaToken(token: str) -> None:
+    """
+    Remove um token do cache de autenticação.
+
+    :param token: Token a ser removido.
+    """
+    cacheTokens.remover(token)
+
+
+def invalidaTokensUsuario(idUsuario: str) -> None:
+    """
+    Remove do cache de autenticação todos os tokens do usuário com id `idUsuario`.
+
+    :param idUsuario: Identificador do usuário.
+    """
+    cacheTokens.removerSe(lambda entrada: entrada[0] == idUsuario)
+
+
+def invalidaUsuario(idUsuario: str) -> None:
+    """
+    Remove os dados do usuário com id `idUsuario` do cache de autenticação.
+
+    :param idUsuario: Identificador do usuário.
+    """
+    cacheUsuarios.remover(idUsuario)
+
+
+def estatisticasCacheAutenticacao() -> dict[str, dict[str, int]]:
+    """
+    Retorna os contadores de acertos e falhas dos caches de autenticação.
+
+    :return estatisticas: Estatísticas dos caches de tokens e de usuários.
+    """
+    return {
+        "tokens": cacheTokens.estatisticas(),
+        "usuarios": cacheUsuarios.estatisticas(),
+    }
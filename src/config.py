@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Literal
 
 from pydantic_core import Url
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -59,6 +60,62 @@ class Configuracoes(BaseSettings):
     Caminho onde serão armazenadas as imagens (.../img/). 
     """
 
+    ARMAZENAMENTO: Literal["local", "s3"] = "local"
+    """
+    Onde são armazenadas as imagens e os comprovantes: no disco local, em `CAMINHO_IMAGEM`,
+    ou em um *bucket* compatível com S3 (requer o pacote opcional boto3).
+    """
+
+    S3_BUCKET: str = "pet-imagens"
+    """
+    Nome do *bucket* S3, caso `ARMAZENAMENTO` seja "s3".
+    """
+
+    S3_ENDPOINT: str | None = None
+    """
+    URL do serviço S3, para serviços compatíveis (ex: http://localhost:9000 para o MinIO).
+    Se vazio, usa a AWS.
+    """
+
+    S3_REGIAO: str | None = None
+    """
+    Região do *bucket* S3.
+    """
+
+    S3_CHAVE_ACESSO: str | None = None
+    """
+    Chave de acesso ao S3. Se vazia, usa as credenciais do ambiente (ex: AWS_ACCESS_KEY_ID).
+    """
+
+    S3_SEGREDO: str | None = None
+    """
+    Segredo da chave de acesso ao S3.
+    """
+
+    S3_URL_ASSINADA: bool = True
+    """
+    Caso verdadeiro, as rotas de imagem redirecionam o cliente para uma URL assinada do S3;
+    caso contrário, a API lê o arquivo do S3 e o repassa ao cliente.
+    """
+
+    VALIDADE_URL_ASSINADA: int = 3600
+    """
+    Validade, em segundos, das URLs assinadas do S3.
+    """
+
+    ENVIO_ARQUIVOS: Literal["api", "x-accel-redirect", "x-sendfile"] = "api"
+    """
+    Como os arquivos do armazenamento local são enviados: pela própria API, ou pelo
+    servidor web à frente dela, que recebe da API apenas o cabeçalho X-Accel-Redirect
+    (nginx) ou X-Sendfile (Apache com mod_xsendfile, lighttpd).
+    """
+
+    PREFIXO_ACCEL_REDIRECT: str = "/_arquivos/"
+    """
+    Prefixo da *location* interna do nginx que aponta para `CAMINHO_IMAGEM`, usado no modo
+    "x-accel-redirect".
+    """
+
     URI_BD: Url = Url("mongodb://localhost:27017/")
     """
     URI para o banco de dados MongoDB.
@@ -69,11 +126,158 @@ class Configuracoes(BaseSettings):
     Nome do banco de dados utilizado pela aplicação.
     """
 
+    TAMANHO_MAXIMO_POOL_BD: int = 200
+    """
+    Quantidade máxima de conexões abertas com o banco de dados por processo.
+    """
+
+    TAMANHO_MINIMO_POOL_BD: int = 10
+    """
+    Quantidade de conexões com o banco de dados mantidas abertas mesmo quando ociosas.
+    """
+
+    TEMPO_OCIOSO_POOL_BD_MS: int = 60_000
+    """
+    Tempo, em milissegundos, após o qual uma conexão ociosa com o banco de dados é fechada.
+    """
+
+    TEMPO_ESPERA_POOL_BD_MS: int = 10_000
+    """
+    Tempo máximo, em milissegundos, que uma operação aguarda por uma conexão livre no pool
+    antes de falhar.
+    """
+
+    TAMANHO_CACHE_AUTENTICACAO: int = 10_000
+    """
+    Quantidade máxima de tokens e de usuários mantidos no cache de autenticação.
+    """
+
+    TTL_CACHE_AUTENTICACAO: int = 60
+    """
+    Tempo, em segundos, que uma entrada permanece no cache de autenticação.
+    Limita o tempo em que alterações feitas por outro processo demoram a ser percebidas.
+    """
+
+    TAMANHO_CACHE_EVENTOS_EMAIL: int = 256
+    """
+    Quantidade máxima de eventos com os dados renderizados mantidos no cache dos e-mails.
+    """
+
+    TTL_CACHE_EVENTOS_EMAIL: int = 300
+    """
+    Tempo, em segundos, que os dados renderizados de um evento permanecem no cache dos
+    e-mails. Limita o tempo em que a edição de um evento feita por outro processo demora
+    a ser percebida.
+    """
+
+    TTL_INDICE_IMAGENS: int = 300
+    """
+    Tempo, em segundos, que o caminho de uma imagem (ou a ausência dela) permanece no
+    índice de imagens. Limita o tempo em que a troca de uma imagem feita por outro
+    processo demora a ser percebida.
+    """
+
+    PROCESSOS_IMAGEM: int = 2
+    """
+    Quantidade de processos dedicados ao processamento de imagens e comprovantes.
+    """
+
+    TAMANHO_FILA_IMAGEM: int = 16
+    """
+    Quantidade máxima de imagens aguardando ou em processamento. Quando a fila está cheia,
+    novos envios são recusados com o código 503.
+    """
+
+    TEMPO_LIMITE_IMAGEM: float = 20
+    """
+    Tempo máximo, em segundos, que uma requisição aguarda o processamento de uma imagem.
+    """
+
+    PRAZO_REMOCAO_IMAGEM: int = 60
+    """
+    Tempo máximo, em segundos, para a remoção de uma imagem sem referências. Quem passa a
+    referenciar a imagem durante a remoção aguarda o seu fim por no máximo esse tempo
+    (caso o processo que a removia tenha sido interrompido).
+    """
+
+    TENTATIVAS_TROCA_IMAGEM: int = 3
+    """
+    Quantidade máxima de tentativas de trocar a imagem de um usuário ou evento quando
+    ela é alterada por outra requisição entre a leitura e a troca.
+    """
+
+    DPI_COMPROVANTE: int = 100
+    """
+    Resolução, em pontos por polegada, usada na conversão de comprovantes em PDF para imagem.
+    """
+
+    PAGINAS_MAXIMAS_COMPROVANTE: int = 5
+    """
+    Quantidade máxima de páginas de um comprovante em PDF convertidas para imagem.
+    As páginas seguintes são ignoradas.
+    """
+
+    LARGURA_MAXIMA_COMPROVANTE: int = 1240
+    """
+    Largura máxima, em pixels, da imagem gerada a partir de um comprovante em PDF.
+    """
+
+    ALTURA_MAXIMA_COMPROVANTE: int = 8000
+    """
+    Altura máxima, em pixels, da imagem gerada a partir de um comprovante em PDF. Junto com
+    a largura máxima, limita a memória usada na conversão a cerca de
+    2 * largura * altura * 3 bytes (a imagem final e uma página por vez).
+    """
+
+    PIXELS_MAXIMOS_IMAGEM: int = 40_000_000
+    """
+    Quantidade máxima de pixels (largura * altura) das imagens enviadas, verificada pelo
+    cabeçalho antes de a imagem ser decodificada.
+    """
+
+    NORMALIZAR_IMAGENS: bool = True
+    """
+    Caso verdadeiro, as fotos e artes enviadas são substituídas em segundo plano por uma
+    cópia sem os metadados (EXIF, incluindo a localização) e reduzida a
+    `LADO_MAXIMO_IMAGEM`. Caso contrário, são mantidas exatamente como enviadas.
+    """
+
+    LADO_MAXIMO_IMAGEM: int = 2560
+    """
+    Maior lado, em pixels, das fotos e artes após a normalização.
+    """
+
     HORARIO_INICIO_ROTINAS: datetime = horarioInicio()
     """
     Horário de início das rotinas.
     """
 
+    ROTINAS_ATIVAS: bool = True
+    """
+    Caso verdadeiro, agenda as rotinas (lembretes, resumo diário, avisos de avaliação e
+    retomada de avisos interrompidos) em cada processo da API. Cada execução é feita por
+    apenas um dos processos.
+    """
+
+    INTERVALO_ROTINAS: float = 15
+    """
+    Intervalo, em minutos, entre as execuções das rotinas de lembretes, de avisos de
+    avaliação e de retomada de avisos interrompidos. O resumo diário é enviado a partir
+    de `HORARIO_INICIO_ROTINAS`.
+    """
+
+    ANTECEDENCIA_LEMBRETE_EVENTO: float = 24
+    """
+    Antecedência, em horas, do lembrete enviado aos inscritos antes do início do evento.
+    """
+
+    CONCESSAO_ROTINAS: float = 1800
+    """
+    Prazo, em segundos, da reserva de uma rotina por um processo, renovado a cada lote
+    processado. Se a reserva não for renovada nesse prazo (ex: o processo foi
+    interrompido), outro processo pode executar a rotina a partir da última marca.
+    """
+
     MOCK_EMAIL: bool = False
     """
     Caso verdadeiro, não envia emails mas imprime o conteúdo deles na saída padrão.
@@ -104,6 +308,84 @@ class Configuracoes(BaseSettings):
     Caso verdadeiro, utiliza TLS na conexão com o servidor SMTP.
     """
 
+    TAMANHO_POOL_SMTP: int = 4
+    """
+    Quantidade máxima de sessões SMTP abertas ao mesmo tempo por processo. As sessões
+    ficam autenticadas entre um envio e outro.
+    """
+
+    TEMPO_OCIOSO_SMTP: float = 60
+    """
+    Tempo, em segundos, após o qual uma sessão SMTP ociosa é descartada em vez de
+    reaproveitada. Deve ser menor que o tempo em que o servidor encerra sessões ociosas.
+    """
+
+    MENSAGENS_POR_CONEXAO_SMTP: int = 100
+    """
+    Quantidade máxima de mensagens enviadas por uma mesma sessão SMTP.
+    """
+
+    TEMPO_LIMITE_SMTP: float = 30
+    """
+    Tempo máximo, em segundos, de espera por uma resposta do servidor SMTP.
+    """
+
+    ENTREGADOR_EMAILS_NA_API: bool = True
+    """
+    Caso verdadeiro, cada processo da API também executa o entregador da fila de e-mails.
+    Caso contrário, o entregador deve ser executado à parte
+    (`python -m scripts.entregadorEmails`).
+    """
+
+    LOTE_ENTREGADOR_EMAILS: int = 20
+    """
+    Quantidade máxima de e-mails reservados de uma vez pelo entregador.
+    """
+
+    CONCESSAO_ENTREGADOR_EMAILS: float = 300
+    """
+    Prazo, em segundos, da reserva de um e-mail pelo entregador. Se o e-mail não for
+    enviado nesse prazo (ex: o entregador foi interrompido), outro entregador pode enviá-lo.
+    """
+
+    INTERVALO_ENTREGADOR_EMAILS: float = 5
+    """
+    Intervalo, em segundos, entre as consultas do entregador à fila quando ela está vazia.
+    """
+
+    TENTATIVAS_MAXIMAS_EMAIL: int = 8
+    """
+    Quantidade máxima de tentativas de envio de um e-mail antes de ele ser descartado.
+    """
+
+    ESPERA_INICIAL_EMAIL: float = 30
+    """
+    Espera, em segundos, antes da segunda tentativa de envio de um e-mail. A espera dobra a
+    cada nova tentativa, até `ESPERA_MAXIMA_EMAIL`.
+    """
+
+    ESPERA_MAXIMA_EMAIL: float = 3600
+    """
+    Espera máxima, em segundos, entre duas tentativas de envio de um e-mail.
+    """
+
+    RETENCAO_EMAILS_ENVIADOS: int = 7
+    """
+    Quantidade de dias que os e-mails enviados são mantidos na fila (sem o conteúdo).
+    """
+
+    LIMITE_EMAILS_POR_MINUTO: int = 0
+    """
+    Quantidade máxima de e-mails enviados por minuto, somando todos os entregadores
+    (ex: a cota do provedor SMTP). Zero para não limitar.
+    """
+
+    LOTE_AVISOS: int = 500
+    """
+    Quantidade de inscritos lidos do banco de dados e colocados na fila de uma vez no
+    envio de avisos.
+    """
+
     model_config = SettingsConfigDict(
         env_prefix="PET_API_",
         env_file=".env",
@@ -0,0 +1,262 @@
+"""
+Pool de conexões SMTP autenticadas.
+
+Abrir uma conexão SMTP custa vários round-trips (saudação, EHLO, STARTTLS com o
+handshake TLS, EHLO novamente e AUTH) antes do envio da primeira mensagem. O pool
+mantém as sessões já autenticadas abertas entre um envio e outro, de modo que cada
+mensagem custe apenas os comandos MAIL, RCPT e DATA.
+
+As conexões são usadas por uma thread de cada vez (os envios são executados no
+threadpool). Sessões ociosas por mais de `config.TEMPO_OCIOSO_SMTP` segundos são
+descartadas, pois o servidor provavelmente já as encerrou, e uma sessão que falha ao
+ser reaproveitada é substituída por uma nova, com uma única nova tentativa.
+"""
+
+import email
+import logging
+import smtplib
+import threading
+import time
+from collections import deque
+
+from src.config import config
+
+CODIGO_SERVICO_INDISPONIVEL = 421
+"""Resposta SMTP com que o servidor avisa que encerrará a sessão."""
+
+
+def _sessaoPerdida(erro: Exception) -> bool:
+    """
+    Retorna se o erro indica que a sessão foi perdida (e a mensagem pode ser reenviada
+    por outra), e não que a mensagem foi recusada.
+    """
+    if isinstance(erro, (smtplib.SMTPServerDisconnected, OSError)):
+        return True
+    return (
+        isinstance(erro, smtplib.SMTPResponseException)
+        and erro.smtp_code == CODIGO_SERVICO_INDISPONIVEL
+    )
+
+
+class ConexaoSmtp:
+    """
+    Sessão SMTP autenticada, com a contagem de mensagens enviadas por ela.
+    """
+
+    def __init__(self) -> None:
+        """
+        Abre e autentica uma sessão com o servidor configurado.
+
+        :raises smtplib.SMTPException: Se a conexão ou a autenticação falharem.
+        :raises OSError: Se o servidor não puder ser alcançado.
+        """
+        self.smtp = smtplib.SMTP(
+            config.SERVIDOR_SMTP, config.PORTA_SMTP, timeout=config.TEMPO_LIMITE_SMTP
+        )
+        try:
+            if config.SMTP_TLS:
+                self.smtp.starttls()
+            self.smtp.login(config.EMAIL_SMTP, config.SENHA_SMTP)
+        except BaseException:
+            self.smtp.close()
+            raise
+        self.enviadas = 0
+        self.ultimoUso = time.monotonic()
+
+    def expirada(self) -> bool:
+        """
+        Retorna se a sessão ficou ociosa por tempo demais ou já enviou a quantidade
+        máxima de mensagens, devendo ser descartada.
+        """
+        return (
+            time.monotonic() - self.ultimoUso > config.TEMPO_OCIOSO_SMTP
+            or self.enviadas >= config.MENSAGENS_POR_CONEXAO_SMTP
+        )
+
+    def fecha(self) -> None:
+        """
+        Encerra a sessão, ignorando erros (o servidor pode já tê-la encerrado).
+        """
+        try:
+            self.smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self.smtp.close()
+
+
+class PoolSmtp:
+    """
+    Pool de sessões SMTP autenticadas, limitado a `tamanhoMaximo` sessões abertas.
+    """
+
+    def __init__(self, tamanhoMaximo: int) -> None:
+        """
+        Inicializa um pool vazio; as sessões são abertas sob demanda.
+
+        :param tamanhoMaximo: Quantidade máxima de sessões abertas ao mesmo tempo. Envios
+            além desse limite aguardam uma sessão ser devolvida.
+        """
+        self._vagas = threading.BoundedSemaphore(tamanhoMaximo)
+        self._ociosas: deque[ConexaoSmtp] = deque()
+        self._trava = threading.Lock()
+        self.tamanhoMaximo = tamanhoMaximo
+        self.enviadas = 0
+        self.conexoesAbertas = 0
+        self.reaproveitamentos = 0
+        self.reconexoes = 0
+
+    def _abre(self) -> ConexaoSmtp:
+        """
+        Abre uma nova sessão.
+        """
+        conexao = ConexaoSmtp()
+        with self._trava:
+            self.conexoesAbertas += 1
+        return conexao
+
+    def _obtem(self) -> tuple[ConexaoSmtp, bool]:
+        """
+        Retorna uma sessão ociosa ainda válida ou, se não houver, uma nova.
+
+        :return conexao: Sessão e se ela foi reaproveitada.
+        """
+        while True:
+            with self._trava:
+                conexao = self._ociosas.pop() if self._ociosas else None
+            if conexao is None:
+                return self._abre(), False
+            if not conexao.expirada():
+                with self._trava:
+                    self.reaproveitamentos += 1
+                return conexao, True
+            conexao.fecha()
+
+    def _devolve(self, conexao: ConexaoSmtp) -> None:
+        """
+        Devolve uma sessão ao pool, ou a encerra caso tenha expirado.
+        """
+        conexao.ultimoUso = time.monotonic()
+        if conexao.expirada():
+            conexao.fecha()
+            return
+        with self._trava:
+            self._ociosas.append(conexao)
+
+    def _enviaPor(
+        self, conexao: ConexaoSmtp, remetente: str, destinatario: str, mensagem: str
+    ) -> None:
+        """
+        Envia uma mensagem pela sessão fornecida e a devolve ao pool, a menos que ela
+        tenha sido perdida.
+        """
+        try:
+            conexao.smtp.sendmail(remetente, destinatario, mensagem)
+        except Exception as e:
+            if _sessaoPerdida(e) or not isinstance(e, smtplib.SMTPException):
+                conexao.fecha()
+            else:
+                # a mensagem foi recusada, mas a sessão continua utilizável
+                self._devolve(conexao)
+            raise
+        except BaseException:
+            conexao.fecha()
+            raise
+
+        conexao.enviadas += 1
+        with self._trava:
+            self.enviadas += 1
+        self._devolve(conexao)
+
+    def envia(self, remetente: str, destinatario: str, mensagem: str) -> None:
+        """
+        Envia uma mensagem por uma sessão do pool. Caso a sessão reaproveitada tenha sido
+        encerrada pelo servidor, a mensagem é reenviada uma vez por uma nova sessão.
+
+        :param remetente: Endereço do remetente.
+        :param destinatario: Endereço do destinatário.
+        :param mensagem: Mensagem completa, com os cabeçalhos.
+        :raises smtplib.SMTPException: Se a mensagem não puder ser enviada.
+        :raises OSError: Se o servidor não puder ser alcançado.
+        """
+        with self._vagas:
+            conexao, reaproveitada = self._obtem()
+            try:
+                self._enviaPor(conexao, remetente, destinatario, mensagem)
+            except Exception as e:
+                if not (reaproveitada and _sessaoPerdida(e)):
+                    raise
+                with self._trava:
+                    self.reconexoes += 1
+                self._enviaPor(self._abre(), remetente, destinatario, mensagem)
+
+    def fecha(self) -> None:
+        """
+        Encerra todas as sessões ociosas.
+        """
+        with self._trava:
+            ociosas = list(self._ociosas)
+            self._ociosas.clear()
+        for conexao in ociosas:
+            conexao.fecha()
+
+    def estatisticas(self) -> dict[str, int]:
+        """
+        Retorna os contadores de uso do pool.
+
+        :return estatisticas: Dicionário com a quantidade de mensagens enviadas, de
+            sessões abertas, de envios que reaproveitaram uma sessão, de reconexões e de
+            sessões ociosas no momento.
+        """
+        return {
+            "enviadas": self.enviadas,
+            "conexoesAbertas": self.conexoesAbertas,
+            "reaproveitamentos": self.reaproveitamentos,
+            "reconexoes": self.reconexoes,
+            "ociosas": len(self._ociosas),
+            "tamanhoMaximo": self.tamanhoMaximo,
+        }
+
+
+poolSmtp: PoolSmtp = PoolSmtp(config.TAMANHO_POOL_SMTP)
+"""Pool global de sessões SMTP."""
+
+
+def entregaEmail(emailDestino: str, mensagem: str) -> None:
+    """
+    Envia uma mensagem ao destinatário por uma sessão do pool.
+
+    Quando o MOCK_EMAIL está ativado, a função apenas imprime o e-mail no log, não
+    enviando de fato.
+
+    :param emailDestino: E-mail do destinatário.
+    :param mensagem: Mensagem completa, com os cabeçalhos.
+    :raises smtplib.SMTPException: Se a mensagem não puder ser enviada.
+    :raises OSError: Se o servidor não puder ser alcançado.
+    """
+    if config.MOCK_EMAIL:
+        logging.info("Envio de e-mail para " + str(emailDestino) + "\n\n")
+
+        # print MIME text with logging.info
+        imprimir = {"text/plain", "text/html"}
+        for part in email.message_from_string(mensagem).walk():
+            if part.get_content_type() in imprimir:
+                logging.info("Email:\n\n" + str(part.get_payload(decode=True)))
+
+        return
+
+    poolSmtp.envia(config.EMAIL_SMTP, emailDestino, mensagem)
+
+
+def encerraConexoesSmtp() -> None:
+    """
+    Encerra as sessões SMTP ociosas. Chamada no encerramento da aplicação.
+    """
+    poolSmtp.fecha()
+
+
+def estatisticasSmtp() -> dict[str, int]:
+    """
+    Retorna os contadores de uso do pool de sessões SMTP.
+
+    :return estatisticas: Estatísticas do pool (ver `PoolSmtp.estatisticas`).
+    """
+    return poolSmtp.estatisticas()
@@ -0,0 +1,288 @@
+"""
+Fila de envio de e-mails (*outbox*) e o seu entregador.
+
+As rotas não enviam e-mails: apenas os gravam na coleção `filaEmails` (ver
+`enfileiraEmail`), o que é rápido e sobrevive a reinícios. O entregador reserva os
+e-mails em lotes, com uma concessão de prazo limitado (ver `FilaEmailBD.reservar`), e
+os envia pelo pool de sessões SMTP. Envios sem sucesso são repetidos com espera
+exponencial e, após `config.TENTATIVAS_MAXIMAS_EMAIL` tentativas, o e-mail é
+descartado (estado `falhou`) e permanece na coleção para inspeção.
+
+O entregador é executado por cada processo da API, caso `config.ENTREGADOR_EMAILS_NA_API`,
+ou à parte, por `scripts/entregadorEmails.py`. Como as reservas são atômicas, vários
+entregadores podem ser executados ao mesmo tempo.
+
+E-mails enviados em massa (ex: avisos aos inscritos de um evento) têm prioridade menor,
+para não atrasarem os e-mails das requisições, e o total de envios por minuto pode ser
+limitado por `config.LIMITE_EMAILS_POR_MINUTO`.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import socket
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+from src.config import config
+from src.email.conexaoSmtp import entregaEmail
+from src.modelos.bd import FilaEmailBD
+from src.modelos.email.filaEmail import EmailFila
+
+RESPONSAVEL = f"{socket.gethostname()}:{os.getpid()}"
+"""Identificador do entregador deste processo."""
+
+PRIORIDADE_EM_MASSA = 1
+"""Prioridade dos e-mails enviados em massa, menor que a dos demais (0)."""
+
+_tarefa: asyncio.Task | None = None
+"""Tarefa do entregador, caso esteja em execução neste processo."""
+
+_parar: asyncio.Event | None = None
+"""Sinaliza ao entregador que ele deve encerrar. Criado quando o entregador é iniciado."""
+
+_acordar: asyncio.Event | None = None
+"""Sinaliza ao entregador que há novos e-mails na fila. Criado com `_parar`."""
+
+_metricas = {
+    "enviados": 0,
+    "falhas": 0,
+    "descartados": 0,
+    "lotes": 0,
+    "limitados": 0,
+    "esperaTotal": 0.0,
+}
+"""Contadores do entregador deste processo."""
+
+_enviosRecentes: deque[float] = deque()
+"""Instantes (time.monotonic) dos envios do último minuto."""
+
+
+async def enfileiraEmail(emailDestino: str, mensagem: str) -> None:
+    """
+    Coloca um e-mail na fila de envio. O envio é feito pelo entregador, fora da
+    requisição.
+
+    :param emailDestino: E-mail do destinatário.
+    :param mensagem: Mensagem completa, com os cabeçalhos.
+    """
+    await FilaEmailBD.enfileirar(emailDestino, mensagem)
+    _acorda()
+
+
+async def enfileiraEmailsEmMassa(
+    emails: list[tuple[str, str]], aviso: str | None = None
+) -> int:
+    """
+    Coloca vários e-mails na fila de uma vez, com a prioridade de e-mails em massa.
+
+    :param emails: Pares de destinatário e mensagem completa.
+    :param aviso: Aviso ao qual os e-mails pertencem, se houver.
+    :return quantidade: Quantidade de e-mails colocados na fila.
+    """
+    quantidade = await FilaEmailBD.enfileirarVarios(emails, PRIORIDADE_EM_MASSA, aviso)
+    _acorda()
+    return quantidade
+
+
+def _acorda() -> None:
+    """
+    Acorda o entregador deste processo, caso esteja em execução.
+    """
+    if _acordar is not None:
+        _acordar.set()
+
+
+def _proximaTentativa(tentativas: int) -> datetime | None:
+    """
+    Retorna quando um e-mail que falhou `tentativas` vezes deve ser enviado novamente,
+    com espera exponencial e variação aleatória de até 10% (para que e-mails que falharam
+    juntos não sejam reenviados juntos), ou None se ele deve ser descartado.
+    """
+    if tentativas >= config.TENTATIVAS_MAXIMAS_EMAIL:
+        return None
+
+    espera = min(
+        config.ESPERA_INICIAL_EMAIL * 2 ** (tentativas - 1), config.ESPERA_MAXIMA_EMAIL
+    )
+    espera *= 1 + random.uniform(0, 0.1)
+    return datetime.now() + timedelta(seconds=espera)
+
+
+async def _entrega(email: EmailFila) -> None:
+    """
+    Envia um e-mail reservado e registra o resultado.
+    """
+    try:
+        await asyncio.to_thread(entregaEmail, email.destino, email.mensagem)
+    except Exception as e:
+        proximaTentativa = _proximaTentativa(email.tentativas)
+        if not await FilaEmailBD.marcarFalha(
+            email.id, email.reserva, repr(e), proximaTentativa
+        ):
+            logging.warning(
+                f"Reserva do e-mail {email.id} expirou antes do registro da falha"
+            )
+            return
+
+        if proximaTentativa is None:
+            _metricas["descartados"] += 1
+            logging.error(
+                f"E-mail {email.id} para {email.destino} descartado após "
+                f"{email.tentativas} tentativas: {e!r}"
+            )
+        else:
+            _metricas["falhas"] += 1
+            logging.warning(
+                f"Erro ao enviar o e-mail {email.id} para {email.destino}: {e!r}"
+            )
+        return
+
+    if not await FilaEmailBD.marcarEnviado(email.id, email.reserva):
+        # o e-mail foi enviado, mas outro entregador o reservou e pode reenviá-lo
+        logging.warning(
+            f"Reserva do e-mail {email.id} expirou antes do registro do envio"
+        )
+
+    _metricas["enviados"] += 1
+    _metricas["esperaTotal"] += (datetime.now() - email.criacao).total_seconds()
+    _registraEnvio()
+
+
+def _registraEnvio() -> None:
+    """
+    Registra o instante de um envio, descartando os registros de mais de um minuto.
+    """
+    agora = time.monotonic()
+    _enviosRecentes.append(agora)
+    while _enviosRecentes[0] < agora - 60:
+        _enviosRecentes.popleft()
+
+
+async def entregaLote() -> int:
+    """
+    Reserva um lote de e-mails e os envia, tantos ao mesmo tempo quanto o pool de
+    sessões SMTP permitir. Caso `config.LIMITE_EMAILS_POR_MINUTO` esteja definido, o lote
+    é reduzido ao que resta da cota do último minuto.
+
+    :return quantidade: Quantidade de e-mails reservados.
+    """
+    quantidade = config.LOTE_ENTREGADOR_EMAILS
+    if config.LIMITE_EMAILS_POR_MINUTO:
+        cota = (
+            config.LIMITE_EMAILS_POR_MINUTO - await FilaEmailBD.contarEnviosRecentes()
+        )
+        if cota <= 0:
+            _metricas["limitados"] += 1
+            return 0
+        quantidade = min(quantidade, cota)
+
+    emails = await FilaEmailBD.reservar(
+        RESPONSAVEL,
+        quantidade,
+        timedelta(seconds=config.CONCESSAO_ENTREGADOR_EMAILS),
+    )
+    if emails:
+        _metricas["lotes"] += 1
+        await asyncio.gather(*(_entrega(email) for email in emails))
+    return len(emails)
+
+
+async def executaEntregador() -> None:
+    """
+    Entrega os e-mails da fila até `paraEntregador` ser chamada. Quando a fila está
+    vazia (ou a cota de envios por minuto se esgotou), aguarda
+    `config.INTERVALO_ENTREGADOR_EMAILS` segundos ou um novo e-mail ser colocado na fila
+    por este processo.
+    """
+    global _parar, _acordar
+    if _parar is None or _acordar is None:
+        # criados no event loop em que o entregador é executado
+        _parar, _acordar = asyncio.Event(), asyncio.Event()
+
+    while not _parar.is_set():
+        _acordar.clear()
+        try:
+            if await entregaLote():
+                continue
+        except Exception:
+            logging.exception("Erro no entregador de e-mails")
+
+        try:
+            await asyncio.wait_for(_acordar.wait(), config.INTERVALO_ENTREGADOR_EMAILS)
+        except TimeoutError:
+            pass
+
+
+def paraEntregador() -> None:
+    """
+    Sinaliza ao entregador que ele deve encerrar após o lote em andamento.
+    """
+    if _parar is not None:
+        _parar.set()
+    _acorda()
+
+
+def iniciaEntregadorEmails() -> None:
+    """
+    Inicia o entregador de e-mails neste processo, caso `config.ENTREGADOR_EMAILS_NA_API`.
+    Deve ser chamada na inicialização da aplicação, com o event loop em execução.
+    """
+    global _tarefa, _parar, _acordar
+    if config.ENTREGADOR_EMAILS_NA_API and _tarefa is None:
+        _parar, _acordar = asyncio.Event(), asyncio.Event()
+        _tarefa = asyncio.create_task(executaEntregador())
+
+
+async def encerraEntregadorEmails() -> None:
+    """
+    Encerra o entregador de e-mails, aguardando o lote em andamento. E-mails reservados
+    e não enviados voltam à fila quando a concessão expira.
+    """
+    global _tarefa
+    if _tarefa is None:
+        return
+
+    paraEntregador()
+    try:
+        await asyncio.wait_for(_tarefa, config.TEMPO_LIMITE_SMTP)
+    except TimeoutError:
+        logging.warning("Entregador de e-mails encerrado com um lote em andamento")
+    _tarefa = None
+
+
+async def estatisticasFilaEmails() -> dict[str, float]:
+    """
+    Retorna as métricas da fila de e-mails e do entregador deste processo.
+
+    :return estatisticas: Quantidade de e-mails em cada estado (`pendente` é o backlog e
+        `falhou`, os descartados), o atraso da fila em segundos (há quanto tempo o e-mail
+        pronto mais antigo aguarda), os contadores do entregador deste processo
+        (`limitados` conta as vezes em que a cota por minuto estava esgotada), os envios
+        no último minuto e a espera média, em segundos, entre a criação e o envio.
+    """
+    contagem = await FilaEmailBD.contarPorEstado()
+    proximaTentativa = await FilaEmailBD.buscarProximaTentativa()
+    atraso = 0.0
+    if proximaTentativa is not None:
+        atraso = max(0.0, (datetime.now() - proximaTentativa).total_seconds())
+
+    limite = time.monotonic() - 60
+    enviadosUltimoMinuto = sum(1 for instante in _enviosRecentes if instante >= limite)
+
+    enviados = _metricas["enviados"]
+    return {
+        **contagem,
+        "atrasoSegundos": round(atraso, 1),
+        "enviados": enviados,
+        "falhas": _metricas["falhas"],
+        "descartados": _metricas["descartados"],
+        "lotes": _metricas["lotes"],
+        "limitados": _metricas["limitados"],
+        "enviadosUltimoMinuto": enviadosUltimoMinuto,
+        "esperaMediaSegundos": (
+            round(_metricas["esperaTotal"] / enviados, 2) if enviados else 0
+        ),
+    }
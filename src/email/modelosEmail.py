@@ -0,0 +1,136 @@
+"""
+Modelos (templates Jinja2) dos e-mails da aplicação.
+
+Cada e-mail possui uma versão em texto e uma em HTML, na pasta `templates/`, que são
+lidas e compiladas uma única vez, na importação deste módulo. Os dados de um evento
+exibidos nos e-mails (título, local e dias) são renderizados uma vez por evento e
+mantidos em cache (`cacheEventosEmail`), de modo que o envio de vários e-mails sobre o
+mesmo evento não consulta o banco de dados nem formata as datas novamente. O cache é
+invalidado quando o evento é editado (`invalidaEventoEmail`); como é local a cada
+processo, o TTL limita o tempo em que outro processo usa dados desatualizados.
+"""
+
+from datetime import datetime
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, select_autoescape
+from markupsafe import Markup
+
+from src.autenticacao.cacheAutenticacao import CacheTTL
+from src.config import config
+from src.modelos.bd import EventoBD
+
+ambiente = Environment(
+    loader=FileSystemLoader(Path(__file__).parent / "templates"),
+    autoescape=select_autoescape(["html"], default_for_string=False),
+    undefined=StrictUndefined,
+    trim_blocks=True,
+    lstrip_blocks=True,
+    auto_reload=False,
+)
+"""Ambiente Jinja2 dos modelos de e-mail."""
+
+ambiente.filters["data"] = lambda data: data.strftime("%d/%m/%Y, %H:%M")
+
+
+class ModeloEmail:
+    """
+    Modelo de e-mail com assunto, texto e HTML, compilados na criação.
+    """
+
+    def __init__(self, nome: str, assunto: str) -> None:
+        """
+        Carrega e compila um modelo.
+
+        :param nome: Nome dos arquivos do modelo em `templates/`, sem a extensão
+            (`.txt` e `.html`).
+        :param assunto: Modelo do assunto do e-mail.
+        """
+        self.assunto = ambiente.from_string(assunto)
+        self.texto = ambiente.get_template(f"{nome}.txt")
+        self.html = ambiente.get_template(f"{nome}.html")
+
+    def renderiza(self, **campos) -> tuple[str, str, str]:
+        """
+        Renderiza o modelo com os campos fornecidos.
+
+        :param campos: Valores usados no modelo. No HTML, são escapados, exceto os do
+            tipo `Markup`.
+        :return email: Assunto, texto e HTML do e-mail.
+        :raises jinja2.UndefinedError: Se faltar algum campo usado pelo modelo.
+        """
+        return (
+            self.assunto.render(campos),
+            self.texto.render(campos),
+            self.html.render(campos),
+        )
+
+
+CONFIRMACAO_EVENTO = ModeloEmail(
+    "confirmacaoEvento", "PET-Info: Você foi cadastrado no evento {{ evento.titulo }}"
+)
+"""Confirmação de inscrição em um evento. Campos: `evento` (ver `blocoEvento`) e `vaga`."""
+
+_modeloEventoTexto = ambiente.get_template("_evento.txt")
+_modeloEventoHtml = ambiente.get_template("_evento.html")
+
+cacheEventosEmail: CacheTTL[str, dict] = CacheTTL(
+    config.TAMANHO_CACHE_EVENTOS_EMAIL, config.TTL_CACHE_EVENTOS_EMAIL
+)
+"""Cache id do evento -> dados do evento renderizados (ver `blocoEvento`)."""
+
+
+def renderizaBlocoEvento(
+    titulo: str, local: str, dias: list[tuple[datetime, datetime]]
+) -> dict:
+    """
+    Renderiza os dados de um evento exibidos nos e-mails.
+
+    :param titulo: Título do evento.
+    :param local: Local do evento.
+    :param dias: Pares de data e hora de início e fim de cada dia do evento.
+    :return bloco: Dicionário com o `titulo` e os dados renderizados em `texto` e `html`.
+    """
+    campos = {"titulo": titulo, "local": local, "dias": dias}
+    return {
+        "titulo": titulo,
+        "texto": _modeloEventoTexto.render(campos),
+        "html": Markup(_modeloEventoHtml.render(campos)),
+    }
+
+
+async def blocoEvento(idEvento: str) -> dict:
+    """
+    Retorna os dados renderizados de um evento, do cache ou, caso não estejam nele,
+    lendo do banco de dados apenas os campos necessários.
+
+    :param idEvento: Identificador do evento.
+    :return bloco: Dados do evento renderizados (ver `renderizaBlocoEvento`).
+    :raises NaoEncontradoExcecao: Caso o evento não seja encontrado.
+    """
+    bloco = cacheEventosEmail.obter(idEvento)
+    if bloco is None:
+        geracao = cacheEventosEmail.geracao()
+        evento = await EventoBD.buscarDadosEmail(idEvento)
+        bloco = renderizaBlocoEvento(evento["titulo"], evento["local"], evento["dias"])
+        cacheEventosEmail.inserir(idEvento, bloco, geracao)
+    return bloco
+
+
+def invalidaEventoEmail(idEvento: str) -> None:
+    """
+    Remove os dados de um evento do cache dos e-mails. Deve ser chamada quando o evento
+    é editado ou removido.
+
+    :param idEvento: Identificador do evento.
+    """
+    cacheEventosEmail.remover(idEvento)
+
+
+def estatisticasCacheEventosEmail() -> dict[str, int]:
+    """
+    Retorna os contadores de acertos e falhas do cache de eventos dos e-mails.
+
+    :return estatisticas: Estatísticas do cache (ver `CacheTTL.estatisticas`).
+    """
+    return cacheEventosEmail.estatisticas()
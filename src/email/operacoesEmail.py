@@ -1,19 +1,21 @@
-import logging
-import smtplib
 from datetime import datetime
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from enum import Enum
+from string import Template
+
+from fastapi.concurrency import run_in_threadpool
 
 from src.config import config
-from src.modelos.bd import EventoBD
-from src.modelos.evento.evento import Evento
-from src.modelos.excecao import EmailNaoFoiEnviadoExcecao
+from src.email.filaEmails import enfileiraEmail, enfileiraEmailsEmMassa
+from src.email.modelosEmail import CONFIRMACAO_EVENTO, blocoEvento
+from src.modelos.bd import AvisoBD, EventoBD
+from src.modelos.email.aviso import Aviso
 from src.modelos.evento.eventoClad import TipoVaga
 
 
 # Função para enviar email customizado
-def enviarEmailGenerico(emailDestino: str, titulo: str, texto: str) -> None:
+async def enviarEmailGenerico(emailDestino: str, titulo: str, texto: str) -> None:
     """
     Envia um e-mail ao destino com o título e texto fornecidos, utilizando
     a conta de e-mail configurada no arquivo de configuração.
@@ -28,11 +30,11 @@ def enviarEmailGenerico(emailDestino: str, titulo: str, texto: str) -> None:
     mensagem["Subject"] = titulo
     mensagem.attach(MIMEText(texto, "plain", "utf-8"))
 
-    return enviarEmail(emailDestino, mensagem)
+    return await enviarEmail(emailDestino, mensagem)
 
 
 # Função para enviar verificação de email
-def enviarEmailVerificacao(emailDestino: str, link: str) -> None:
+async def enviarEmailVerificacao(emailDestino: str, link: str) -> None:
     """
     Envia um e-mail ao destino com um link para verificação da conta.
 
@@ -46,11 +48,11 @@ def enviarEmailVerificacao(emailDestino: str, link: str) -> None:
     content = "Clique no link para verificar sua conta: " + link
     mensagem.attach(MIMEText(content, "plain", "utf-8"))
 
-    return enviarEmail(emailDestino, mensagem)
+    return await enviarEmail(emailDestino, mensagem)
 
 
 # Função para enviar link troca de senha
-def enviarEmailResetSenha(emailDestino: str, link: str) -> None:
+async def enviarEmailResetSenha(emailDestino: str, link: str) -> None:
     """
     Envia um e-mail contendo um link para redefinição de senha ao destinatário.
     
@@ -64,63 +66,206 @@ def enviarEmailResetSenha(emailDestino: str, link: str) -> None:
     mensagem.attach(
         MIMEText("Para resetar sua senha, acesse o link: " + link, "plain", "utf-8")
     )
-    return enviarEmail(emailDestino, mensagem)
+    return await enviarEmail(emailDestino, mensagem)
+
+
+def formatarDiasEvento(dias: list[tuple[datetime, datetime]]) -> str:
+    """
+    Formata os dias de um evento, um por linha, com o horário de início e de fim.
+
+        :param dias: Pares de data e hora de início e fim de cada dia do evento.
+        :return dias: Texto com os dias do evento.
+    """
+    diasEvento: str = ""
+    for dia in dias:
+        diasEvento += (
+            dia[0].strftime("%d/%m/%Y, %H:%M")
+            + " - "
+            + dia[1].strftime("%d/%m/%Y, %H:%M")
+            + "\n"
+        )
+    return diasEvento
 
 
 # Função que envia email para avisar sobre inscrição do evento
-def enviarEmailConfirmacaoEvento(
+async def enviarEmailConfirmacaoEvento(
     emailDestino: str,
     idEvento: str,
     tipoVaga: TipoVaga,
 ) -> None:
     """
     Envia um e-mail ao destinatário informando a sua inscrição em um evento, contendo
-    informações sobre o evento e a vaga escolhida.
+    informações sobre o evento e a vaga escolhida, em texto e em HTML.
 
-    As informações do evento são recuperadas do banco de dados pelo identificador.
+    As informações do evento são renderizadas uma vez e reaproveitadas pelos e-mails
+    seguintes do mesmo evento (ver `src/email/modelosEmail.py`).
 
         :param emailDestino: E-mail do destinatário.
         :param idEvento: Identificador único do evento.
         :param tipoVaga: Tipo de vaga escolhida pelo inscrito.
+        :raises NaoEncontradoExcecao: Caso o evento não seja encontrado.
     """
-    # Recupera o evento
-    evento: Evento = EventoBD.buscar("_id", idEvento)
-
-    mensagem: MIMEMultipart = MIMEMultipart()
-    mensagem["From"] = config.EMAIL_SMTP
-    mensagem["To"] = emailDestino
-    mensagem["Subject"] = "PET-Info: Você foi cadastrado no evento " + evento.titulo
-
-    diasEvento: str = ""
-    for dia in evento.dias:
-        diasEvento += (
-            dia[0].strftime("%d/%m/%Y, %H:%M")
-            + " - "
-            + dia[1].strftime("%d/%m/%Y, %H:%M")
-            + "\n"
-        )
-
     if tipoVaga == TipoVaga.COM_NOTE:
         vaga = "Utilizar seu notebook."
     else:
         vaga = "Sem notebook."
 
-    mensagem.attach(
-        MIMEText(
-            "Nome do evento: "
-            + evento.titulo
-            + "\nLocal do Evento: "
-            + evento.local
-            + "\nDias do evento: "
-            + diasEvento
-            + "\nNesse evento você optou por: "
-            + vaga,
-            "plain",
-            "utf-8",
+    assunto, texto, html = CONFIRMACAO_EVENTO.renderiza(
+        evento=await blocoEvento(idEvento), vaga=vaga
+    )
+    return await enviarEmail(emailDestino, montarMensagem(emailDestino, assunto, texto, html))
+
+
+def montarEmailsAviso(
+    destinatarios: list[dict[str, str]], assunto: str, texto: str, tituloEvento: str
+) -> list[tuple[str, str]]:
+    """
+    Monta os e-mails de um aviso aos inscritos de um evento, substituindo `$nome` e
+    `$evento` no assunto e no texto pelo nome do inscrito e pelo título do evento.
+
+        :param destinatarios: Dicionários com o `nome` e o `email` de cada inscrito.
+        :param assunto: Assunto do e-mail.
+        :param texto: Texto do e-mail.
+        :param tituloEvento: Título do evento.
+        :return emails: Pares de destinatário e mensagem completa.
+    """
+    modeloAssunto, modeloTexto = Template(assunto), Template(texto)
+
+    emails = []
+    for destinatario in destinatarios:
+        campos = {"nome": destinatario["nome"], "evento": tituloEvento}
+
+        mensagem: MIMEMultipart = MIMEMultipart()
+        mensagem["From"] = config.EMAIL_SMTP
+        mensagem["To"] = destinatario["email"]
+        mensagem["Subject"] = modeloAssunto.safe_substitute(campos)
+        mensagem.attach(MIMEText(modeloTexto.safe_substitute(campos), "plain", "utf-8"))
+
+        emails.append((destinatario["email"], mensagem.as_string()))
+    return emails
+
+
+# Função que envia um aviso a um lote de inscritos de um evento
+async def enviarEmailsAviso(
+    destinatarios: list[dict[str, str]],
+    assunto: str,
+    texto: str,
+    tituloEvento: str,
+    idAviso: str | None = None,
+) -> int:
+    """
+    Coloca na fila de envio, com a prioridade de e-mails em massa, o aviso personalizado
+    para cada inscrito do lote. O envio respeita `config.LIMITE_EMAILS_POR_MINUTO`.
+
+        :param destinatarios: Dicionários com o `nome` e o `email` de cada inscrito.
+        :param assunto: Assunto do e-mail.
+        :param texto: Texto do e-mail.
+        :param tituloEvento: Título do evento.
+        :param idAviso: Identificador do aviso, se os e-mails pertencerem a um.
+        :return quantidade: Quantidade de e-mails colocados na fila.
+    """
+    emails = await run_in_threadpool(
+        montarEmailsAviso, destinatarios, assunto, texto, tituloEvento
+    )
+    return await enfileiraEmailsEmMassa(emails, idAviso)
+
+
+# Função que coloca na fila os e-mails de um aviso a todos os inscritos de um evento
+async def distribuirAviso(aviso: Aviso) -> int:
+    """
+    Coloca na fila de envio o aviso personalizado para cada inscrito do evento.
+
+    Os inscritos são lidos do banco de dados em lotes de `config.LOTE_AVISOS`, e os
+    e-mails de cada lote são colocados na fila antes da leitura do próximo, de modo que
+    a memória usada não depende da quantidade de inscritos. Os e-mails são identificados
+    pelo aviso e pelo destinatário, então a distribuição pode ser refeita após uma
+    interrupção sem repetir os inscritos que já estão na fila.
+
+        :param aviso: Aviso registrado.
+        :return quantidade: Quantidade de e-mails colocados na fila nesta execução.
+        :raises NaoEncontradoExcecao: Caso o evento não seja encontrado.
+    """
+    evento = await EventoBD.buscarDadosEmail(aviso.idEvento)
+
+    quantidade = 0
+    async for destinatarios in EventoBD.iterarDestinatarios(
+        aviso.idEvento, config.LOTE_AVISOS
+    ):
+        novos = await enviarEmailsAviso(
+            destinatarios, aviso.assunto, aviso.texto, evento["titulo"], aviso.id
         )
+        await AvisoBD.somarDestinatarios(aviso.id, novos)
+        quantidade += novos
+
+    await AvisoBD.concluir(aviso.id)
+    return quantidade
+
+
+# Função que envia o lembrete de um evento a um lote de inscritos
+async def enviarEmailsLembreteEvento(destinatarios: list[dict[str, str]], evento: dict) -> int:
+    """
+    Coloca na fila de envio o lembrete de que um evento está próximo para cada inscrito
+    do lote.
+
+        :param destinatarios: Dicionários com o `nome` e o `email` de cada inscrito.
+        :param evento: Título, local e dias do evento.
+        :return quantidade: Quantidade de e-mails colocados na fila.
+    """
+    # os dados do evento não são campos do modelo
+    local = evento["local"].replace("$", "$$")
+    dias = formatarDiasEvento(evento["dias"]).replace("$", "$$")
+    texto = (
+        "Olá, $nome!\n\nLembramos que o evento $evento, no qual você está inscrito, "
+        "começa em breve.\n\nLocal do evento: " + local + "\nDias do evento:\n" + dias
+    )
+    return await enviarEmailsAviso(
+        destinatarios, "PET-Info - Lembrete: $evento", texto, evento["titulo"]
     )
 
-    return enviarEmail(emailDestino, mensagem)
+
+# Função que avisa um lote de inscritos que a avaliação do evento foi liberada
+async def enviarEmailsAvaliacaoLiberada(
+    destinatarios: list[dict[str, str]], tituloEvento: str
+) -> int:
+    """
+    Coloca na fila de envio o aviso de que a avaliação de um evento foi liberada para
+    cada inscrito do lote.
+
+        :param destinatarios: Dicionários com o `nome` e o `email` de cada inscrito.
+        :param tituloEvento: Título do evento.
+        :return quantidade: Quantidade de e-mails colocados na fila.
+    """
+    texto = (
+        "Olá, $nome!\n\nA avaliação do evento $evento já está disponível no PET-Info. "
+        "Sua opinião é anônima e nos ajuda a melhorar os próximos eventos."
+    )
+    return await enviarEmailsAviso(
+        destinatarios, "PET-Info - Avalie o evento $evento", texto, tituloEvento
+    )
+
+
+# Função que envia o resumo diário das inscrições a um organizador
+async def enviarEmailResumoOrganizador(
+    emailDestino: str, nome: str, eventos: list[dict]
+) -> None:
+    """
+    Envia a um organizador o resumo das inscrições dos seus eventos.
+
+        :param emailDestino: E-mail do organizador.
+        :param nome: Nome do organizador.
+        :param eventos: Título, quantidade de inscrições `novas` e de comprovantes
+            `pendentes` de verificação de cada evento.
+    """
+    texto = "Olá, " + nome + "!\n\nResumo das inscrições dos seus eventos:\n"
+    for evento in eventos:
+        texto += (
+            "\n" + evento["titulo"]
+            + "\n  Novas inscrições: " + str(evento["novas"])
+            + "\n  Comprovantes aguardando verificação: " + str(evento["pendentes"])
+            + "\n"
+        )
+
+    return await enviarEmailGenerico(emailDestino, "PET-Info - Resumo das inscrições", texto)
 
 
 class DadoAlterado(Enum):
@@ -132,7 +277,7 @@ class DadoAlterado(Enum):
 
 
 # Função que envia email assim que senha/email forem trocados
-def enviarEmailAlteracaoDados(emailDestino: str, dadoAlterado: DadoAlterado) -> None:
+async def enviarEmailAlteracaoDados(emailDestino: str, dadoAlterado: DadoAlterado) -> None:
     """
     Envia um e-mail ao destinatário informando de alterações feitas em seu perfil.
         :param emailDestino: E-mail do destinatário.
@@ -159,39 +304,40 @@ def enviarEmailAlteracaoDados(emailDestino: str, dadoAlterado: DadoAlterado) ->
             "utf-8",
         )
     )
-    return enviarEmail(emailDestino, mensagem)
+    return await enviarEmail(emailDestino, mensagem)
+
+
+def montarMensagem(emailDestino: str, assunto: str, texto: str, html: str) -> MIMEMultipart:
+    """
+    Monta uma mensagem com uma versão em texto e uma em HTML; o cliente de e-mail do
+    destinatário exibe a que suportar.
+
+        :param emailDestino: E-mail do destinatário.
+        :param assunto: Assunto do e-mail.
+        :param texto: Versão em texto do e-mail.
+        :param html: Versão em HTML do e-mail.
+        :return mensagem: Mensagem montada.
+    """
+    mensagem: MIMEMultipart = MIMEMultipart("alternative")
+    mensagem["From"] = config.EMAIL_SMTP
+    mensagem["To"] = emailDestino
+    mensagem["Subject"] = assunto
+    mensagem.attach(MIMEText(texto, "plain", "utf-8"))
+    mensagem.attach(MIMEText(html, "html", "utf-8"))
+    return mensagem
 
 
 # Função que faz o envio de emails
-def enviarEmail(emailDestino: str, mensagem: MIMEMultipart) -> None:
+async def enviarEmail(emailDestino: str, mensagem: MIMEMultipart) -> None:
     """
-    Envia um e-mail ao destinatário com a mensagem fornecida.
+    Coloca na fila de envio um e-mail ao destinatário com a mensagem fornecida.
 
     Essa função é chamada por outras funções desse arquivo, que preparam a mensagem a ser enviada.
-    Quando o MOCK_EMAIL está ativado, a função apenas imprime o e-mail no log, não enviando de fato.
+    O envio é feito em segundo plano pelo entregador da fila (ver `src/email/filaEmails.py`),
+    de modo que a requisição não depende do servidor SMTP.
 
         :param emailDestino: E-mail do destinatário.
         :param mensagem: Mensagem a ser enviada.
 
     """
-    if config.MOCK_EMAIL:
-        logging.info("Envio de e-mail para " + str(emailDestino) + "\n\n")
-
-        # print MIME text with logging.info
-        imprimir = {"text/plain", "text/html"}
-        for part in mensagem.walk():
-            if part.get_content_type() in imprimir:
-                logging.info("Email:\n\n" + str(part.get_payload(decode=True)))
-
-        return
-
-    try:
-        with smtplib.SMTP(config.SERVIDOR_SMTP, config.PORTA_SMTP) as server:
-            if config.SMTP_TLS:
-                server.starttls()
-            server.login(config.EMAIL_SMTP, config.SENHA_SMTP)
-            text = mensagem.as_string()
-            server.sendmail(config.EMAIL_SMTP, emailDestino, text)
-    except Exception as e:
-        logging.warning("Erro ao enviar um email: " + str(e))
-        raise (EmailNaoFoiEnviadoExcecao)
\ No newline at end of file
+    await enfileiraEmail(emailDestino, mensagem.as_string())
@@ -0,0 +1,195 @@
+"""
+Armazenamento de imagens com contagem de referências.
+
+As imagens e os comprovantes são gravados no repositório de objetos (ver
+`armazenaImagem` e `armazenaComprovante`), onde cada arquivo é identificado pelo hash
+do seu conteúdo e pode ser compartilhado por vários usuários, eventos e inscrições.
+Por isso, quem passa a apontar para um arquivo deve chamar `armazena`, e quem deixa de
+apontar deve chamar `libera`: o arquivo só é removido quando a última referência é
+liberada. Caso uma referência seja adicionada enquanto o arquivo é removido, `armazena`
+aguarda o fim da remoção e grava o arquivo de novo (ver `ImagemBD`).
+
+A imagem de uma entidade é trocada apenas de forma condicional (ver `substitui`), para
+que cada chave seja liberada uma única vez, por quem a retirou da entidade.
+
+Fotos e artes são normalizadas em segundo plano (`processaImagemArmazenada`). Como a
+chave de um arquivo é o hash do seu conteúdo, a imagem normalizada é gravada como um
+novo arquivo, para o qual a entidade passa a apontar no lugar da original.
+"""
+
+import logging
+from typing import Awaitable, Callable
+
+from fastapi.concurrency import run_in_threadpool
+
+from src.config import config
+from src.img.operacoesImagem import deletaImagem, geraVariantes, idObjeto, normalizaImagem
+from src.img.processamento import processa
+from src.img.repositorio import obtemRepositorio
+from src.modelos.bd import ImagemBD
+from src.modelos.excecao import ImagemNaoSalvaExcecao
+
+
+async def _executa(
+    funcao: Callable[[bytes], str | None], conteudo: bytes, processoSeparado: bool
+) -> str | None:
+    """
+    Executa a função de armazenamento em uma thread ou no pool de processos.
+    """
+    if processoSeparado:
+        return await processa(funcao, conteudo)
+
+    try:
+        return await run_in_threadpool(funcao, conteudo)
+    except OSError as e:
+        raise ImagemNaoSalvaExcecao() from e
+
+
+async def armazena(
+    funcao: Callable[[bytes], str | None], conteudo: bytes, processoSeparado: bool = False
+) -> str | None:
+    """
+    Armazena uma imagem e registra uma referência a ela.
+
+    Imagens são validadas pelo cabeçalho e gravadas sem serem decodificadas, o que é
+    executado em uma thread. Funções que podem decodificar o conteúdo (ex: conversão de
+    comprovantes em PDF) devem ser executadas no pool de processos (`processoSeparado`).
+
+    :param funcao: Função de armazenamento (`armazenaImagem` ou `armazenaComprovante`).
+    :param conteudo: Conteúdo enviado.
+    :param processoSeparado: Se a função deve ser executada no pool de processos.
+    :return caminho: Chave do arquivo armazenado, ou None se o conteúdo for inválido.
+    :raises ImagemNaoSalvaExcecao: Se o arquivo não puder ser gravado.
+    """
+    caminho = await _executa(funcao, conteudo, processoSeparado)
+    if caminho is None:
+        return None
+
+    hashConteudo = idObjeto(caminho)
+    if hashConteudo is not None:
+        removendoAte = await ImagemBD.adicionarReferencia(hashConteudo)
+        if removendoAte is not None:
+            await ImagemBD.aguardarRemocao(hashConteudo, removendoAte)
+
+        # O arquivo reaproveitado pode ter sido removido pela liberação da sua última
+        # referência antes de a nova ser registrada; nesse caso, ele é gravado de novo
+        if not await run_in_threadpool(obtemRepositorio().existe, caminho):
+            caminho = await _executa(funcao, conteudo, processoSeparado)
+
+    return caminho
+
+
+async def libera(caminho: str | None) -> None:
+    """
+    Libera uma referência a uma imagem, removendo o arquivo (e as suas variantes) caso
+    ela fosse a última.
+
+    :param caminho: Chave da imagem. Se None, nada é feito.
+    """
+    if not caminho:
+        return
+
+    hashConteudo = idObjeto(caminho)
+    if hashConteudo is not None and not await ImagemBD.removerReferencia(hashConteudo):
+        return
+
+    try:
+        await run_in_threadpool(deletaImagem, caminho)
+    finally:
+        if hashConteudo is not None:
+            await ImagemBD.concluirRemocao(hashConteudo)
+
+
+async def substitui(
+    caminho: str,
+    atual: Callable[[], Awaitable[str | None]],
+    troca: Callable[[str | None, str], Awaitable[bool]],
+) -> bool:
+    """
+    Faz uma entidade apontar para a imagem recém-armazenada `caminho` e libera a imagem
+    anterior.
+
+    A troca só é feita se a entidade ainda aponta para a imagem lida; caso ela mude
+    entre a leitura e a troca (ex: um envio simultâneo ou a normalização em segundo
+    plano), a imagem atual é lida novamente, até `config.TENTATIVAS_TROCA_IMAGEM` vezes.
+    Se a troca não for feita, a nova imagem é liberada.
+
+    :param caminho: Chave da nova imagem, já armazenada (ver `armazena`).
+    :param atual: Função que lê do banco de dados a chave da imagem atual da entidade.
+    :param troca: Função que recebe a chave esperada e a nova e troca a imagem da
+        entidade, caso ela ainda aponte para a esperada, retornando se trocou.
+    :return trocada: Se a entidade passou a apontar para a nova imagem.
+    :raises NaoEncontradoExcecao: Se a entidade não existir.
+    """
+    trocada = False
+    try:
+        for _ in range(config.TENTATIVAS_TROCA_IMAGEM):
+            anterior = await atual()
+            trocada = await troca(anterior, caminho)
+            if trocada:
+                break
+    finally:
+        if not trocada:
+            await libera(caminho)
+
+    if trocada:
+        await libera(anterior)
+    return trocada
+
+
+async def _normaliza(
+    caminho: str, troca: Callable[[str, str], Awaitable[bool]]
+) -> str | None:
+    """
+    Grava a versão normalizada de uma imagem (ver `normalizaImagem`) e troca a imagem da
+    entidade por ela, liberando a original.
+
+    :param caminho: Chave da imagem original.
+    :param troca: Função que recebe a chave da original e a da normalizada e troca a
+        imagem da entidade, caso ela ainda aponte para a original, retornando se trocou.
+    :return caminho: Chave da imagem da entidade (a normalizada, ou a original caso não
+        precise de normalização), ou None se a entidade não aponta mais para a original.
+    """
+    normalizada = await processa(normalizaImagem, caminho)
+    if normalizada is None:
+        return caminho
+
+    hashConteudo = idObjeto(normalizada)
+    if hashConteudo is not None:
+        removendoAte = await ImagemBD.adicionarReferencia(hashConteudo)
+        if removendoAte is not None:
+            await ImagemBD.aguardarRemocao(hashConteudo, removendoAte)
+        if not await run_in_threadpool(obtemRepositorio().existe, normalizada):
+            normalizada = await processa(normalizaImagem, caminho)
+
+    if not await troca(caminho, normalizada):
+        # a imagem da entidade foi trocada ou removida enquanto era normalizada
+        await libera(normalizada)
+        return None
+
+    await libera(caminho)
+    return normalizada
+
+
+async def processaImagemArmazenada(
+    caminhoOriginal: str, troca: Callable[[str, str], Awaitable[bool]]
+) -> None:
+    """
+    Prepara no pool de processos uma foto ou arte recém-armazenada: normaliza a imagem,
+    caso `config.NORMALIZAR_IMAGENS`, e gera as suas variantes (tamanhos reduzidos e
+    WebP). Feito para ser executado em segundo plano, após a resposta: falhas são apenas
+    registradas, pois as rotas de imagem servem a original enquanto as variantes não
+    existirem.
+
+    :param caminhoOriginal: Chave da imagem original.
+    :param troca: Função que troca a imagem da entidade pela normalizada (ver
+        `_normaliza`).
+    """
+    try:
+        caminho: str | None = caminhoOriginal
+        if config.NORMALIZAR_IMAGENS:
+            caminho = await _normaliza(caminhoOriginal, troca)
+        if caminho is not None:
+            await processa(geraVariantes, caminho)
+    except Exception:
+        logging.exception(f"Não foi possível processar a imagem {caminhoOriginal}")
@@ -0,0 +1,87 @@
+"""
+Índice em memória dos caminhos das imagens de usuários e eventos.
+
+As rotas de imagem precisam apenas do caminho do arquivo, mas obtê-lo exigiria ler o
+usuário ou o evento do banco de dados a cada requisição. O índice associa
+(tipo da imagem, id da entidade) -> caminho do arquivo; ele é carregado na
+inicialização da aplicação e atualizado pelas operações de banco de dados que alteram
+ou removem usuários e eventos.
+
+Também é indexado que uma entidade não tem imagem, para que pedidos pela foto de um
+usuário sem foto não consultem o banco de dados.
+
+Como o índice é local a cada processo, uma entrada pode ficar desatualizada quando outro
+processo troca a imagem. Por isso as entradas expiram após `config.TTL_INDICE_IMAGENS`
+segundos; além disso, caso o arquivo de um caminho indexado não exista mais (o antigo é
+removido na troca), quem consulta o índice deve buscar o caminho no banco de dados.
+"""
+
+import time
+from enum import StrEnum
+
+from src.config import config
+
+
+class TipoImagem(StrEnum):
+    """Tipos de imagem indexados."""
+
+    FOTO_USUARIO = "foto"
+    ARTE_EVENTO = "arte"
+    CRACHA_EVENTO = "cracha"
+
+
+_indice: dict[tuple[TipoImagem, str], tuple[float, str]] = {}
+"""
+(tipo da imagem, id da entidade) -> (expiração, caminho da imagem ou "" caso a entidade
+não tenha imagem).
+"""
+
+_contadores: dict[str, int] = {"acertos": 0, "falhas": 0}
+
+
+def registraImagem(tipo: TipoImagem, id: str, caminho: str | None) -> None:
+    """
+    Registra o caminho atual de uma imagem, ou que a entidade não tem imagem.
+
+    :param tipo: Tipo da imagem.
+    :param id: Identificador do usuário ou evento.
+    :param caminho: Caminho da imagem, ou None se a entidade não tiver imagem.
+    """
+    _indice[(tipo, id)] = (time.monotonic() + config.TTL_INDICE_IMAGENS, caminho or "")
+
+
+def removeImagens(id: str) -> None:
+    """
+    Remove do índice todas as imagens de um usuário ou evento.
+
+    :param id: Identificador do usuário ou evento.
+    """
+    for tipo in TipoImagem:
+        _indice.pop((tipo, id), None)
+
+
+def obtemImagem(tipo: TipoImagem, id: str) -> str | None:
+    """
+    Retorna o caminho indexado de uma imagem.
+
+    :param tipo: Tipo da imagem.
+    :param id: Identificador do usuário ou evento.
+    :return caminho: Caminho da imagem, "" se estiver indexado que a entidade não tem
+        imagem, ou None se não estiver indexada ou a entrada tiver expirado.
+    """
+    entrada = _indice.get((tipo, id))
+    if entrada is None or entrada[0] < time.monotonic():
+        _contadores["falhas"] += 1
+        return None
+
+    _contadores["acertos"] += 1
+    return entrada[1]
+
+
+def estatisticasIndiceImagens() -> dict[str, int]:
+    """
+    Retorna os contadores de uso do índice de imagens.
+
+    :return estatisticas: Dicionário com as chaves `acertos`, `falhas` e `tamanho`.
+    """
+    return {**_contadores, "tamanho": len(_indice)}
@@ -1,242 +1,452 @@
-import time
-from pathlib import Path
+import hashlib
+import re
+import shutil
+import tempfile
+from enum import StrEnum
+from io import BytesIO
+from pathlib import Path, PurePosixPath
 from typing import BinaryIO
 
 import PyPDF2
 from pdf2image import convert_from_bytes
-from PIL import Image
+from PIL import Image, ImageOps
 
 from src.config import config
+from src.img.repositorio import obtemRepositorio
+
+
+class TamanhoImagem(StrEnum):
+    """Tamanhos em que fotos de usuários e artes de eventos são disponibilizadas."""
+
+    PEQUENO = "pequeno"
+    MEDIO = "medio"
+    ORIGINAL = "original"
+
+
+__REGEX_HASH = re.compile(r"[0-9a-f]{64}")
+"""Formato do nome (sem extensão) dos arquivos do repositório de objetos."""
+
+LADO_MAXIMO_VARIANTES: dict[TamanhoImagem, int] = {
+    TamanhoImagem.PEQUENO: 320,
+    TamanhoImagem.MEDIO: 800,
+}
+"""Maior lado, em pixels, de cada tamanho reduzido."""
 
 
 def validaImagem(imagem: bytes | BinaryIO | str) -> bool:
-    """Retorna se 'imagem' é válida.
+    """Retorna se 'imagem' é válida: PNG ou JPEG com no máximo `config.PIXELS_MAXIMOS_IMAGEM`
+    pixels. Apenas o cabeçalho é lido; a imagem não é decodificada.
 
     :param imagem -- a imagem em si ou o caminho da imagem
 
     :return -- valor booleano
     """
-    eh_valida = True
-    try:
-        with Image.open(imagem) as img:
-            if img.format not in ["PNG", "JPEG"]:
-                eh_valida = False
-    except IOError:
-        return False
-
-    return eh_valida
+    return __formatoImagem(imagem) is not None
 
 
 def validaComprovante(comprovante: bytes | BinaryIO | str) -> bool:
-    """Retorna se 'comprovante' é válido.
+    """Retorna se 'comprovante' é válido: uma imagem válida (ver `validaImagem`) ou um PDF
+    não criptografado.
 
     :param comprovante -- o comprovante em si ou o caminho do comprovante
 
     :return -- valor booleano
     """
-    eh_valida = True
+    comprovante = __comoArquivo(comprovante)
+    if __formatoImagem(comprovante) is not None:
+        return True
 
     try:
-        with Image.open(comprovante) as img:
-            if img.format not in ["PNG", "JPEG", "PDF"]:
-                eh_valida = False
-    except IOError:
-        try:
-            # Abre o PDF
-            pdf_reader = PyPDF2.PdfReader(comprovante)  # type: ignore
+        # Abre o PDF e checa se está criptografado
+        return not PyPDF2.PdfReader(comprovante).is_encrypted  # type: ignore
+    except Exception as e:
+        return False
+
 
-            # Checa se o PDF está criptografado
-            if pdf_reader.is_encrypted:
-                return False
-        except Exception as e:
-            return False
+def armazenaImagem(arquivo: bytes | BinaryIO) -> str | None:
+    """Armazena uma imagem (PNG ou JPEG) no repositório de objetos, com a chave
+    "objetos/{prefixo}/{hash}.{extensao}", onde hash é o SHA-256 do conteúdo
+    enviado. A imagem é validada apenas pelo cabeçalho e gravada sem alterações, sem ser
+    decodificada; a remoção de metadados e a redução de imagens grandes são feitas depois,
+    em segundo plano (ver `normalizaImagem`). Se uma imagem com o mesmo conteúdo já estiver
+    armazenada, ela é reaproveitada.
 
-    return eh_valida
+    :param arquivo -- a imagem em si
+
+    :return -- chave da imagem salva -> str. None, se a imagem for inválida.
+    """
+    conteudo = __comoBytes(arquivo)
 
+    formato = __formatoImagem(conteudo)
+    if formato is None:
+        return None
 
-def armazenaFotoUsuario(idUsuario: str, arquivo: str | bytes | BinaryIO) -> Path | None:
-    """Armazena a imagem em "images/usuario" usando um nome base para o arquivo.
+    return __gravaOriginal(conteudo, formato)
 
-    :param idUsuario -- nome do usuario relacionado a imagem
-    :param arquivo -- a imagem em si
 
-    :return -- caminho para a imagem salva -> str. None, se a imagem for inválida.
+def armazenaComprovante(arquivo: bytes | BinaryIO) -> str | None:
+    """Armazena um comprovante (PNG, JPEG ou PDF) no repositório de objetos, endereçado
+    pelo SHA-256 do conteúdo enviado. Imagens são gravadas sem alterações, como em
+    `armazenaImagem`; PDFs são convertidos em uma imagem PNG. Se um comprovante com o
+    mesmo conteúdo já estiver armazenado, ele é reaproveitado.
+
+    :param arquivo -- o comprovante em si
+
+    :return -- chave do comprovante salvo -> str. None, se o comprovante for inválido.
     """
-    path = config.CAMINHO_IMAGEM / "usuarios"
-    retorno = __armazenaImagem(path, idUsuario, arquivo)
+    conteudo = __comoBytes(arquivo)
 
-    return retorno
+    formato = __formatoImagem(conteudo)
+    if formato is not None:
+        return __gravaOriginal(conteudo, formato)
 
+    chave = __chaveObjeto(hashlib.sha256(conteudo).hexdigest(), "png")
+    if obtemRepositorio().existe(chave):
+        return chave
 
-def armazenaArteEvento(idEvento: str, arquivo: bytes | BinaryIO) -> Path | None:
-    """Armazena a imagem em "images/eventos/{evento}/arte" usando um nome base para o arquivo.
+    try:
+        imagem = __convertePdf(conteudo)
+        if imagem is None:
+            return None
+        with imagem:
+            return __salvaNoRepositorio(imagem, chave)
+    except Exception as e:
+        return None
 
-    :param idEvento -- nome do evento relacionada a imagem
-    :param arquivo -- a imagem em si
 
-    :return -- caminho para a imagem salva -> str. None, se a imagem for inválida.
+def idObjeto(caminho: str | Path) -> str | None:
+    """Retorna o hash de um arquivo do repositório de objetos, ou None caso o arquivo
+    não pertença ao repositório (ex: imagens armazenadas antes dele).
+
+    :param caminho -- caminho da imagem ou de uma de suas variantes
+
+    :return -- hash do conteúdo, ou None
     """
-    path = config.CAMINHO_IMAGEM / "eventos" / idEvento / "arte"
-    retorno = __armazenaImagem(path, idEvento, arquivo)
+    nome = Path(caminho).name.split(".")[0]
+    if __REGEX_HASH.fullmatch(nome):
+        return nome
+    return None
 
-    return retorno
 
+def versaoImagem(caminho: str | Path) -> str:
+    """Retorna a versão de uma imagem armazenada: o hash do conteúdo, para imagens do
+    repositório de objetos, ou a estampa de tempo incluída no nome das imagens antigas.
+    As variantes de uma imagem têm a mesma versão dela.
 
-def armazenaCrachaEvento(idEvento: str, arquivo: bytes | BinaryIO) -> Path | None:
-    """Armazena a imagem em "images/eventos/{evento}/cracha" usando um nome base para o arquivo.
+    :param caminho -- caminho da imagem ou de uma de suas variantes
 
-    :param idEvento -- nome do evento relacionado a imagem
-    :param arquivo -- a imagem em si
+    :return -- versão da imagem
+    """
+    nome = Path(caminho).name.split(".")[0]
+    return nome.rsplit("-", 1)[-1]
 
-    :return -- caminho para a imagem salva -> str. None, se a imagem for inválida.
+
+def urlImagem(
+    rota: str, caminho: str | Path, tamanho: TamanhoImagem = TamanhoImagem.ORIGINAL
+) -> str:
+    """Retorna a URL pública de uma imagem, incluindo sua versão. Como o conteúdo de uma
+    versão nunca muda, as respostas a essas URLs podem ser armazenadas em cache
+    indefinidamente.
+
+    :param rota -- rota da imagem, relativa a "/img" (ex: "usuarios/{id}/foto")
+    :param caminho -- caminho da imagem armazenada
+    :param tamanho -- tamanho da imagem referenciado pela URL
+
+    :return -- URL da imagem
     """
-    path = config.CAMINHO_IMAGEM / "eventos" / idEvento / "cracha"
-    retorno = __armazenaImagem(path, idEvento, arquivo)
+    url = f"{config.CAMINHO_BASE}/img/{rota}?v={versaoImagem(caminho)}"
+    if tamanho != TamanhoImagem.ORIGINAL:
+        url += f"&tamanho={tamanho}"
+    return url
 
-    return retorno
 
+def caminhoVariante(
+    caminhoOriginal: str | Path, tamanho: TamanhoImagem, formato: str | None = None
+) -> str:
+    """Retorna a chave de uma variante de uma imagem armazenada. As variantes ficam na
+    mesma pasta da imagem original (ex: "objetos/3d/3d37...1f7e.pequeno.webp").
 
-def armazenaComprovante(
-    idEvento: str, idUsuario: str, arquivo: bytes | BinaryIO
-) -> Path | None:
-    """Armazena a imagem em "images/eventos/{evento}/comprovantes" usando um nome base para o arquivo.
+    :param caminhoOriginal -- caminho da imagem original
+    :param tamanho -- tamanho da variante
+    :param formato -- extensão da variante. Se None, usa a extensão da imagem original
 
-    :param idEvento -- nome do evento relacionado ao comprovante
-    :param idUsuario -- id do usuário relacionado ao comprovante
-    :param arquivo -- o comprovante em si
+    :return -- chave da variante, que pode não existir
+    """
+    original = PurePosixPath(caminhoOriginal)
+    extensao = formato or original.suffix.removeprefix(".")
+    return str(original.with_name(f"{original.stem}.{tamanho}.{extensao}"))
 
-    :return -- caminho para o comprovante salvo -> str. None, se o comprovante for inválido.
+
+def normalizaImagem(caminho: str | Path) -> str | None:
+    """Grava uma cópia da imagem armazenada sem os metadados (EXIF, XMP e comentários),
+    com a orientação indicada no EXIF já aplicada, e reduzida caso algum lado exceda
+    `config.LADO_MAXIMO_IMAGEM`. O perfil de cor é mantido. A cópia é um novo objeto,
+    endereçado pelo hash do seu próprio conteúdo; a imagem original não é alterada.
+
+    :param caminho -- chave da imagem
+
+    :return -- chave da imagem normalizada. None, se a imagem já atender a essas
+    condições.
     """
-    path = config.CAMINHO_IMAGEM / "eventos" / idEvento / "comprovantes"
-    retorno = __armazenaComprovante(path, idUsuario, arquivo)
+    with obtemRepositorio().abre(str(caminho)) as arquivo:
+        conteudo = BytesIO(arquivo.read())
+
+    with Image.open(conteudo) as img:
+        metadados = bool(img.getexif()) or any(
+            chave in img.info for chave in ["xmp", "XML:com.adobe.xmp", "comment"]
+        )
+        if not metadados and max(img.size) <= config.LADO_MAXIMO_IMAGEM:
+            return None
+
+        formato = img.format
+        parametros = {}
+        if "icc_profile" in img.info:
+            parametros["icc_profile"] = img.info["icc_profile"]
+        if formato == "JPEG":
+            parametros["quality"] = 90
 
-    return retorno
+        normalizada = ImageOps.exif_transpose(img)
+        normalizada.info.clear()
+        normalizada.thumbnail((config.LADO_MAXIMO_IMAGEM, config.LADO_MAXIMO_IMAGEM))
 
+        saida = BytesIO()
+        normalizada.save(saida, format=formato, **parametros)
 
-def procuraImagem(nomeImagem: str, searchPath: list[str] = []) -> list[Path]:
-    """Retorna uma lista com os caminhos para as imagens que
-    contenham 'nomeImagem' em seu nome. Retorna uma lista vazia
-    caso não encontre nada.
+    return __gravaOriginal(saida.getvalue(), formato)
 
-    :param nomeImagem -- nome da imagem a ser procurada
-    :param serchPath -- caminho onde buscar a imagem(s)
 
-    :return -- lista contendo os caminhos das imagens encontradas
+def geraVariantes(caminhoOriginal: str | Path) -> list[str]:
+    """Gera as variantes de uma imagem armazenada: para cada tamanho reduzido, uma
+    cópia no formato original e outra em WebP; para o tamanho original, uma cópia em WebP.
+    Variantes já existentes (ex: de uma imagem reaproveitada) não são geradas novamente.
+
+    :param caminhoOriginal -- caminho da imagem original
+
+    :return -- lista com a chave das variantes geradas
     """
+    repositorio = obtemRepositorio()
+    geradas: list[str] = []
+    with repositorio.abre(str(caminhoOriginal)) as original:
+        # o PIL precisa de um arquivo com seek, o que nem todo repositório oferece
+        conteudo = BytesIO(original.read())
+
+    with Image.open(conteudo) as original:
+        # aplica a orientação do EXIF, que não é copiado para as variantes
+        img = ImageOps.exif_transpose(original)
+        for tamanho in TamanhoImagem:
+            variante = img
+            if tamanho in LADO_MAXIMO_VARIANTES:
+                lado = LADO_MAXIMO_VARIANTES[tamanho]
+                variante = img.copy()
+                variante.thumbnail((lado, lado))
 
-    path = config.CAMINHO_IMAGEM
-    if searchPath:
-        path = path.joinpath(*searchPath)
+                chave = caminhoVariante(caminhoOriginal, tamanho)
+                if not repositorio.existe(chave):
+                    geradas.append(__salvaNoRepositorio(variante, chave, optimize=True))
 
-    matches = [p for p in path.rglob(f"*{nomeImagem}*") if p.is_file()]
-    return matches
+            chave = caminhoVariante(caminhoOriginal, tamanho, "webp")
+            if not repositorio.existe(chave):
+                geradas.append(__salvaNoRepositorio(variante, chave, quality=80))
 
+    return geradas
 
-def deletaImagem(nomeImagem: str, path: list[str] = []) -> list[Path] | None:
-    """Deleta uma imagem. Caso seja encontrado mais de uma imagem com o termo de busca, todas serão deletadas.
 
-    :param nomeImagem -- nome da imagem para ser removida
-    :param path -- caminho onde procurar e deletar
+def caminhosVariantes(caminhoOriginal: str | Path) -> list[str]:
+    """Retorna as chaves de todas as variantes possíveis de uma imagem, existam ou não.
 
-    :return -- lista com o caminho de todas as imagens deletadas, None caso nada tenha sido deletado.
+    :param caminhoOriginal -- caminho da imagem original
+
+    :return -- lista com as chaves das variantes
     """
-    imagens = procuraImagem(nomeImagem, path)
-    if imagens:
-        deletados: list[Path] = []
-        for imagem in imagens:
-            imagem.unlink()
-            deletados.append(imagem)
-        return deletados
-    return None
+    caminhos = [caminhoVariante(caminhoOriginal, tamanho, "webp") for tamanho in TamanhoImagem]
+    caminhos += [caminhoVariante(caminhoOriginal, tamanho) for tamanho in LADO_MAXIMO_VARIANTES]
+    return caminhos
 
 
-def __armazenaImagem(
-    path: Path, nomeBase: str, imagem: bytes | BinaryIO | str
-) -> Path | None:
-    """Armazena a imagem no path fornecido usando um nome base.
+def deletaImagem(caminho: str | Path | None) -> list[str]:
+    """Deleta uma imagem armazenada e as suas variantes, pela chave exata.
 
-    :param path -- caminho onde será armazenado a imagem
-    :param nomeBase -- nome como será salvo a imagem
-    :param imagem -- a imagem em si que será salva
+    :param caminho -- chave da imagem, como armazenada no banco de dados
 
-    :return -- caminho para a imagem salva : str. None, se a imagem for inválida.
+    :return -- lista com a chave de todos os arquivos deletados
     """
+    if not caminho:
+        return []
 
+    repositorio = obtemRepositorio()
+    return [
+        chave
+        for chave in [str(caminho), *caminhosVariantes(caminho)]
+        if repositorio.remove(chave)
+    ]
+
+
+def deletaPastaEvento(idEvento: str) -> None:
+    """Deleta a pasta de imagens de um evento (arte, crachá e comprovantes), usada
+    antes do repositório de objetos. Só existe no armazenamento local.
+
+    :param idEvento -- id do evento
+    """
+    shutil.rmtree(config.CAMINHO_IMAGEM / "eventos" / idEvento, ignore_errors=True)
+
+
+def __chaveObjeto(hashConteudo: str, extensao: str) -> str:
+    """Retorna a chave de um objeto no repositório. Os objetos são distribuídos em até
+    256 subpastas, pelo prefixo do hash, para que nenhuma pasta acumule muitos arquivos.
+
+    :param hashConteudo -- SHA-256 do conteúdo
+    :param extensao -- extensão do arquivo
+
+    :return -- chave do objeto
+    """
+    return f"objetos/{hashConteudo[:2]}/{hashConteudo}.{extensao}"
+
+
+def __formatoImagem(arquivo: bytes | BinaryIO | str) -> str | None:
+    """Retorna o formato de uma imagem lendo apenas o seu cabeçalho, ou None caso ela não
+    seja PNG ou JPEG ou exceda `config.PIXELS_MAXIMOS_IMAGEM` pixels.
+
+    :param arquivo -- o conteúdo do arquivo, o arquivo em si ou o seu caminho
+
+    :return -- formato da imagem (ex: "PNG"), ou None
+    """
     try:
-        with Image.open(imagem, formats=["PNG", "JPEG"]) as img:
-            extensao = img.format.lower()  # type: ignore
-            nome = __geraNomeImagem(nomeBase, extensao=extensao)
-            pathDefinitivo = path / nome
-            img.save(pathDefinitivo)
-        return pathDefinitivo
-    except IOError:
+        # Image.open lê apenas o cabeçalho; os pixels só são decodificados sob demanda
+        with Image.open(__comoArquivo(arquivo), formats=["PNG", "JPEG"]) as img:
+            if img.width * img.height > config.PIXELS_MAXIMOS_IMAGEM:
+                return None
+            return img.format
+    except (OSError, ValueError, Image.DecompressionBombError):
         return None
+    finally:
+        if not isinstance(arquivo, (bytes, str)):
+            arquivo.seek(0)
 
 
-def __armazenaComprovante(
-    path: Path, nomeBase: str, comprovante: bytes | BinaryIO | str
-) -> Path | None:
-    """Armazena o comprovante no path fornecido usando um nome base.
+def __gravaOriginal(conteudo: bytes, formato: str) -> str:
+    """Grava o conteúdo enviado, sem alterações, no repositório de objetos, caso ainda
+    não esteja armazenado.
 
-    :param path -- caminho onde será armazenado o comprovante
-    :param nomeBase -- nome como será salvo o comprovante
-    :param imagem -- o comprovante em si que será salvo
+    :param conteudo -- conteúdo da imagem
+    :param formato -- formato da imagem, segundo o PIL
 
-    :return -- caminho para o comprovante salvo : str. None, se o comprovante for inválido.
+    :return -- chave do objeto
     """
-    try:
-        with Image.open(comprovante, formats=["PNG", "JPEG"]) as img:
-            extensao = img.format.lower()  # type: ignore
-            nome = __geraNomeImagem(nomeBase, extensao=extensao)
-            pathDefinitivo = path / nome
-            img.save(pathDefinitivo)
-        return pathDefinitivo
-    except IOError:
-        try:
-            # Lê o arquivo, em binário, do PDF
-            arquivo_pdf = comprovante.read()
-
-            # Converte o PDF na memória para uma lista de imagens
-            imagens = convert_from_bytes(arquivo_pdf)
-
-            # Converte as imagens para RGB, caso necessário
-            for image in imagens:
-                if image.mode != "RGB":
-                    image = image.convert("RGB")
-
-            # Define as dimensões máximas das imagens
-            largura_saida = max(image.width for image in imagens)
-            altura_saida = sum(image.height for image in imagens)
-
-            # Cria a imagem de saída
-            imagem_saida = Image.new("RGB", (largura_saida, altura_saida))
-
-            # Concatena as imagens na vertical
-            pos_y = 0
-            for imagem_chunk in imagens:
-                imagem_saida.paste(imagem_chunk, (0, pos_y))
-                pos_y += imagem_chunk.height
-
-            # Salva a imagem de saída
-            nome = __geraNomeImagem(nomeBase, "png")
-            pathDefinitivo = path / nome
-            imagem_saida.save(pathDefinitivo)
-            return pathDefinitivo
-
-        except Exception as e:
-            return None
+    chave = __chaveObjeto(hashlib.sha256(conteudo).hexdigest(), formato.lower())
+
+    repositorio = obtemRepositorio()
+    if not repositorio.existe(chave):
+        repositorio.grava(chave, BytesIO(conteudo), Image.MIME.get(formato))
+    return chave
 
 
-def __geraNomeImagem(nomeBase: str, extensao: str) -> str:
-    """Gera um nome para a imagem a partir de um nome base e uma extensao,
-    adiciona uma timestamp para evitar problemas com o cache do navegador
+def __salvaNoRepositorio(img: Image.Image, chave: str, **parametros) -> str:
+    """Codifica a imagem em um arquivo temporário (em memória, se for pequena) e o grava
+    no repositório, que só torna o arquivo visível depois de gravado por completo.
 
-    :param nomeBase -- nome base para gerar o novo nome
-    :param extensao -- extensao da imagem
+    :param img -- imagem a ser salva
+    :param chave -- chave do arquivo; a extensão define o formato
+    :param parametros -- parâmetros repassados a `Image.save`
 
-    :return -- nome como será salva a imagem
+    :return -- chave do arquivo
     """
-    estampa = int(time.time())
-    nome = f"{nomeBase}-{estampa}.{extensao}"
+    formato = Image.registered_extensions()[PurePosixPath(chave).suffix]
+    with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as arquivo:
+        img.save(arquivo, format=formato, **parametros)
+        arquivo.seek(0)
+        obtemRepositorio().grava(chave, arquivo, Image.MIME.get(formato))  # type: ignore
+    return chave
 
-    return nome
+
+def __convertePdf(arquivoPdf: bytes) -> Image.Image | None:
+    """Converte as primeiras páginas de um PDF em uma única imagem, com as páginas
+    concatenadas na vertical.
+
+    As páginas são renderizadas uma por vez, já na largura final, e coladas em uma imagem
+    de tamanho definido antes da renderização. O número de páginas, a resolução e as
+    dimensões da imagem são limitados pelas configurações `*_COMPROVANTE`, o que limita
+    a memória utilizada independentemente do conteúdo do PDF.
+
+    :param arquivoPdf -- conteúdo do PDF
+
+    :return -- imagem gerada. None, se o PDF for inválido.
+    """
+    leitor = PyPDF2.PdfReader(BytesIO(arquivoPdf))
+    if leitor.is_encrypted:
+        return None
+
+    # Dimensões das páginas, em pontos (1/72 polegada), considerando a rotação
+    dimensoes: list[tuple[float, float]] = []
+    for pagina in leitor.pages[: config.PAGINAS_MAXIMAS_COMPROVANTE]:
+        largura, altura = float(pagina.mediabox.width), float(pagina.mediabox.height)
+        if (pagina.get("/Rotate") or 0) % 180 == 90:
+            largura, altura = altura, largura
+        if largura > 0 and altura > 0:
+            dimensoes.append((largura, altura))
+
+    if not dimensoes:
+        return None
+
+    # Largura final: a da maior página na resolução configurada, limitada ao máximo
+    larguraSaida = min(
+        config.LARGURA_MAXIMA_COMPROVANTE,
+        round(max(largura for largura, _ in dimensoes) * config.DPI_COMPROVANTE / 72),
+    )
+    alturas = [round(altura * larguraSaida / largura) for largura, altura in dimensoes]
+    alturaSaida = min(config.ALTURA_MAXIMA_COMPROVANTE, sum(alturas))
+
+    imagemSaida = Image.new("RGB", (larguraSaida, alturaSaida), "white")
+
+    posY = 0
+    for numero, altura in enumerate(alturas, start=1):
+        if posY >= alturaSaida:
+            break
+
+        # Páginas muito altas são renderizadas pela altura, para não exceder o limite
+        if altura > config.ALTURA_MAXIMA_COMPROVANTE:
+            tamanho = (None, config.ALTURA_MAXIMA_COMPROVANTE)
+        else:
+            tamanho = (larguraSaida, None)
+
+        (pagina,) = convert_from_bytes(
+            arquivoPdf,
+            dpi=config.DPI_COMPROVANTE,
+            first_page=numero,
+            last_page=numero,
+            size=tamanho,
+        )
+        if pagina.mode != "RGB":
+            pagina = pagina.convert("RGB")
+
+        # O que exceder a altura da imagem de saída é descartado pelo paste
+        imagemSaida.paste(pagina, (0, posY))
+        posY += pagina.height
+        pagina.close()
+
+    return imagemSaida
+
+
+def __comoBytes(arquivo: bytes | BinaryIO) -> bytes:
+    """Retorna o conteúdo de 'arquivo' em bytes.
+
+    :param arquivo -- o conteúdo do arquivo ou o arquivo em si
+
+    :return -- conteúdo do arquivo
+    """
+    if isinstance(arquivo, bytes):
+        return arquivo
+    arquivo.seek(0)
+    return arquivo.read()
+
+
+def __comoArquivo(arquivo: bytes | BinaryIO | str) -> BinaryIO | str:
+    """Envolve 'arquivo' em um BytesIO caso seja bytes, pois o PIL e o PyPDF2
+    esperam um caminho ou um arquivo.
+
+    :param arquivo -- o conteúdo do arquivo, o arquivo em si ou o seu caminho
+
+    :return -- arquivo ou caminho que pode ser aberto pelo PIL e pelo PyPDF2
+    """
+    if isinstance(arquivo, bytes):
+        return BytesIO(arquivo)
+    return arquivo
@@ -0,0 +1,215 @@
+"""
+Pool de processos para o processamento de imagens e comprovantes.
+
+Decodificar, converter e salvar imagens (e rasterizar PDFs) consome bastante CPU. Para
+que esse trabalho não dispute o processador com o event loop e as threads da API, ele
+é executado em um pool de processos dedicado, com fila limitada e tempo limite por
+tarefa:
+
+- no máximo `config.TAMANHO_FILA_IMAGEM` tarefas aguardam ou estão em execução; além
+  disso, novas tarefas são recusadas com `ProcessamentoOcupadoExcecao`;
+- a requisição aguarda no máximo `config.TEMPO_LIMITE_IMAGEM` segundos pelo resultado.
+  Um processo do pool não pode ser interrompido no meio de uma tarefa, então a tarefa
+  continua ocupando seu processo e sua vaga na fila até terminar de fato. Por isso, as
+  funções executadas devem ter a duração limitada por si mesmas (ex: limite de pixels
+  e de páginas); uma tarefa que nunca termina ocupa sua vaga até o encerramento do pool.
+
+Caso um processo do pool seja encerrado abruptamente (ex: falta de memória), o pool
+deixa de aceitar tarefas; ele é então descartado e recriado na próxima tarefa.
+
+As funções executadas e seus argumentos são enviados aos processos por *pickle*, então
+devem ser funções de módulo e receber dados simples (ex: `bytes` em vez de arquivos).
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+from src.config import config
+from src.modelos.excecao import ImagemNaoSalvaExcecao, ProcessamentoOcupadoExcecao
+
+try:
+    import resource
+except ImportError:  # indisponível no Windows
+    resource = None
+
+R = TypeVar("R")
+
+_pool: ProcessPoolExecutor | None = None
+"Pool de processos. Criado por `iniciaProcessamento`."
+
+_pendentes: int = 0
+"Quantidade de tarefas aguardando ou em execução."
+
+_metricas: dict[str, float] = {
+    "concluidas": 0,
+    "falhas": 0,
+    "recusadas": 0,
+    "tempoLimiteExcedido": 0,
+    "latenciaTotal": 0.0,
+    "latenciaMaxima": 0.0,
+    "execucaoTotal": 0.0,
+    "memoriaPico": 0.0,
+}
+"Contadores acumulados desde a inicialização do processo."
+
+
+def iniciaProcessamento() -> None:
+    """
+    Cria o pool de processos, caso ainda não exista.
+    """
+    global _pool
+
+    if _pool is None:
+        # "spawn" evita copiar para os processos filhos as threads e conexões do processo
+        # principal, como acontece com "fork"
+        _pool = ProcessPoolExecutor(
+            max_workers=config.PROCESSOS_IMAGEM,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+
+def encerraProcessamento() -> None:
+    """
+    Encerra o pool de processos, descartando as tarefas que ainda não começaram.
+    """
+    global _pool
+
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
+
+
+def _descartaPool(pool: ProcessPoolExecutor) -> None:
+    """
+    Descarta um pool interrompido (`BrokenProcessPool`), para que o próximo seja criado
+    por `iniciaProcessamento`. Nada é feito caso ele já tenha sido substituído.
+
+    :param pool: Pool interrompido.
+    """
+    global _pool
+
+    logging.error("Pool de processamento de imagens interrompido; ele será recriado")
+    pool.shutdown(wait=False, cancel_futures=True)
+    if _pool is pool:
+        _pool = None
+
+
+def _executaMedindo(funcao: Callable[..., R], args: tuple) -> tuple[R, float, float]:
+    """
+    Executa `funcao(*args)` no processo do pool e retorna também o tempo de execução e o
+    pico de memória residente do processo, em bytes (0 se indisponível).
+    """
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    duracao = time.perf_counter() - inicio
+
+    memoriaPico = 0.0
+    if resource is not None:
+        # ru_maxrss é dado em kilobytes no Linux
+        memoriaPico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    return resultado, duracao, memoriaPico
+
+
+async def processa(funcao: Callable[..., R], *args: Any) -> R:
+    """
+    Executa `funcao(*args)` no pool de processos e aguarda o resultado.
+
+    :param funcao: Função de módulo a ser executada.
+    :param args: Argumentos da função.
+    :return resultado: Valor retornado pela função.
+    :raises ProcessamentoOcupadoExcecao: Se a fila de processamento estiver cheia.
+    :raises ImagemNaoSalvaExcecao: Se o tempo limite de processamento for excedido (a
+        tarefa continua em execução, ocupando sua vaga) ou se o processo que a executava
+        for encerrado abruptamente.
+    """
+    global _pendentes
+
+    if _pendentes >= config.TAMANHO_FILA_IMAGEM:
+        _metricas["recusadas"] += 1
+        raise ProcessamentoOcupadoExcecao()
+
+    iniciaProcessamento()
+    pool = _pool
+    assert pool is not None  # tipagem
+
+    try:
+        futuroPool = pool.submit(_executaMedindo, funcao, args)
+    except BrokenProcessPool:
+        # o pool foi interrompido por uma tarefa anterior; a tarefa vai para um novo
+        _descartaPool(pool)
+        iniciaProcessamento()
+        pool = _pool
+        assert pool is not None  # tipagem
+        futuroPool = pool.submit(_executaMedindo, funcao, args)
+
+    inicio = time.perf_counter()
+    _pendentes += 1
+
+    def liberaVaga(futuro: asyncio.Future) -> None:
+        global _pendentes
+
+        _pendentes -= 1
+        latencia = time.perf_counter() - inicio
+
+        if futuro.cancelled() or futuro.exception() is not None:
+            _metricas["falhas"] += 1
+            return
+
+        _metricas["concluidas"] += 1
+        _metricas["latenciaTotal"] += latencia
+        _metricas["latenciaMaxima"] = max(_metricas["latenciaMaxima"], latencia)
+        _, execucao, memoriaPico = futuro.result()
+        _metricas["execucaoTotal"] += execucao
+        _metricas["memoriaPico"] = max(_metricas["memoriaPico"], memoriaPico)
+
+    futuro = asyncio.wrap_future(futuroPool)
+    futuro.add_done_callback(liberaVaga)
+
+    try:
+        # o shield mantém a tarefa (e sua vaga) viva mesmo se a espera for cancelada
+        resultado, _, _ = await asyncio.wait_for(
+            asyncio.shield(futuro), config.TEMPO_LIMITE_IMAGEM
+        )
+    except TimeoutError:
+        _metricas["tempoLimiteExcedido"] += 1
+        raise ImagemNaoSalvaExcecao(
+            message="Tempo limite de processamento da imagem excedido."
+        )
+    except BrokenProcessPool:
+        # um processo foi encerrado abruptamente (ex: falta de memória) durante a tarefa
+        _descartaPool(pool)
+        raise ImagemNaoSalvaExcecao()
+
+    return resultado
+
+
+def estatisticasProcessamento() -> dict[str, float]:
+    """
+    Retorna as métricas do pool de processamento de imagens.
+
+    :return estatisticas: Dicionário com a profundidade atual da fila, os contadores de
+        tarefas e as latências médias e máxima, em milissegundos. A latência inclui a
+        espera na fila; a execução considera apenas o tempo no processo do pool. O pico de
+        memória é o maior pico de memória residente observado entre os processos do pool.
+    """
+    concluidas = _metricas["concluidas"]
+    return {
+        "profundidadeFila": _pendentes,
+        "capacidadeFila": config.TAMANHO_FILA_IMAGEM,
+        "processos": config.PROCESSOS_IMAGEM,
+        "concluidas": concluidas,
+        "falhas": _metricas["falhas"],
+        "recusadas": _metricas["recusadas"],
+        "tempoLimiteExcedido": _metricas["tempoLimiteExcedido"],
+        "latenciaMediaMs": _metricas["latenciaTotal"] / concluidas * 1000 if concluidas else 0.0,
+        "latenciaMaximaMs": _metricas["latenciaMaxima"] * 1000,
+        "execucaoMediaMs": _metricas["execucaoTotal"] / concluidas * 1000 if concluidas else 0.0,
+        "memoriaPicoMB": _metricas["memoriaPico"] / (1024 * 1024),
+    }
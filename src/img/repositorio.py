@@ -0,0 +1,266 @@
+"""
+Repositórios dos arquivos enviados à aplicação (imagens e comprovantes).
+
+Os arquivos são identificados por uma chave relativa, com "/" como separador
+(ex: "objetos/3d/3d37...1f7e.png"), que é o valor gravado no banco de dados. O
+repositório utilizado é escolhido por `config.ARMAZENAMENTO`:
+
+- "local": arquivos em `config.CAMINHO_IMAGEM`. Aceita também os caminhos absolutos
+  gravados antes da existência dos repositórios;
+- "s3": arquivos em um *bucket* compatível com S3 (AWS, MinIO etc.), o que permite
+  executar a API em mais de um servidor sem disco compartilhado. Requer o pacote
+  opcional `boto3` (`poetry install --extras s3`).
+
+Os métodos são síncronos, pois são chamados pelos processos do pool de imagens; no
+event loop, devem ser chamados com `run_in_threadpool`.
+"""
+
+import functools
+import os
+import shutil
+import stat
+import tempfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+from pydantic import BaseModel
+
+from src.config import config
+
+TAMANHO_BLOCO = 64 * 1024
+"""Tamanho, em bytes, dos blocos lidos e gravados de cada vez."""
+
+
+class InfoArquivo(BaseModel):
+    """Metadados de um arquivo armazenado."""
+
+    tamanho: int
+    "Tamanho em bytes."
+
+    modificacao: float
+    "Data da última modificação, em segundos desde a época Unix."
+
+    etag: str | None = None
+    "Identificador do conteúdo fornecido pelo repositório, se houver."
+
+
+class Repositorio(ABC):
+    """Interface dos repositórios de arquivos, implementada por cada tipo de armazenamento."""
+
+    local: bool = False
+    "Se os arquivos estão no disco local, caso em que as operações são chamadas de sistema."
+
+    @abstractmethod
+    def existe(self, chave: str) -> bool:
+        """
+        Retorna se existe um arquivo com a chave fornecida.
+
+        :param chave: Chave do arquivo.
+        :return existe: Se o arquivo existe.
+        """
+
+    @abstractmethod
+    def info(self, chave: str) -> InfoArquivo | None:
+        """
+        Retorna os metadados de um arquivo.
+
+        :param chave: Chave do arquivo.
+        :return info: Metadados do arquivo, ou None se ele não existir.
+        """
+
+    @abstractmethod
+    def grava(self, chave: str, arquivo: BinaryIO, tipoConteudo: str | None = None) -> None:
+        """
+        Grava o conteúdo de `arquivo`, lido em blocos, substituindo o arquivo com a mesma
+        chave, se houver. O arquivo só se torna visível depois de gravado por completo.
+
+        :param chave: Chave do arquivo.
+        :param arquivo: Conteúdo a ser gravado, lido a partir da posição atual.
+        :param tipoConteudo: Tipo MIME do conteúdo.
+        """
+
+    @abstractmethod
+    def abre(self, chave: str) -> BinaryIO:
+        """
+        Abre um arquivo para leitura.
+
+        :param chave: Chave do arquivo.
+        :return arquivo: Arquivo aberto, que deve ser fechado por quem o abriu.
+        :raises FileNotFoundError: Se o arquivo não existir.
+        """
+
+    @abstractmethod
+    def remove(self, chave: str) -> bool:
+        """
+        Remove um arquivo.
+
+        :param chave: Chave do arquivo.
+        :return removido: Se o arquivo existia e foi removido.
+        """
+
+    def caminhoLocal(self, chave: str) -> Path | None:
+        """
+        Retorna o caminho do arquivo no disco local, caso o repositório seja local.
+
+        :param chave: Chave do arquivo.
+        :return caminho: Caminho do arquivo, ou None se o repositório não for local.
+        """
+        return None
+
+    def urlAssinada(self, chave: str, validade: int) -> str | None:
+        """
+        Retorna uma URL temporária pela qual o cliente pode baixar o arquivo diretamente
+        do repositório, caso ele ofereça esse recurso.
+
+        :param chave: Chave do arquivo.
+        :param validade: Validade da URL, em segundos.
+        :return url: URL assinada, ou None se não for suportada.
+        """
+        return None
+
+    def blocos(self, chave: str) -> Iterator[bytes]:
+        """
+        Lê um arquivo em blocos de `TAMANHO_BLOCO` bytes, para respostas em *streaming*.
+
+        :param chave: Chave do arquivo.
+        :return blocos: Iterador sobre o conteúdo do arquivo.
+        :raises FileNotFoundError: Se o arquivo não existir.
+        """
+        with self.abre(chave) as arquivo:
+            while bloco := arquivo.read(TAMANHO_BLOCO):
+                yield bloco
+
+
+class RepositorioLocal(Repositorio):
+    """Repositório no sistema de arquivos local."""
+
+    local = True
+
+    def __init__(self, raiz: Path) -> None:
+        """
+        :param raiz: Pasta onde os arquivos são armazenados.
+        """
+        self.raiz = raiz
+
+    def caminhoLocal(self, chave: str) -> Path:
+        # caminhos absolutos (gravados antes dos repositórios) são mantidos pelo operador /
+        return self.raiz / chave
+
+    def existe(self, chave: str) -> bool:
+        return self.caminhoLocal(chave).is_file()
+
+    def info(self, chave: str) -> InfoArquivo | None:
+        try:
+            estado = os.stat(self.caminhoLocal(chave))
+        except OSError:
+            return None
+        if not stat.S_ISREG(estado.st_mode):
+            return None
+        return InfoArquivo(tamanho=estado.st_size, modificacao=estado.st_mtime)
+
+    def grava(self, chave: str, arquivo: BinaryIO, tipoConteudo: str | None = None) -> None:
+        destino = self.caminhoLocal(chave)
+        destino.parent.mkdir(parents=True, exist_ok=True)
+
+        # grava em um arquivo temporário na mesma pasta e o renomeia para o destino
+        descritor, temporario = tempfile.mkstemp(
+            dir=destino.parent, prefix=".tmp-", suffix=destino.suffix
+        )
+        try:
+            with os.fdopen(descritor, "wb") as saida:
+                shutil.copyfileobj(arquivo, saida, TAMANHO_BLOCO)
+            os.replace(temporario, destino)
+        except BaseException:
+            Path(temporario).unlink(missing_ok=True)
+            raise
+
+    def abre(self, chave: str) -> BinaryIO:
+        return open(self.caminhoLocal(chave), "rb")
+
+    def remove(self, chave: str) -> bool:
+        try:
+            self.caminhoLocal(chave).unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+
+class RepositorioS3(Repositorio):
+    """Repositório em um *bucket* compatível com S3."""
+
+    def __init__(self) -> None:
+        try:
+            import boto3
+            from botocore.exceptions import ClientError
+        except ImportError as e:
+            raise RuntimeError(
+                "O armazenamento S3 requer o pacote boto3 (poetry install --extras s3)."
+            ) from e
+
+        self._ClientError = ClientError
+        self.bucket = config.S3_BUCKET
+        self.cliente = boto3.client(
+            "s3",
+            endpoint_url=config.S3_ENDPOINT,
+            region_name=config.S3_REGIAO,
+            aws_access_key_id=config.S3_CHAVE_ACESSO,
+            aws_secret_access_key=config.S3_SEGREDO,
+        )
+
+    def _cabecalho(self, chave: str) -> dict | None:
+        try:
+            return self.cliente.head_object(Bucket=self.bucket, Key=chave)
+        except self._ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+    def existe(self, chave: str) -> bool:
+        return self._cabecalho(chave) is not None
+
+    def info(self, chave: str) -> InfoArquivo | None:
+        cabecalho = self._cabecalho(chave)
+        if cabecalho is None:
+            return None
+        return InfoArquivo(
+            tamanho=cabecalho["ContentLength"],
+            modificacao=cabecalho["LastModified"].timestamp(),
+            etag=cabecalho.get("ETag", "").strip('"') or None,
+        )
+
+    def grava(self, chave: str, arquivo: BinaryIO, tipoConteudo: str | None = None) -> None:
+        # upload_fileobj envia arquivos grandes em partes (multipart), sem lê-los inteiros
+        argumentos = {"ContentType": tipoConteudo} if tipoConteudo else None
+        self.cliente.upload_fileobj(arquivo, self.bucket, chave, ExtraArgs=argumentos)
+
+    def abre(self, chave: str) -> BinaryIO:
+        try:
+            return self.cliente.get_object(Bucket=self.bucket, Key=chave)["Body"]
+        except self._ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                raise FileNotFoundError(chave) from e
+            raise
+
+    def remove(self, chave: str) -> bool:
+        if not self.existe(chave):
+            return False
+        self.cliente.delete_object(Bucket=self.bucket, Key=chave)
+        return True
+
+    def urlAssinada(self, chave: str, validade: int) -> str | None:
+        return self.cliente.generate_presigned_url(
+            "get_object", Params={"Bucket": self.bucket, "Key": chave}, ExpiresIn=validade
+        )
+
+
+@functools.cache
+def obtemRepositorio() -> Repositorio:
+    """
+    Retorna o repositório configurado em `config.ARMAZENAMENTO`, criado uma vez por processo.
+
+    :return repositorio: Repositório de arquivos.
+    """
+    if config.ARMAZENAMENTO == "s3":
+        return RepositorioS3()
+    return RepositorioLocal(config.CAMINHO_IMAGEM)
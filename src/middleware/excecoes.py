@@ -1,16 +1,48 @@
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src.modelos.excecao import APIExcecaoBase
 
 
-class ExcecaoAPIMiddleware(BaseHTTPMiddleware):
+class ExcecaoAPIMiddleware:
     """
     Captura exceções cuja classe raiz é APIExcecaoBase e as converte
     em respostas JSON.
     """
-    async def dispatch(self, request: Request, call_next):
+
+    def __init__(self, app: ASGIApp) -> None:
+        """
+        Inicializa o middleware.
+
+        :param app: Aplicação ASGI.
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Repassa a requisição à próxima camada. Caso ela gere uma APIExcecaoBase antes de
+        iniciar a resposta, envia a resposta JSON correspondente à exceção.
+
+        :param scope: Escopo da requisição.
+        :param receive: Função de recebimento de mensagens.
+        :param send: Função de envio de mensagens.
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        respostaIniciada = False
+
+        async def sendMonitorado(message: Message) -> None:
+            nonlocal respostaIniciada
+
+            if message["type"] == "http.response.start":
+                respostaIniciada = True
+            await send(message)
+
         try:
-            return await call_next(request)
+            await self.app(scope, receive, sendMonitorado)
         except APIExcecaoBase as exc:
-            return exc.response()
+            # não é possível trocar uma resposta que já começou a ser enviada
+            if respostaIniciada:
+                raise
+            await exc.response()(scope, receive, send)
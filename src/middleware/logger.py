@@ -1,41 +1,52 @@
 import logging
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from src.rotas.usuario.usuarioControlador import UsuarioControlador
 
-
-class LoggerMiddleware(BaseHTTPMiddleware):
+class LoggerMiddleware:
     """
     Registra todas as requisições que passam por este middleware em um arquivo de texto.
 
     Caso a requisição seja autenticada, o usuário associado a ela é gravado também.
+    O identificador do usuário é lido do estado da requisição, preenchido pela
+    dependência `getUsuarioAutenticado`; o middleware não realiza nenhuma consulta.
     """
-    async def dispatch(self, request: Request, call_next):
-        log_dict = {}
-        response = await call_next(request)
-
-        # tenta pegar o usuário autenticado
-        idUsuario = None
-        if request.headers.get("Authorization"):
-            try:
-                token = request.headers.get("Authorization").replace("Bearer ", "")  # type: ignore
-                usuario = UsuarioControlador.getUsuarioAutenticado(token)  # type: ignore
-                idUsuario = usuario.id
-            except Exception as e:
-                pass
-
-        log_dict.update(
-            {
-                "ip": request.client.host,  # type: ignore
-                "usuario": idUsuario,
-                "path": request.url.path,
-                "method": request.method,
-                "status_code": response.status_code,
-            }
-        )
-
-        logging.info(log_dict, extra=log_dict)
-
-        return response
+
+    def __init__(self, app: ASGIApp) -> None:
+        """
+        Inicializa o middleware.
+
+        :param app: Aplicação ASGI.
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Repassa a requisição à próxima camada e registra seus dados assim que o código
+        de status da resposta é conhecido.
+
+        :param scope: Escopo da requisição.
+        :param receive: Função de recebimento de mensagens.
+        :param send: Função de envio de mensagens.
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def sendRegistrando(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                request = Request(scope)
+                log_dict = {
+                    "ip": request.client.host,  # type: ignore
+                    "usuario": getattr(request.state, "idUsuario", None),
+                    "path": request.url.path,
+                    "method": request.method,
+                    "status_code": message["status"],
+                }
+
+                logging.info(log_dict, extra=log_dict)
+
+            await send(message)
+
+        await self.app(scope, receive, sendRegistrando)
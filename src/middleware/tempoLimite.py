@@ -2,9 +2,10 @@
 Middleware que limita o tempo de recebimento da mensagem do usuário.
 """
 
+import math
+
 import anyio
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src.modelos.excecao import TempoLimiteExcedidoExcecao
 
@@ -12,7 +13,7 @@ REQUEST_TIMEOUT = 30
 "Valor padrão para timeout (30 segundos)."
 
 
-class TempoLimiteMiddleware(BaseHTTPMiddleware):
+class TempoLimiteMiddleware:
     """
     Limita o tempo total de processamento de uma sequência solicitação-resposta
     a `request_timeout` segundos. A intenção é prevenir ataques do tipo slow-loris.
@@ -23,28 +24,43 @@ class TempoLimiteMiddleware(BaseHTTPMiddleware):
     request_timeout: int
     "Tempo limite de processamento da requisição. Após esse tempo, a exceção TempoLimiteExcedidoExcecao é gerada."
 
-    def __init__(self, app, request_timeout: int = REQUEST_TIMEOUT):
+    def __init__(self, app: ASGIApp, request_timeout: int = REQUEST_TIMEOUT) -> None:
         """
         Inicializa o middleware com o tempo limite de processamento da requisição.
         
-        :param app: Aplicação FastAPI.
+        :param app: Aplicação ASGI.
         :param request_timeout: Tempo limite de processamento da requisição.
         """
-        super().__init__(app)
+        self.app = app
         self.request_timeout = request_timeout
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Processa uma requisição, limitando o tempo de processamento a `request_timeout` segundos.
 
-        Passa a requisição para o próximo middleware ou rota. Se o tempo limite for excedido,
-        gera um TempoLimiteExcedidoExcecao.
+        Passa a requisição para o próximo middleware ou rota. O prazo vale até o início
+        do envio da resposta; a transmissão do corpo não é limitada. Se o tempo limite
+        for excedido, gera um TempoLimiteExcedidoExcecao.
 
-        :param request: Requisição HTTP.
+        :param scope: Escopo da requisição.
+        :param receive: Função de recebimento de mensagens.
+        :param send: Função de envio de mensagens.
         :raises TempoLimiteExcedidoExcecao: Se o tempo limite for excedido.
         """
-        try:
-            with anyio.fail_after(self.request_timeout):
-                return await call_next(request)
-        except TimeoutError:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with anyio.CancelScope(
+            deadline=anyio.current_time() + self.request_timeout
+        ) as escopo:
+
+            async def sendSemLimite(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    escopo.deadline = math.inf
+                await send(message)
+
+            await self.app(scope, receive, sendSemLimite)
+
+        if escopo.cancelled_caught:
             raise TempoLimiteExcedidoExcecao()
@@ -273,6 +273,66 @@ class ControleSubmissaoAvaliacao(BaseModel):
         json_encoders = {datetime: lambda v: v.isoformat()}
 
 
+def codificaOpcao(opcao: str) -> str:
+    """
+    Codifica o texto de uma opcao em hexadecimal, para que possa ser usado como chave
+    de um documento do MongoDB (que nao aceita "." e "$" em chaves).
+
+    :param opcao: Texto da opcao.
+    :return chave: Texto codificado.
+    """
+    return opcao.encode("utf-8").hex()
+
+
+def decodificaOpcao(chave: str) -> str:
+    """
+    Decodifica uma chave gerada por `codificaOpcao`.
+
+    :param chave: Texto codificado.
+    :return opcao: Texto da opcao.
+    """
+    return bytes.fromhex(chave).decode("utf-8")
+
+
+class AgregadoPerguntaAvaliacao(BaseModel):
+    """
+    Contadores acumulados das respostas de uma pergunta da avaliacao.
+    """
+
+    tipoPergunta: TipoPerguntaAvaliacao
+    "Tipo da pergunta respondida."
+
+    somaNotas: int = 0
+    "Soma das notas recebidas, para perguntas de escala."
+
+    quantidadeNotas: int = 0
+    "Quantidade de notas recebidas, para perguntas de escala."
+
+    quantidadeTextos: int = 0
+    "Quantidade de respostas textuais nao vazias."
+
+    opcoes: dict[str, int] = Field(default_factory=dict)
+    "Quantidade de vezes que cada opcao foi escolhida, com a opcao codificada por `codificaOpcao`."
+
+
+class AgregadosAvaliacaoEvento(BaseModel):
+    """
+    Contadores acumulados das avaliacoes de um evento, atualizados a cada submissao.
+    """
+
+    id: str = Field(..., alias="_id")
+    "Identificador do evento avaliado."
+
+    totalAvaliacoes: int = 0
+    "Quantidade total de avaliacoes recebidas."
+
+    perguntas: dict[str, AgregadoPerguntaAvaliacao] = Field(default_factory=dict)
+    "Contadores por identificador de pergunta."
+
+    class Config:
+        populate_by_name = True
+
+
 class ResultadoAvaliacaoEvento(BaseModel):
     """
     Estrutura de dados para dashboard com resultados consolidados do evento.
@@ -291,4 +351,28 @@ class ResultadoAvaliacaoEvento(BaseModel):
     "Contagem agregada das opções de múltipla escolha por pergunta."
 
     comentariosLivres: list[str] = Field(default_factory=list)
-    "Lista de comentarios textuais para exibicao no painel de controle."
+    "Primeira pagina dos comentarios textuais para exibicao no painel de controle."
+
+    totalComentarios: int = 0
+    "Quantidade total de comentarios textuais. Os demais sao obtidos em paginas."
+
+
+class ComentariosAvaliacaoEvento(BaseModel):
+    """
+    Pagina de comentarios textuais enviados na avaliacao de um evento.
+    """
+
+    idEvento: str
+    "Identificador do evento avaliado."
+
+    pagina: int
+    "Numero da pagina, a partir de 1."
+
+    tamanhoPagina: int
+    "Quantidade maxima de comentarios por pagina."
+
+    totalComentarios: int
+    "Quantidade total de comentarios textuais do evento."
+
+    comentarios: list[str] = Field(default_factory=list)
+    "Comentarios da pagina."
@@ -2,45 +2,171 @@
 Classes que encapsulam operações de banco de dados.
 """
 
+import asyncio
 import logging
-from datetime import datetime
-
-from pymongo import MongoClient
-from pymongo.errors import DuplicateKeyError
-
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from typing import AsyncIterator, TypeVar
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pydantic import BaseModel
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from src.autenticacao.cacheAutenticacao import (
+    invalidaToken,
+    invalidaTokensUsuario,
+    invalidaUsuario,
+)
 from src.config import config
+from src.img.indiceImagens import TipoImagem, registraImagem, removeImagens
+from src.img.operacoesImagem import TamanhoImagem, urlImagem
 from src.modelos.autenticacao.autenticacao import TokenAutenticacao
+from src.modelos.email.aviso import Aviso
+from src.modelos.email.filaEmail import EmailFila, EstadoEmail
 from src.modelos.evento.evento import Evento, Inscrito, TipoVaga
+from src.modelos.evento.eventoClad import EventoLer
 from src.modelos.evento.intervaloBusca import IntervaloBusca
 from src.modelos.excecao import JaExisteExcecao, NaoEncontradoExcecao
 from src.modelos.registro.registroLogin import RegistroLogin
-from src.modelos.usuario.usuario import TipoConta, Usuario
-from src.modelos.avaliacao.avaliacao import FormularioAvaliacaoEvento, SubmissaoAvaliacaoAnonima, ControleSubmissaoAvaliacao
-
-cliente: MongoClient = MongoClient(str(config.URI_BD))
+from src.modelos.usuario.usuario import TipoConta, Usuario, UsuarioPerfil
+from src.modelos.avaliacao.avaliacao import (
+    AgregadoPerguntaAvaliacao,
+    AgregadosAvaliacaoEvento,
+    ControleSubmissaoAvaliacao,
+    FormularioAvaliacaoEvento,
+    SubmissaoAvaliacaoAnonima,
+    TipoPerguntaAvaliacao,
+    codificaOpcao,
+)
+
+U = TypeVar("U", bound=UsuarioPerfil)
+"Modelo de usuário retornado pelas buscas de `UsuarioBD`."
+
+cliente: AsyncIOMotorClient = AsyncIOMotorClient(
+    str(config.URI_BD),
+    maxPoolSize=config.TAMANHO_MAXIMO_POOL_BD,
+    minPoolSize=config.TAMANHO_MINIMO_POOL_BD,
+    maxIdleTimeMS=config.TEMPO_OCIOSO_POOL_BD_MS,
+    waitQueueTimeoutMS=config.TEMPO_ESPERA_POOL_BD_MS,
+)
+"""
+Cliente assíncrono do MongoDB. As conexões são mantidas em um pool compartilhado
+por todas as requisições do processo.
+"""
 
 if config.MOCK_BD:
     config.NOME_BD = "petBD-test"
-    cliente.drop_database(config.NOME_BD)
 
 colecaoTokens = cliente[config.NOME_BD]["authTokens"]
 
 colecaoUsuarios = cliente[config.NOME_BD]["usuarios"]
-colecaoUsuarios.create_index("email", unique=True)
-colecaoUsuarios.create_index("cpf", unique=True)
 
 colecaoEventos = cliente[config.NOME_BD]["eventos"]
-colecaoEventos.create_index("titulo", unique=True)
+
+colecaoInscricoes = cliente[config.NOME_BD]["inscricoes"]
 
 colecaoRegistro = cliente[config.NOME_BD]["registros"]
 
 colecaoFormulariosAvaliacao = cliente[config.NOME_BD]["formulariosAvaliacao"]
-colecaoFormulariosAvaliacao.create_index("idEvento", unique=True)
 
 colecaoSubmissoesAvaliacao = cliente[config.NOME_BD]["submissoesAvaliacao"]
 
 colecaoControleSubmissao = cliente[config.NOME_BD]["controleSubmissaoAvaliacao"]
-colecaoControleSubmissao.create_index([("idEvento", 1), ("idUsuario", 1)], unique=True)
+
+colecaoAgregadosAvaliacao = cliente[config.NOME_BD]["agregadosAvaliacao"]
+
+colecaoReferenciasImagens = cliente[config.NOME_BD]["referenciasImagens"]
+
+colecaoFilaEmails = cliente[config.NOME_BD]["filaEmails"]
+
+colecaoAvisos = cliente[config.NOME_BD]["avisos"]
+
+colecaoRotinas = cliente[config.NOME_BD]["rotinas"]
+
+
+async def inicializaBD():
+    """
+    Prepara o banco de dados para uso: recria o banco de testes, caso `MOCK_BD`
+    esteja ativo, e garante a existência dos índices utilizados pela aplicação.
+
+    Deve ser chamada uma vez, na inicialização da aplicação.
+    """
+    if config.MOCK_BD:
+        await cliente.drop_database(config.NOME_BD)
+
+    await colecaoUsuarios.create_index("email", unique=True)
+    await colecaoUsuarios.create_index("cpf", unique=True)
+
+    await colecaoEventos.create_index("titulo", unique=True)
+    await colecaoEventos.create_index("inicioEvento")
+    await colecaoEventos.create_index("fimEvento")
+
+    await colecaoInscricoes.create_index(
+        [("idEvento", 1), ("idUsuario", 1)], unique=True
+    )
+
+    await colecaoFormulariosAvaliacao.create_index("idEvento", unique=True)
+    await colecaoFormulariosAvaliacao.create_index("liberarApos")
+
+    await colecaoSubmissoesAvaliacao.create_index([("idEvento", 1), ("_id", 1)])
+
+    await colecaoControleSubmissao.create_index(
+        [("idEvento", 1), ("idUsuario", 1)], unique=True
+    )
+
+    await colecaoFilaEmails.create_index([("estado", 1), ("proximaTentativa", 1)])
+    await colecaoFilaEmails.create_index(
+        [("estado", 1), ("prioridade", 1), ("proximaTentativa", 1)]
+    )
+    await colecaoFilaEmails.create_index([("estado", 1), ("concessaoAte", 1)])
+    await colecaoFilaEmails.create_index([("aviso", 1), ("estado", 1)], sparse=True)
+    await colecaoAvisos.create_index(
+        "criacao", partialFilterExpression={"concluido": False}
+    )
+
+    await colecaoFilaEmails.create_index(
+        "envio", expireAfterSeconds=config.RETENCAO_EMAILS_ENVIADOS * 24 * 60 * 60
+    )
+
+
+async def carregaIndiceImagens():
+    """
+    Carrega no índice de imagens os caminhos das fotos dos usuários e das imagens dos
+    eventos, para que as rotas de imagem não precisem consultar o banco de dados.
+
+    Deve ser chamada uma vez, na inicialização da aplicação.
+    """
+    async for usuario in colecaoUsuarios.find({"foto": {"$nin": [None, ""]}}, {"foto": 1}):
+        registraImagem(TipoImagem.FOTO_USUARIO, usuario["_id"], usuario["foto"])
+
+    async for evento in colecaoEventos.find({}, {"arte": 1, "cracha": 1}):
+        registraImagem(TipoImagem.ARTE_EVENTO, evento["_id"], evento.get("arte"))
+        registraImagem(TipoImagem.CRACHA_EVENTO, evento["_id"], evento.get("cracha"))
+
+
+def _textoAparado(campo: str) -> dict:
+    """
+    Expressão de agregação com o texto do campo sem os espaços das extremidades, ou ""
+    caso o campo seja nulo ou não exista.
+
+    :param campo: Caminho do campo (ex: "$respostaTexto").
+    :return expressao: Expressão de agregação.
+    """
+    return {"$trim": {"input": {"$ifNull": [campo, ""]}}}
+
+
+def _projecao(modelo: type[BaseModel]) -> dict[str, int]:
+    """
+    Monta uma projeção do MongoDB contendo apenas os campos de `modelo`.
+
+    :param modelo: Modelo cujos campos devem ser lidos do banco de dados.
+    :return projecao: Projeção a ser passada para `find` e `find_one`.
+    """
+    return {
+        campo.alias or nome: 1 for nome, campo in modelo.model_fields.items()
+    }
 
 
 class UsuarioBD:
@@ -50,7 +176,7 @@ class UsuarioBD:
 
     # operações banco de dados
     @staticmethod
-    def criar(modelo: Usuario):
+    async def criar(modelo: Usuario):
         """
         Cria um usuário no banco de dados.
 
@@ -59,68 +185,173 @@ class UsuarioBD:
         """
         # cria usuario no bd
         try:
-            colecaoUsuarios.insert_one(modelo.model_dump(by_alias=True))
+            await colecaoUsuarios.insert_one(modelo.model_dump(by_alias=True))
         except DuplicateKeyError:
             logging.error("Usuário já existe no banco de dados")
             raise JaExisteExcecao(message="Usuário já existe no banco de dados")
 
     @staticmethod
-    def buscar(campo: str, valor: str) -> Usuario:
+    async def buscar(campo: str, valor: str, modelo: type[U] = Usuario) -> U:
         """
         Busca um usuário no banco de dados de acordo com o índice e a valor fornecidos.
 
         :param campo: Campo de busca.
         :param valor: Valor de busca.
+        :param modelo: Modelo a ser retornado. Caso não seja `Usuario`, apenas os campos
+            do modelo são lidos do banco de dados (ex: `UsuarioPerfil` não lê a senha nem
+            os eventos inscritos).
         :return: Primeiro usuário encontrado com um campo com valor igual ao fornecido.
+        :raises NaoEncontradoExcecao: Caso nenhum usuário seja encontrado.
         """
-        # Verifica se o usuário está cadastrado no bd
-        if not colecaoUsuarios.find_one({campo: valor}):
+        documento = await colecaoUsuarios.find_one(
+            {campo: valor}, None if modelo is Usuario else _projecao(modelo)
+        )
+        if not documento:
             raise NaoEncontradoExcecao(message="O Usuário não foi encontrado.")
-        else:
-            return Usuario(**colecaoUsuarios.find_one({campo: valor}))  # type: ignore
+
+        return modelo(**documento)
+
+    @staticmethod
+    async def buscarPorId(id: str, modelo: type[U] = Usuario) -> U:
+        """
+        Busca um usuário pelo seu identificador.
+
+        :param id: Identificador do usuário.
+        :param modelo: Modelo a ser retornado (vide `UsuarioBD.buscar`).
+        :return: Usuário encontrado.
+        :raises NaoEncontradoExcecao: Caso o usuário não seja encontrado.
+        """
+        return await UsuarioBD.buscar("_id", id, modelo)
+
+    @staticmethod
+    async def buscarPorEmail(email: str, modelo: type[U] = Usuario) -> U:
+        """
+        Busca um usuário pelo seu email, utilizando o índice único de emails.
+
+        :param email: Email do usuário.
+        :param modelo: Modelo a ser retornado (vide `UsuarioBD.buscar`).
+        :return: Usuário encontrado.
+        :raises NaoEncontradoExcecao: Caso o usuário não seja encontrado.
+        """
+        return await UsuarioBD.buscar("email", email, modelo)
+
+    @staticmethod
+    async def buscarVarios(
+        ids: list[str], projecao: list[str] | None = None
+    ) -> dict[str, dict]:
+        """
+        Busca vários usuários no banco de dados com uma única consulta.
+
+        :param ids: Identificadores dos usuários.
+        :param projecao: Campos a serem lidos de cada usuário. Caso None, lê todos os campos.
+        :return usuarios: Dicionário id do usuário -> documento do usuário. Usuários não
+            encontrados não aparecem no dicionário.
+        """
+        documentos = colecaoUsuarios.find(
+            {"_id": {"$in": ids}},
+            {campo: 1 for campo in projecao} if projecao is not None else None,
+        )
+        return {u["_id"]: u async for u in documentos}
 
     @staticmethod
-    def atualizar(modelo: Usuario):
+    async def atualizar(modelo: Usuario):
         """
         Atualiza um usuário no banco de dados.
 
+        A foto não é alterada, pois a chave lida junto com o usuário pode já ter sido
+        trocada e liberada; ela só é alterada por `trocarFoto`.
+
         :param modelo: Usuário a ser atualizado.
         """
-        colecaoUsuarios.update_one(
-            {"_id": modelo.id}, {"$set": modelo.model_dump(by_alias=True)}
+        await colecaoUsuarios.update_one(
+            {"_id": modelo.id},
+            {"$set": modelo.model_dump(by_alias=True, exclude={"foto"})},
         )
+        invalidaUsuario(modelo.id)
 
     @staticmethod
-    def deletar(id: str):
+    async def atualizarSenha(id: str, senha: str):
+        """
+        Atualiza apenas a senha de um usuário.
+
+        :param id: Identificador do usuário.
+        :param senha: Hash da nova senha.
+        """
+        await colecaoUsuarios.update_one({"_id": id}, {"$set": {"senha": senha}})
+        invalidaUsuario(id)
+
+    @staticmethod
+    async def buscarFoto(id: str) -> str | None:
+        """
+        Busca apenas a chave da foto de um usuário.
+
+        :param id: Identificador do usuário.
+        :return foto: Chave da foto, ou None se o usuário não tiver foto.
+        :raises NaoEncontradoExcecao: Caso o usuário não seja encontrado.
+        """
+        usuario = await colecaoUsuarios.find_one({"_id": id}, {"foto": 1})
+        if not usuario:
+            raise NaoEncontradoExcecao(message="O usuário não foi encontrado.")
+        return usuario.get("foto")
+
+    @staticmethod
+    async def trocarFoto(id: str, fotoAtual: str | None, fotoNova: str) -> bool:
+        """
+        Troca a foto de um usuário, caso ela ainda seja `fotoAtual`.
+
+        :param id: Identificador do usuário.
+        :param fotoAtual: Chave da foto esperada, ou None se o usuário não tiver foto.
+        :param fotoNova: Chave da nova foto.
+        :return trocada: Se a foto foi trocada.
+        """
+        resultado = await colecaoUsuarios.update_one(
+            {"_id": id, "foto": fotoAtual}, {"$set": {"foto": fotoNova}}
+        )
+        if resultado.matched_count == 0:
+            return False
+
+        invalidaUsuario(id)
+        registraImagem(TipoImagem.FOTO_USUARIO, id, fotoNova)
+        return True
+
+    @staticmethod
+    async def deletar(id: str) -> str | None:
         """
         Deleta um usuário do banco de dados.
 
         :param id: Identificador do usuário a ser deletado.
+        :return foto: Chave da foto do usuário removido, ou None se não houver.
         """
-        colecaoUsuarios.delete_one({"_id": id})
+        usuario = await colecaoUsuarios.find_one_and_delete(
+            {"_id": id}, projection={"foto": 1}
+        )
+        invalidaUsuario(id)
+        removeImagens(id)
+        return usuario.get("foto") if usuario else None
 
     @staticmethod
-    def listar() -> list[Usuario]:
+    async def listar() -> list[Usuario]:
         """
         Retorna uma lista com todos os usuários cadastrados no banco de dados.
 
         :return usuarios: Lista com todos os usuários cadastrados no banco de dados.
         """
-        return [Usuario(**u) for u in colecaoUsuarios.find()]
+        return [Usuario(**u) async for u in colecaoUsuarios.find()]
 
     @staticmethod
-    def listarPetianos() -> list[Usuario]:
+    async def listarPetianos() -> list[Usuario]:
         """
         Retorna uma lista com todos os petianos cadastrados no banco de dados.
 
         :return petianos: Lista com todos os petianos cadastrados no banco de dados.
         """
         return [
-            Usuario(**u) for u in colecaoUsuarios.find({"tipoConta": TipoConta.PETIANO})
+            Usuario(**u)
+            async for u in colecaoUsuarios.find({"tipoConta": TipoConta.PETIANO})
         ]
 
     @staticmethod
-    def listarPetianosAndEgressos() -> list[Usuario]:
+    async def listarPetianosAndEgressos() -> list[Usuario]:
         """
         Retorna uma lista com todos os petianos e egressos cadastrados no banco de dados.
 
@@ -131,23 +362,23 @@ class UsuarioBD:
         }
         
         return [
-            Usuario(**u) for u in colecaoUsuarios.find(query)
+            Usuario(**u) async for u in colecaoUsuarios.find(query)
         ]
 
 
 class EventoBD:
     @staticmethod
-    def criar(modelo: Evento):
+    async def criar(modelo: Evento):
         try:
-            colecaoEventos.insert_one(modelo.model_dump(by_alias=True))
+            await colecaoEventos.insert_one(modelo.model_dump(by_alias=True))
         except DuplicateKeyError as e:
             logging.error("Evento já existe no banco de dados" + str(e))
             raise JaExisteExcecao(message="Evento já existe no banco de dados")
 
     @staticmethod
-    def buscar(indice: str, chave: str) -> Evento:
+    async def buscar(indice: str, chave: str) -> Evento:
         # Verifica se o evento está cadastrado no bd
-        evento = colecaoEventos.find_one({indice: chave})
+        evento = await colecaoEventos.find_one({indice: chave})
         if not evento:
             raise NaoEncontradoExcecao(message="O evento não foi encontrado.")
         else:
@@ -155,10 +386,21 @@ class EventoBD:
             return Evento(**evento)  # type: ignore 
 
     @staticmethod
-    def atualizar(modelo: Evento):
+    async def atualizar(modelo: Evento):
+        """
+        Atualiza um evento no banco de dados.
+
+        A arte e o crachá não são alterados, pois as chaves lidas junto com o evento
+        podem já ter sido trocadas e liberadas; eles só são alterados por
+        `trocarImagem`.
+
+        :param modelo: Evento a ser atualizado.
+        :raises JaExisteExcecao: Caso já exista um evento com o mesmo título.
+        """
         try:
-            colecaoEventos.update_one(
-                {"_id": modelo.id}, {"$set": modelo.model_dump(by_alias=True)}
+            await colecaoEventos.update_one(
+                {"_id": modelo.id},
+                {"$set": modelo.model_dump(by_alias=True, exclude={"arte", "cracha"})},
             )
         except DuplicateKeyError:
             logging.error("Evento já existe no banco de dados")
@@ -167,88 +409,210 @@ class EventoBD:
             )
 
     @staticmethod
-    def deletar(id: str):
-        colecaoEventos.delete_one({"_id": id})
+    async def trocarImagem(
+        id: str, tipo: TipoImagem, imagemAtual: str | None, imagemNova: str
+    ) -> bool:
+        """
+        Troca a arte ou o crachá de um evento, caso ainda seja `imagemAtual`.
+
+        :param id: Identificador do evento.
+        :param tipo: Imagem trocada (`TipoImagem.ARTE_EVENTO` ou `CRACHA_EVENTO`).
+        :param imagemAtual: Chave da imagem esperada, ou None se o evento não a tiver.
+        :param imagemNova: Chave da nova imagem.
+        :return trocada: Se a imagem foi trocada.
+        """
+        resultado = await colecaoEventos.update_one(
+            {"_id": id, tipo.value: imagemAtual}, {"$set": {tipo.value: imagemNova}}
+        )
+        if resultado.matched_count == 0:
+            return False
+
+        registraImagem(tipo, id, imagemNova)
+        return True
+
+    @staticmethod
+    async def deletar(id: str) -> list[str]:
+        """
+        Deleta um evento e as suas inscrições.
+
+        :param id: Identificador do evento.
+        :return imagens: Caminhos das imagens referenciadas pelo evento e pelas inscrições
+            removidas (arte, crachá e comprovantes), uma vez por referência.
+        """
+        evento = await colecaoEventos.find_one_and_delete(
+            {"_id": id}, projection={"arte": 1, "cracha": 1}
+        )
+        comprovantes = colecaoInscricoes.find(
+            {"idEvento": id, "comprovante": {"$nin": [None, ""]}}, {"comprovante": 1}
+        )
+        imagens = [i["comprovante"] async for i in comprovantes]
+        await colecaoInscricoes.delete_many({"idEvento": id})
+        removeImagens(id)
+
+        if evento:
+            imagens += [evento[c] for c in ["arte", "cracha"] if evento.get(c)]
+        return imagens
 
     @staticmethod
-    def listar(query: IntervaloBusca) -> list[Evento]:
-        resultado: list[Evento]
+    async def buscarImagens(id: str) -> dict[TipoImagem, str | None]:
+        """
+        Busca apenas os caminhos das imagens (arte e crachá) de um evento e os registra
+        no índice de imagens.
+
+        :param id: Identificador do evento.
+        :return imagens: Caminho de cada imagem do evento, ou None se não houver.
+        :raises NaoEncontradoExcecao: Caso o evento não seja encontrado.
+        """
+        evento = await colecaoEventos.find_one({"_id": id}, {"arte": 1, "cracha": 1})
+        if not evento:
+            raise NaoEncontradoExcecao(message="O evento não foi encontrado.")
 
+        imagens = {
+            TipoImagem.ARTE_EVENTO: evento.get("arte"),
+            TipoImagem.CRACHA_EVENTO: evento.get("cracha"),
+        }
+        for tipo, caminho in imagens.items():
+            registraImagem(tipo, id, caminho)
+        return imagens
+
+    @staticmethod
+    def _filtroIntervalo(query: IntervaloBusca | None) -> tuple[dict, int]:
+        """
+        Retorna o filtro e a direção de ordenação por `inicioEvento` correspondentes
+        ao intervalo de busca.
+
+        :param query: Intervalo de busca.
+        :return filtro, ordem: Filtro do MongoDB e direção de ordenação (1 ou -1).
+        """
         if query == IntervaloBusca.PASSADO:
-            dbQuery = {"fimEvento": {"$lt": datetime.now()}}
-            resultadoBusca = colecaoEventos.find(dbQuery).sort("inicioEvento", -1)
+            return {"fimEvento": {"$lt": datetime.now()}}, -1
         elif query == IntervaloBusca.PRESENTE:
-            dbQuery = {
+            return {
                 "inicioEvento": {"$lt": datetime.now()},
                 "fimEvento": {"$gt": datetime.now()},
-            }
-            resultadoBusca = colecaoEventos.find(dbQuery).sort("inicioEvento", -1)
+            }, -1
         elif query == IntervaloBusca.FUTURO:
-            dbQuery = {"inicioEvento": {"$gt": datetime.now()}}
-            resultadoBusca = colecaoEventos.find(dbQuery).sort("inicioEvento", 1)
+            return {"inicioEvento": {"$gt": datetime.now()}}, 1
         else:
-            resultadoBusca = colecaoEventos.find().sort("inicioEvento", 1)
+            return {}, 1
 
+    @staticmethod
+    def _eventoLer(documento: dict, tamanhoArte: TamanhoImagem = TamanhoImagem.ORIGINAL) -> EventoLer:
+        """
+        Constrói um EventoLer a partir de um documento lido com a projeção de EventoLer,
+        trocando o caminho da arte pela URL pública da imagem.
+
+        :param documento: Documento do evento.
+        :param tamanhoArte: Tamanho da arte referenciado pela URL.
+        :return evento: Dados públicos do evento.
+        """
+        if documento.get("arte"):
+            documento["arte"] = urlImagem(
+                f"eventos/{documento['_id']}/arte", documento["arte"], tamanhoArte
+            )
+        return EventoLer(**documento)
+
+    @staticmethod
+    async def listar(query: IntervaloBusca) -> list[Evento]:
+        dbQuery, ordem = EventoBD._filtroIntervalo(query)
+        resultadoBusca = colecaoEventos.find(dbQuery).sort("inicioEvento", ordem)
 
-        resultado = [Evento(**e) for e in resultadoBusca]
+        resultado = [Evento(**e) async for e in resultadoBusca]
         return resultado
 
     @staticmethod
-    def criarInscrito(id_evento: str, inscrito: Inscrito):
-        try:
-            # Busca o evento pelo id
-            evento = colecaoEventos.find_one({"_id": id_evento})
-            
-            if not evento:
-                raise Exception("Evento não encontrado")
-
-            # Verifica se o usuário já está inscrito
-            for i in evento.get("inscritos", []):
-                if i["idUsuario"] == inscrito.idUsuario:
-                    logging.error("Inscrito já existe no evento")
-                    raise JaExisteExcecao(message="Inscrito já existe no evento")
-
-            # Adiciona o novo inscrito à lista de inscritos do evento
-            novo_inscrito = inscrito.model_dump()
-
-            # Atualiza o documento no MongoDB
-            update_result = colecaoEventos.update_one(
-                {"_id": id_evento},
-                {
-                    "$push": {"inscritos": novo_inscrito},
-                    "$inc": {
-                        "vagasDisponiveisComNote": -1
-                        if inscrito.tipoVaga == TipoVaga.COM_NOTE
-                        else 0,
-                        "vagasDisponiveisSemNote": -1
-                        if inscrito.tipoVaga == TipoVaga.SEM_NOTE
-                        else 0,
-                    },
-                }
-            )
+    async def listarPublico(query: IntervaloBusca | None) -> list[EventoLer]:
+        """
+        Lista os dados públicos dos eventos, lendo do banco de dados apenas os campos
+        de EventoLer. As URLs das artes apontam para a versão de tamanho médio.
 
-            if update_result.modified_count == 0:
-                raise Exception("Falha ao atualizar o evento com o novo inscrito.")
+        :param query: Intervalo de busca.
+        :return eventos: Dados públicos dos eventos encontrados.
+        """
+        dbQuery, ordem = EventoBD._filtroIntervalo(query)
+        resultadoBusca = colecaoEventos.find(dbQuery, _projecao(EventoLer)).sort(
+            "inicioEvento", ordem
+        )
 
+        return [
+            EventoBD._eventoLer(e, TamanhoImagem.MEDIO) async for e in resultadoBusca
+        ]
+
+    @staticmethod
+    async def buscarPublico(id: str) -> EventoLer:
+        """
+        Busca os dados públicos de um evento, lendo do banco de dados apenas os campos
+        de EventoLer.
+
+        :param id: Identificador do evento.
+        :return evento: Dados públicos do evento.
+        :raises NaoEncontradoExcecao: Caso o evento não seja encontrado.
+        """
+        evento = await colecaoEventos.find_one({"_id": id}, _projecao(EventoLer))
+        if not evento:
+            raise NaoEncontradoExcecao(message="O evento não foi encontrado.")
+        return EventoBD._eventoLer(evento)
+
+    @staticmethod
+    async def criarInscrito(idEvento: str, inscrito: Inscrito):
+        """
+        Inscreve um usuário em um evento e decrementa as vagas disponíveis do tipo escolhido.
+
+        As inscrições ficam na coleção `inscricoes`, com um documento por par
+        (evento, usuário), e não mais embutidas no documento do evento.
+
+        :param idEvento: Identificador do evento.
+        :param inscrito: Dados da inscrição.
+        :raises JaExisteExcecao: Caso o usuário já esteja inscrito no evento.
+        :raises NaoEncontradoExcecao: Caso o evento não exista.
+        """
+        try:
+            await colecaoInscricoes.insert_one(
+                {"idEvento": idEvento, **inscrito.model_dump()}
+            )
         except DuplicateKeyError:
             logging.error("Inscrito já existe no evento")
             raise JaExisteExcecao(message="Inscrito já existe no evento")
-        except Exception as e:
-            logging.error(f"Erro inesperado: {str(e)}")
-            raise
 
-    @staticmethod
-    def buscarInscrito(idEvento: str, idUsuario: str) -> Inscrito:
-        evento = colecaoEventos.find_one({"_id": idEvento})
-        if not evento:
+        resultado = await colecaoEventos.update_one(
+            {"_id": idEvento},
+            {
+                "$inc": {
+                    "vagasDisponiveisComNote": -1
+                    if inscrito.tipoVaga == TipoVaga.COM_NOTE
+                    else 0,
+                    "vagasDisponiveisSemNote": -1
+                    if inscrito.tipoVaga == TipoVaga.SEM_NOTE
+                    else 0,
+                },
+            },
+        )
+
+        if resultado.matched_count == 0:
+            await colecaoInscricoes.delete_one(
+                {"idEvento": idEvento, "idUsuario": inscrito.idUsuario}
+            )
             raise NaoEncontradoExcecao(message="Evento não encontrado")
-        for inscrito_data in evento.get("inscritos", []):
-            if inscrito_data["idUsuario"] == idUsuario:
-                return Inscrito(**inscrito_data)
-        raise NaoEncontradoExcecao(message="O inscrito não foi encontrado.")
 
     @staticmethod
-    def verificarInscricaoExistente(idEvento: str, idUsuario: str) -> bool:
+    async def buscarInscrito(idEvento: str, idUsuario: str) -> Inscrito:
+        """
+        Busca a inscrição de um usuário em um evento.
+
+        :param idEvento: Identificador do evento.
+        :param idUsuario: Identificador do usuário.
+        :return: Inscrição do usuário no evento.
+        :raises NaoEncontradoExcecao: Caso o usuário não esteja inscrito no evento.
+        """
+        documento = await colecaoInscricoes.find_one(
+            {"idEvento": idEvento, "idUsuario": idUsuario}, {"_id": 0, "idEvento": 0}
+        )
+        if not documento:
+            raise NaoEncontradoExcecao(message="O inscrito não foi encontrado.")
+        return Inscrito(**documento)
+
+    @staticmethod
+    async def verificarInscricaoExistente(idEvento: str, idUsuario: str) -> bool:
         """
         Verifica se um usuario esta inscrito em um evento.
 
@@ -256,55 +620,228 @@ class EventoBD:
         :param idUsuario: Identificador do usuario.
         :return: True se estiver inscrito, False caso contrario.
         """
-        documento = colecaoEventos.find_one(
-            {"_id": idEvento, "inscritos.idUsuario": idUsuario},
+        documento = await colecaoInscricoes.find_one(
+            {"idEvento": idEvento, "idUsuario": idUsuario},
             {"_id": 1},
         )
         return documento is not None
 
     @staticmethod
-    def deletarInscrito(idEvento: str, idUsuario: str):
-        evento = colecaoEventos.find_one(
-            {"_id": idEvento, "inscritos.idUsuario": idUsuario},
-            {"inscritos": {"$elemMatch": {"idUsuario": idUsuario}}},
+    async def atualizarInscrito(idEvento: str, inscrito: Inscrito):
+        """
+        Atualiza os dados da inscrição de um usuário em um evento.
+
+        Não altera as vagas disponíveis do evento.
+
+        :param idEvento: Identificador do evento.
+        :param inscrito: Dados atualizados da inscrição.
+        :raises NaoEncontradoExcecao: Caso o usuário não esteja inscrito no evento.
+        """
+        resultado = await colecaoInscricoes.update_one(
+            {"idEvento": idEvento, "idUsuario": inscrito.idUsuario},
+            {"$set": inscrito.model_dump()},
         )
-        if not evento or not evento.get("inscritos"):
-            raise NaoEncontradoExcecao(message="O inscrito não foi encontrado para remoção.")
+        if resultado.matched_count == 0:
+            raise NaoEncontradoExcecao(message="O inscrito não foi encontrado.")
 
-        inscrito = evento["inscritos"][0]
+    @staticmethod
+    async def atualizarVerificacaoInscrito(
+        idEvento: str, idUsuario: str, estadoDeVerificacao: bool
+    ):
+        """
+        Registra o resultado da verificação do comprovante de uma inscrição.
+
+        :param idEvento: Identificador do evento.
+        :param idUsuario: Identificador do usuário.
+        :param estadoDeVerificacao: Resultado da verificação.
+        :raises NaoEncontradoExcecao: Caso o usuário não esteja inscrito no evento.
+        """
+        resultado = await colecaoInscricoes.update_one(
+            {"idEvento": idEvento, "idUsuario": idUsuario},
+            {"$set": {"estadoDeVerificacao": estadoDeVerificacao}},
+        )
+        if resultado.matched_count == 0:
+            raise NaoEncontradoExcecao(message="O inscrito não foi encontrado.")
+
+    @staticmethod
+    async def deletarInscrito(idEvento: str, idUsuario: str) -> dict:
+        """
+        Remove a inscrição de um usuário em um evento e devolve a vaga ocupada por ela.
+
+        :param idEvento: Identificador do evento.
+        :param idUsuario: Identificador do usuário.
+        :return inscrito: Tipo de vaga e caminho do comprovante da inscrição removida.
+        :raises NaoEncontradoExcecao: Caso o usuário não esteja inscrito no evento.
+        """
+        inscrito = await colecaoInscricoes.find_one_and_delete(
+            {"idEvento": idEvento, "idUsuario": idUsuario},
+            projection={"tipoVaga": 1, "comprovante": 1},
+        )
+        if not inscrito:
+            raise NaoEncontradoExcecao(message="O inscrito não foi encontrado para remoção.")
 
         if inscrito["tipoVaga"] == TipoVaga.COM_NOTE:
             incComNote, incSemNote = 1, 0
         else:
             incComNote, incSemNote = 0, 1
 
-        resultado = colecaoEventos.update_one(
+        await colecaoEventos.update_one(
             {"_id": idEvento},
             {
-                "$pull": {"inscritos": {"idUsuario": idUsuario}},
                 "$inc": {
                     "vagasDisponiveisComNote": incComNote,
                     "vagasDisponiveisSemNote": incSemNote,
                 },
             },
         )
-        if resultado.modified_count == 0:
-            raise NaoEncontradoExcecao(message="O inscrito não foi encontrado para remoção.")
+        return inscrito
 
     @staticmethod
-    def listarInscritosEvento(idEvento: str) -> list[Inscrito]:
-        evento = colecaoEventos.find_one({"_id": idEvento})
-        if not evento:
+    async def listarInscritosEvento(idEvento: str) -> list[Inscrito]:
+        """
+        Lista as inscrições de um evento.
+
+        :param idEvento: Identificador do evento.
+        :return: Inscrições do evento.
+        :raises NaoEncontradoExcecao: Caso o evento não exista.
+        """
+        if not await colecaoEventos.find_one({"_id": idEvento}, {"_id": 1}):
             raise NaoEncontradoExcecao(message="Evento não encontrado")
-        inscritos_data = evento.get("inscritos", [])
-        return [Inscrito(**inscrito) for inscrito in inscritos_data]
+
+        documentos = colecaoInscricoes.find(
+            {"idEvento": idEvento}, {"_id": 0, "idEvento": 0}
+        )
+        return [Inscrito(**inscrito) async for inscrito in documentos]
+
+    @staticmethod
+    async def buscarDadosEmail(id: str) -> dict:
+        """
+        Busca apenas os dados de um evento exibidos nos e-mails.
+
+        :param id: Identificador do evento.
+        :return evento: Título, local e dias do evento.
+        :raises NaoEncontradoExcecao: Caso o evento não seja encontrado.
+        """
+        evento = await colecaoEventos.find_one({"_id": id}, {"titulo": 1, "local": 1, "dias": 1})
+        if not evento:
+            raise NaoEncontradoExcecao(message="O evento não foi encontrado.")
+        return evento
+
+    @staticmethod
+    async def buscarIniciandoEntre(inicio: datetime, fim: datetime) -> list[dict]:
+        """
+        Busca os eventos que começam no intervalo (`inicio`, `fim`], em ordem de início.
+
+        :param inicio: Início do intervalo (exclusivo).
+        :param fim: Fim do intervalo (inclusivo).
+        :return eventos: Identificador, título, local, dias e início de cada evento.
+        """
+        documentos = colecaoEventos.find(
+            {"inicioEvento": {"$gt": inicio, "$lte": fim}},
+            {"titulo": 1, "local": 1, "dias": 1, "inicioEvento": 1},
+        ).sort("inicioEvento", 1)
+        return [evento async for evento in documentos]
+
+    @staticmethod
+    async def resumirInscricoesOrganizadas(desde: datetime, ate: datetime) -> list[dict]:
+        """
+        Resume as inscrições dos eventos ainda não encerrados que possuem organizadores.
+
+        :param desde: Início (exclusivo) do período em que uma inscrição é considerada nova.
+        :param ate: Fim (inclusivo) desse período.
+        :return resumos: Para cada evento, o `_id`, o `titulo`, os `organizadores`, a
+            quantidade de inscrições `novas` e a de comprovantes `pendentes` de verificação.
+        """
+        eventos = {
+            evento["_id"]: evento
+            async for evento in colecaoEventos.find(
+                {"fimEvento": {"$gte": ate}, "organizadores.0": {"$exists": True}},
+                {"titulo": 1, "organizadores": 1},
+            )
+        }
+        if not eventos:
+            return []
+
+        inscricaoNova = {
+            "$and": [{"$gt": ["$dataInscricao", desde]}, {"$lte": ["$dataInscricao", ate]}]
+        }
+        comprovantePendente = {
+            "$and": [
+                {"$gt": ["$comprovante", None]},
+                {"$eq": [{"$ifNull": ["$estadoDeVerificacao", None]}, None]},
+            ]
+        }
+        async for grupo in colecaoInscricoes.aggregate(
+            [
+                {"$match": {"idEvento": {"$in": list(eventos)}}},
+                {
+                    "$group": {
+                        "_id": "$idEvento",
+                        "novas": {"$sum": {"$cond": [inscricaoNova, 1, 0]}},
+                        "pendentes": {"$sum": {"$cond": [comprovantePendente, 1, 0]}},
+                    }
+                },
+            ]
+        ):
+            eventos[grupo["_id"]].update(novas=grupo["novas"], pendentes=grupo["pendentes"])
+
+        return [
+            evento
+            for evento in eventos.values()
+            if evento.get("novas") or evento.get("pendentes")
+        ]
+
+    @staticmethod
+    async def iterarDestinatarios(
+        idEvento: str, tamanhoLote: int
+    ) -> AsyncIterator[list[dict[str, str]]]:
+        """
+        Percorre o nome e o e-mail dos inscritos de um evento em lotes, sem carregar
+        todos os inscritos na memória.
+
+        :param idEvento: Identificador do evento.
+        :param tamanhoLote: Quantidade de inscritos por lote.
+        :return lotes: Iterador de lotes de dicionários com `idUsuario`, `nome` e `email`.
+        """
+        cursor = colecaoInscricoes.aggregate(
+            [
+                {"$match": {"idEvento": idEvento}},
+                {
+                    "$lookup": {
+                        "from": colecaoUsuarios.name,
+                        "localField": "idUsuario",
+                        "foreignField": "_id",
+                        "as": "usuario",
+                    }
+                },
+                {"$unwind": "$usuario"},
+                {
+                    "$project": {
+                        "_id": 0,
+                        "idUsuario": 1,
+                        "nome": "$usuario.nome",
+                        "email": "$usuario.email",
+                    }
+                },
+            ],
+            batchSize=tamanhoLote,
+        )
+
+        lote = []
+        async for destinatario in cursor:
+            lote.append(destinatario)
+            if len(lote) == tamanhoLote:
+                yield lote
+                lote = []
+        if lote:
+            yield lote
 
 class TokenAutenticacaoBD:
     """
     Encapsula operações do banco de dados de tokens de autenticação.
     """
     @staticmethod
-    def buscar(id: str) -> TokenAutenticacao:
+    async def buscar(id: str) -> TokenAutenticacao:
         """
         Busca um token de autenticação pelo id `id` no banco de dados e o retorna, caso exista.
         
@@ -312,26 +849,27 @@ class TokenAutenticacaoBD:
         :return: Token de autenticação.
         :raises NaoEncontradoExcecao: Caso o token não seja encontrado.
         """
-        documento = colecaoTokens.find_one({"_id": id})
+        documento = await colecaoTokens.find_one({"_id": id})
         if not documento:
             raise NaoEncontradoExcecao()
 
         return TokenAutenticacao(**documento)
 
     @staticmethod
-    def deletar(id: str):
+    async def deletar(id: str):
         """
         Deleta o token de autenticação de id `id` do banco de dados.
 
         :param id: Identificador do token.
         :raises NaoEncontradoExcecao: Caso o token não seja encontrado.
         """
-        resultado = colecaoTokens.delete_one({"_id": id})
+        resultado = await colecaoTokens.delete_one({"_id": id})
+        invalidaToken(id)
         if resultado.deleted_count != 1:
             raise NaoEncontradoExcecao()
 
     @staticmethod
-    def criar(id: str, idUsuario: str, validade: datetime) -> TokenAutenticacao:
+    async def criar(id: str, idUsuario: str, validade: datetime) -> TokenAutenticacao:
         """
         Cria um token de autenticação com id `id` no banco de dados.
         O token é associado ao usuário de id `idUsuario` e é válido até `validade`.
@@ -343,49 +881,541 @@ class TokenAutenticacaoBD:
         """
         documento = {"_id": id, "idUsuario": idUsuario, "validade": validade}
 
-        resultado = colecaoTokens.insert_one(documento)
+        resultado = await colecaoTokens.insert_one(documento)
         assert resultado.acknowledged
 
-        return TokenAutenticacaoBD.buscar(str(resultado.inserted_id))
+        return await TokenAutenticacaoBD.buscar(str(resultado.inserted_id))
 
     @staticmethod
-    def deletarTokensUsuario(idUsuario: str):
+    async def deletarTokensUsuario(idUsuario: str):
         """
         Remove todos os tokens de autenticação do usuário com id `idUsuario`.
 
+        Também descarta os dados do usuário mantidos no cache de autenticação, de modo
+        que promoções e rebaixamentos (que removem os tokens) tenham efeito imediato.
+
         :param idUsuario: Identificador do usuário.
         """
-        colecaoTokens.delete_many({"idUsuario": idUsuario})
+        await colecaoTokens.delete_many({"idUsuario": idUsuario})
+        invalidaTokensUsuario(idUsuario)
+        invalidaUsuario(idUsuario)
+
+
+class ImagemBD:
+    """
+    Contagem de referências dos arquivos do repositório de objetos de imagens. Cada
+    usuário, evento ou inscrição que aponta para um arquivo conta como uma referência; o
+    arquivo só pode ser removido quando não houver mais nenhuma.
+
+    A remoção de um arquivo sem referências é marcada no contador (`removendoAte`) antes
+    de o arquivo ser apagado, e o contador só é removido depois. Assim, quem adiciona uma
+    referência durante a remoção fica sabendo que o arquivo pode ter sido apagado e deve
+    gravá-lo de novo após o fim da remoção (ver `aguardarRemocao`).
+    """
+
+    @staticmethod
+    async def adicionarReferencia(idObjeto: str) -> datetime | None:
+        """
+        Registra uma nova referência a um arquivo.
+
+        :param idObjeto: Hash do conteúdo do arquivo.
+        :return removendoAte: Prazo da remoção do arquivo em andamento, ou None se ele
+            não estiver sendo removido.
+        """
+        contador = await colecaoReferenciasImagens.find_one_and_update(
+            {"_id": idObjeto},
+            {"$inc": {"referencias": 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        return contador.get("removendoAte")
+
+    @staticmethod
+    async def removerReferencia(idObjeto: str) -> bool:
+        """
+        Remove uma referência a um arquivo. Caso ele deixe de ser referenciado, marca a
+        sua remoção, que deve ser encerrada com `concluirRemocao` após apagar o arquivo.
+
+        :param idObjeto: Hash do conteúdo do arquivo.
+        :return remover: Se o arquivo deixou de ser referenciado e deve ser removido.
+        """
+        contador = await colecaoReferenciasImagens.find_one_and_update(
+            {"_id": idObjeto},
+            {"$inc": {"referencias": -1}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if contador is None:
+            # arquivo sem contagem (ex: anterior à contagem de referências)
+            return True
+        if contador["referencias"] > 0:
+            return False
+
+        # só marca a remoção se nenhuma referência tiver sido adicionada nesse meio
+        # tempo e nenhuma outra remoção estiver em andamento
+        agora = datetime.now()
+        prazo = agora + timedelta(seconds=config.PRAZO_REMOCAO_IMAGEM)
+        resultado = await colecaoReferenciasImagens.update_one(
+            {
+                "_id": idObjeto,
+                "referencias": {"$lte": 0},
+                "$or": [
+                    {"removendoAte": {"$exists": False}},
+                    {"removendoAte": {"$lt": agora}},
+                ],
+            },
+            {"$set": {"removendoAte": prazo}},
+        )
+        return resultado.modified_count == 1
+
+    @staticmethod
+    async def concluirRemocao(idObjeto: str):
+        """
+        Encerra a remoção de um arquivo, marcada por `removerReferencia`, após ele ter
+        sido apagado. Caso uma referência tenha sido adicionada durante a remoção, o
+        contador é mantido e quem a adicionou grava o arquivo de novo.
+
+        :param idObjeto: Hash do conteúdo do arquivo.
+        """
+        resultado = await colecaoReferenciasImagens.delete_one(
+            {"_id": idObjeto, "referencias": {"$lte": 0}}
+        )
+        if resultado.deleted_count == 0:
+            await colecaoReferenciasImagens.update_one(
+                {"_id": idObjeto}, {"$unset": {"removendoAte": ""}}
+            )
+
+    @staticmethod
+    async def aguardarRemocao(idObjeto: str, removendoAte: datetime):
+        """
+        Aguarda o fim da remoção de um arquivo, ou o seu prazo.
+
+        :param idObjeto: Hash do conteúdo do arquivo.
+        :param removendoAte: Prazo da remoção, retornado por `adicionarReferencia`.
+        """
+        while datetime.now() < removendoAte:
+            contador = await colecaoReferenciasImagens.find_one(
+                {"_id": idObjeto}, {"removendoAte": 1}
+            )
+            if contador is None or contador.get("removendoAte") != removendoAte:
+                return
+            await asyncio.sleep(0.05)
+
+
+class FilaEmailBD:
+    """
+    Encapsula operações da fila de envio de e-mails.
+
+    Os e-mails são reservados por um entregador por um prazo (concessão). Se o
+    entregador for interrompido antes de registrar o resultado, o e-mail volta a poder
+    ser reservado quando a concessão expira; por isso, um e-mail pode ser enviado mais
+    de uma vez, mas nunca é perdido. Cada reserva recebe um identificador próprio
+    (`EmailFila.reserva`), exigido para registrar o resultado: quem perdeu a reserva por
+    expiração não sobrescreve o resultado de quem a obteve depois, mesmo no mesmo
+    processo.
+    """
+
+    @staticmethod
+    async def enfileirar(destino: str, mensagem: str) -> str:
+        """
+        Coloca um e-mail na fila, para envio imediato.
+
+        :param destino: E-mail do destinatário.
+        :param mensagem: Mensagem completa, com os cabeçalhos.
+        :return id: Identificador do e-mail na fila.
+        """
+        agora = datetime.now()
+        email = EmailFila(
+            _id=secrets.token_hex(16),
+            destino=destino,
+            mensagem=mensagem,
+            criacao=agora,
+            proximaTentativa=agora,
+        )
+        await colecaoFilaEmails.insert_one(email.model_dump(by_alias=True))
+        return email.id
+
+    @staticmethod
+    async def enfileirarVarios(
+        emails: list[tuple[str, str]], prioridade: int, aviso: str | None = None
+    ) -> int:
+        """
+        Coloca vários e-mails na fila com uma única operação.
+
+        :param emails: Pares de destinatário e mensagem completa.
+        :param prioridade: Prioridade dos e-mails (ver `EmailFila.prioridade`).
+        :param aviso: Aviso ao qual os e-mails pertencem, se houver. Nesse caso, o
+            identificador de cada e-mail é formado pelo aviso e pelo destinatário, então
+            e-mails já colocados na fila por uma execução anterior do mesmo aviso são
+            ignorados.
+        :return quantidade: Quantidade de e-mails colocados na fila.
+        """
+        if not emails:
+            return 0
+
+        agora = datetime.now()
+        documentos = [
+            EmailFila(
+                _id=f"{aviso}:{destino}" if aviso else secrets.token_hex(16),
+                destino=destino,
+                mensagem=mensagem,
+                prioridade=prioridade,
+                aviso=aviso,
+                criacao=agora,
+                proximaTentativa=agora,
+            ).model_dump(by_alias=True)
+            for destino, mensagem in emails
+        ]
+        try:
+            resultado = await colecaoFilaEmails.insert_many(documentos, ordered=False)
+        except BulkWriteError as e:
+            # apenas identificadores repetidos são esperados
+            if any(erro["code"] != 11000 for erro in e.details["writeErrors"]):
+                raise
+            return e.details["nInserted"]
+        return len(resultado.inserted_ids)
+
+    @staticmethod
+    async def reservar(responsavel: str, quantidade: int, concessao: timedelta) -> list[EmailFila]:
+        """
+        Reserva até `quantidade` e-mails prontos para envio: pendentes cuja próxima
+        tentativa já chegou ou reservados cuja concessão expirou. Cada reserva é atômica,
+        então um e-mail nunca é reservado por dois entregadores ao mesmo tempo.
+
+        :param responsavel: Identificador do entregador.
+        :param quantidade: Quantidade máxima de e-mails reservados. Os de menor
+            prioridade são reservados primeiro.
+        :param concessao: Prazo da reserva.
+        :return emails: E-mails reservados, com a contagem de tentativas já incrementada e
+            o identificador da reserva (`EmailFila.reserva`).
+        """
+        agora = datetime.now()
+        filtro = {
+            "$or": [
+                {"estado": EstadoEmail.PENDENTE, "proximaTentativa": {"$lte": agora}},
+                {"estado": EstadoEmail.ENVIANDO, "concessaoAte": {"$lt": agora}},
+            ]
+        }
+
+        emails: list[EmailFila] = []
+        for _ in range(quantidade):
+            atualizacao = {
+                "$set": {
+                    "estado": EstadoEmail.ENVIANDO,
+                    "responsavel": responsavel,
+                    "reserva": uuid.uuid4().hex,
+                    "concessaoAte": agora + concessao,
+                },
+                "$inc": {"tentativas": 1},
+            }
+            documento = await colecaoFilaEmails.find_one_and_update(
+                filtro,
+                atualizacao,
+                sort=[("prioridade", 1), ("proximaTentativa", 1)],
+                return_document=ReturnDocument.AFTER,
+            )
+            if documento is None:
+                break
+            emails.append(EmailFila(**documento))
+        return emails
+
+    @staticmethod
+    async def marcarEnviado(id: str, reserva: str) -> bool:
+        """
+        Registra o envio de um e-mail reservado.
+
+        :param id: Identificador do e-mail.
+        :param reserva: Identificador da reserva (`EmailFila.reserva`).
+        :return registrado: Se a reserva ainda era válida e o envio foi registrado.
+        """
+        resultado = await colecaoFilaEmails.update_one(
+            {"_id": id, "reserva": reserva},
+            {
+                "$set": {"estado": EstadoEmail.ENVIADO, "envio": datetime.now()},
+                "$unset": {"concessaoAte": "", "reserva": "", "mensagem": ""},
+            },
+        )
+        return resultado.modified_count == 1
+
+    @staticmethod
+    async def marcarFalha(
+        id: str, reserva: str, erro: str, proximaTentativa: datetime | None
+    ) -> bool:
+        """
+        Registra uma tentativa de envio sem sucesso.
+
+        :param id: Identificador do e-mail.
+        :param reserva: Identificador da reserva (`EmailFila.reserva`).
+        :param erro: Descrição do erro.
+        :param proximaTentativa: Data e hora da próxima tentativa, ou None para
+            descartar o e-mail (estado `FALHOU`).
+        :return registrado: Se a reserva ainda era válida e a falha foi registrada.
+        """
+        if proximaTentativa is None:
+            alteracao = {"estado": EstadoEmail.FALHOU}
+        else:
+            alteracao = {"estado": EstadoEmail.PENDENTE, "proximaTentativa": proximaTentativa}
+
+        resultado = await colecaoFilaEmails.update_one(
+            {"_id": id, "reserva": reserva},
+            {
+                "$set": {**alteracao, "ultimoErro": erro},
+                "$unset": {"concessaoAte": "", "reserva": ""},
+            },
+        )
+        return resultado.modified_count == 1
+
+    @staticmethod
+    async def contarPorEstado(aviso: str | None = None) -> dict[str, int]:
+        """
+        Conta os e-mails da fila em cada estado.
+
+        :param aviso: Caso fornecido, conta apenas os e-mails desse aviso.
+        :return contagem: Quantidade de e-mails por estado (estados sem e-mails valem 0).
+        """
+        filtro = {} if aviso is None else {"aviso": aviso}
+        contagem = {estado.value: 0 for estado in EstadoEmail}
+        async for grupo in colecaoFilaEmails.aggregate(
+            [
+                {"$match": filtro},
+                {"$group": {"_id": "$estado", "quantidade": {"$sum": 1}}},
+            ]
+        ):
+            contagem[grupo["_id"]] = grupo["quantidade"]
+        return contagem
+
+    @staticmethod
+    async def buscarProximaTentativa() -> datetime | None:
+        """
+        Retorna a menor data de próxima tentativa entre os e-mails pendentes, se houver.
+        Se for anterior ao momento atual, indica há quanto tempo a fila está atrasada.
+        """
+        documento = await colecaoFilaEmails.find_one(
+            {"estado": EstadoEmail.PENDENTE},
+            {"proximaTentativa": 1},
+            sort=[("proximaTentativa", 1)],
+        )
+        return documento["proximaTentativa"] if documento else None
+
+    @staticmethod
+    async def contarEnviosRecentes() -> int:
+        """
+        Conta os e-mails enviados no último minuto ou em envio no momento, por todos os
+        entregadores, para a aplicação do limite de envios por minuto.
+
+        :return quantidade: Quantidade de e-mails.
+        """
+        agora = datetime.now()
+        return await colecaoFilaEmails.count_documents(
+            {
+                "$or": [
+                    {
+                        "estado": EstadoEmail.ENVIADO,
+                        "envio": {"$gte": agora - timedelta(minutes=1)},
+                    },
+                    {"estado": EstadoEmail.ENVIANDO, "concessaoAte": {"$gte": agora}},
+                ]
+            }
+        )
+
+
+class AvisoBD:
+    """
+    Encapsula operações dos avisos enviados aos inscritos de um evento.
+    """
+
+    @staticmethod
+    async def criar(aviso: Aviso):
+        """
+        Registra um aviso.
+
+        :param aviso: Aviso a ser registrado.
+        """
+        await colecaoAvisos.insert_one(aviso.model_dump(by_alias=True))
+
+    @staticmethod
+    async def somarDestinatarios(id: str, quantidade: int):
+        """
+        Soma `quantidade` à quantidade de e-mails do aviso colocados na fila.
+
+        :param id: Identificador do aviso.
+        :param quantidade: Quantidade de e-mails colocados na fila.
+        """
+        await colecaoAvisos.update_one({"_id": id}, {"$inc": {"destinatarios": quantidade}})
+
+    @staticmethod
+    async def concluir(id: str):
+        """
+        Registra que todos os e-mails do aviso foram colocados na fila.
+
+        :param id: Identificador do aviso.
+        """
+        await colecaoAvisos.update_one({"_id": id}, {"$set": {"concluido": True}})
+
+    @staticmethod
+    async def buscarInterrompidos(criadosAntesDe: datetime) -> list[Aviso]:
+        """
+        Busca os avisos cujos e-mails não foram todos colocados na fila (ex: o processo
+        foi interrompido durante a distribuição).
+
+        :param criadosAntesDe: Apenas avisos criados antes desse momento são buscados,
+            para não retomar os que ainda estão sendo distribuídos.
+        :return avisos: Avisos não concluídos.
+        """
+        documentos = colecaoAvisos.find(
+            {"concluido": False, "criacao": {"$lt": criadosAntesDe}}
+        )
+        return [Aviso(**documento) async for documento in documentos]
+
+    @staticmethod
+    async def buscar(idEvento: str, id: str) -> Aviso:
+        """
+        Busca um aviso de um evento.
+
+        :param idEvento: Identificador do evento.
+        :param id: Identificador do aviso.
+        :return aviso: Aviso encontrado.
+        :raises NaoEncontradoExcecao: Caso o aviso não exista.
+        """
+        documento = await colecaoAvisos.find_one({"_id": id, "idEvento": idEvento})
+        if not documento:
+            raise NaoEncontradoExcecao(message="O aviso não foi encontrado.")
+        return Aviso(**documento)
+
+
+class RotinaBD:
+    """
+    Encapsula o controle de execução das rotinas agendadas.
+
+    Cada rotina possui um documento com a data da última execução e uma marca de até
+    onde os dados já foram processados. Como todos os processos da aplicação agendam as
+    mesmas rotinas, a execução é reservada atomicamente por um deles, por um prazo
+    (concessão), e só é permitida se a última execução foi há pelo menos
+    `intervaloMinimo`; assim, cada rotina é executada uma única vez por período.
+    """
+
+    @staticmethod
+    async def adquirir(
+        nome: str, responsavel: str, concessao: timedelta, intervaloMinimo: timedelta
+    ) -> dict | None:
+        """
+        Reserva a execução de uma rotina.
+
+        :param nome: Nome da rotina.
+        :param responsavel: Identificador do processo que a executará.
+        :param concessao: Prazo da reserva. Caso o processo seja interrompido, outro pode
+            executar a rotina após esse prazo.
+        :param intervaloMinimo: Tempo mínimo desde a última execução concluída.
+        :return rotina: Documento da rotina, com a `marca` da última execução (ausente na
+            primeira), ou None se a rotina está reservada por outro processo ou já foi
+            executada neste período.
+        """
+        agora = datetime.now()
+        try:
+            return await colecaoRotinas.find_one_and_update(
+                {
+                    "_id": nome,
+                    "$and": [
+                        {"$or": [{"concessaoAte": None}, {"concessaoAte": {"$lt": agora}}]},
+                        {
+                            "$or": [
+                                {"ultimaExecucao": None},
+                                {"ultimaExecucao": {"$lte": agora - intervaloMinimo}},
+                            ]
+                        },
+                    ],
+                },
+                {"$set": {"responsavel": responsavel, "concessaoAte": agora + concessao}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            # o documento existe, mas não atende ao filtro
+            return None
+
+    @staticmethod
+    async def concluir(nome: str, responsavel: str, marca: datetime):
+        """
+        Registra a conclusão da execução de uma rotina e libera a reserva.
+
+        :param nome: Nome da rotina.
+        :param responsavel: Identificador do processo que a executou.
+        :param marca: Até onde os dados foram processados, usado como início da próxima
+            execução.
+        """
+        await colecaoRotinas.update_one(
+            {"_id": nome, "responsavel": responsavel},
+            {
+                "$set": {"marca": marca, "ultimaExecucao": datetime.now()},
+                "$unset": {"concessaoAte": ""},
+            },
+        )
+
+    @staticmethod
+    async def renovar(
+        nome: str, responsavel: str, concessao: timedelta, marca: datetime | None = None
+    ) -> bool:
+        """
+        Prorroga a reserva de uma rotina em execução e, opcionalmente, registra até onde
+        os dados já foram processados, para que uma execução interrompida seja retomada
+        a partir desse ponto.
+
+        :param nome: Nome da rotina.
+        :param responsavel: Identificador do processo que a executa.
+        :param concessao: Novo prazo da reserva, a partir de agora.
+        :param marca: Até onde os dados foram processados, se houver avanço.
+        :return renovada: Falso se a reserva foi assumida por outro processo.
+        """
+        alteracoes = {"concessaoAte": datetime.now() + concessao}
+        if marca is not None:
+            alteracoes["marca"] = marca
+        resultado = await colecaoRotinas.update_one(
+            {"_id": nome, "responsavel": responsavel, "concessaoAte": {"$ne": None}},
+            {"$set": alteracoes},
+        )
+        return resultado.matched_count == 1
+
+    @staticmethod
+    async def liberar(nome: str, responsavel: str):
+        """
+        Libera a reserva de uma rotina sem registrar a execução (ex: após um erro), para
+        que ela seja executada novamente no próximo agendamento.
+
+        :param nome: Nome da rotina.
+        :param responsavel: Identificador do processo que a reservou.
+        """
+        await colecaoRotinas.update_one(
+            {"_id": nome, "responsavel": responsavel}, {"$unset": {"concessaoAte": ""}}
+        )
 
 
 class RegistroLoginBD:
     @staticmethod
-    def criar(modelo: RegistroLogin):
+    async def criar(modelo: RegistroLogin):
         """
         Cria um registro de login no banco de dados.
         """
-        colecaoRegistro.insert_one(modelo.model_dump())
+        await colecaoRegistro.insert_one(modelo.model_dump())
 
     @staticmethod
-    def listarRegistrosUsuario(email: str) -> list[RegistroLogin]:
+    async def listarRegistrosUsuario(email: str) -> list[RegistroLogin]:
         """
         Lista os registros de login de um usuário.
         """
         # Verifica se o email possui algum registro associado
-        if not colecaoRegistro.find_one({"emailUsuario": email}):
+        if not await colecaoRegistro.find_one({"emailUsuario": email}):
             raise NaoEncontradoExcecao(message="Nenhum registro encontrado.")
         else:
             return [
                 RegistroLogin(**r)
-                for r in colecaoRegistro.find({"emailUsuario": email})
+                async for r in colecaoRegistro.find({"emailUsuario": email})
             ]  # type: ignore
 
     @staticmethod
-    def listarTodos() -> list[RegistroLogin]:
+    async def listarTodos() -> list[RegistroLogin]:
         """
         Lista todos os registros de login.
         """
-        return [RegistroLogin(**r) for r in colecaoRegistro.find()]
+        return [RegistroLogin(**r) async for r in colecaoRegistro.find()]
 
 
 class AvaliacaoBD:
@@ -394,21 +1424,29 @@ class AvaliacaoBD:
     """
 
     @staticmethod
-    def criarFormulario(modelo: FormularioAvaliacaoEvento):
+    async def criarFormulario(modelo: FormularioAvaliacaoEvento):
         """
         Cria um formulario de avaliacao no banco de dados.
 
         :param modelo: Formulario a ser criado.
         :raises JaExisteExcecao: Caso um formulario para o evento ja exista.
         """
+        # os agregados passam a ser mantidos a partir da criacao do formulario; o
+        # documento vazio e criado antes, para que nenhuma submissao fique de fora
+        await colecaoAgregadosAvaliacao.update_one(
+            {"_id": modelo.idEvento},
+            {"$setOnInsert": AgregadosAvaliacaoEvento(_id=modelo.idEvento).model_dump(by_alias=True)},
+            upsert=True,
+        )
+
         try:
-            colecaoFormulariosAvaliacao.insert_one(modelo.model_dump(by_alias=True))
+            await colecaoFormulariosAvaliacao.insert_one(modelo.model_dump(by_alias=True))
         except DuplicateKeyError:
             logging.error("Formulario de avaliacao ja existe para este evento")
             raise JaExisteExcecao(message="Formulario de avaliacao ja existe para este evento")
 
     @staticmethod
-    def buscarFormularioPorEvento(idEvento: str) -> FormularioAvaliacaoEvento:
+    async def buscarFormularioPorEvento(idEvento: str) -> FormularioAvaliacaoEvento:
         """
         Busca o formulario de avaliacao de um evento.
 
@@ -416,33 +1454,141 @@ class AvaliacaoBD:
         :return: Formulario de avaliacao do evento.
         :raises NaoEncontradoExcecao: Caso o formulario nao seja encontrado.
         """
-        documento = colecaoFormulariosAvaliacao.find_one({"idEvento": idEvento})
+        documento = await colecaoFormulariosAvaliacao.find_one({"idEvento": idEvento})
         if not documento:
             raise NaoEncontradoExcecao(message="Formulario de avaliacao nao encontrado.")
         return FormularioAvaliacaoEvento(**documento)
 
     @staticmethod
-    def atualizarFormulario(modelo: FormularioAvaliacaoEvento):
+    async def buscarFormulariosLiberadosEntre(inicio: datetime, fim: datetime) -> list[dict]:
+        """
+        Busca os formularios habilitados liberados no intervalo (`inicio`, `fim`], em
+        ordem de liberacao.
+
+        :param inicio: Inicio do intervalo (exclusivo).
+        :param fim: Fim do intervalo (inclusivo).
+        :return formularios: Identificador do evento e data de liberacao de cada formulario.
+        """
+        documentos = colecaoFormulariosAvaliacao.find(
+            {"liberarApos": {"$gt": inicio, "$lte": fim}, "habilitado": True},
+            {"idEvento": 1, "liberarApos": 1},
+        ).sort("liberarApos", 1)
+        return [formulario async for formulario in documentos]
+
+    @staticmethod
+    async def atualizarFormulario(modelo: FormularioAvaliacaoEvento):
         """
         Atualiza um formulario de avaliacao no banco de dados.
 
         :param modelo: Formulario com dados atualizados.
         """
-        colecaoFormulariosAvaliacao.update_one(
+        await colecaoFormulariosAvaliacao.update_one(
             {"_id": modelo.id}, {"$set": modelo.model_dump(by_alias=True)}
         )
 
     @staticmethod
-    def criarSubmissaoAnonima(modelo: SubmissaoAvaliacaoAnonima):
+    async def criarSubmissaoAnonima(modelo: SubmissaoAvaliacaoAnonima):
         """
-        Cria uma submissao anonima de avaliacao.
+        Cria uma submissao anonima de avaliacao e atualiza atomicamente os agregados de
+        avaliacao do evento com as respostas enviadas.
+
+        O documento de agregados e criado junto com o formulario (vide
+        `criarFormulario`); os de formularios anteriores aos agregados sao criados pelo
+        script `scripts/reconstruirAgregadosAvaliacao.py`, executado na implantacao.
 
         :param modelo: Submissao a ser criada.
         """
-        colecaoSubmissoesAvaliacao.insert_one(modelo.model_dump(by_alias=True))
+        await colecaoSubmissoesAvaliacao.insert_one(modelo.model_dump(by_alias=True))
+
+        incrementos: dict[str, int] = {"totalAvaliacoes": 1}
+        tipos: dict[str, str] = {}
+        for resposta in modelo.respostas:
+            prefixo = f"perguntas.{resposta.idPergunta}"
+            tipos[f"{prefixo}.tipoPergunta"] = resposta.tipoPergunta.value
+
+            if resposta.nota is not None:
+                incrementos[f"{prefixo}.somaNotas"] = resposta.nota
+                incrementos[f"{prefixo}.quantidadeNotas"] = 1
+
+            if resposta.respostaTexto:
+                incrementos[f"{prefixo}.quantidadeTextos"] = 1
+
+            opcoes = resposta.respostasOpcoes or (
+                [resposta.respostaOpcao] if resposta.respostaOpcao else []
+            )
+            for opcao in opcoes:
+                chave = f"{prefixo}.opcoes.{codificaOpcao(opcao)}"
+                incrementos[chave] = incrementos.get(chave, 0) + 1
+
+        atualizacao: dict[str, dict] = {"$inc": incrementos}
+        if tipos:
+            atualizacao["$set"] = tipos
+
+        await colecaoAgregadosAvaliacao.update_one({"_id": modelo.idEvento}, atualizacao)
 
     @staticmethod
-    def criarControleSubmissao(modelo: ControleSubmissaoAvaliacao):
+    async def buscarAgregados(idEvento: str) -> AgregadosAvaliacaoEvento | None:
+        """
+        Busca os agregados de avaliacao de um evento.
+
+        :param idEvento: Identificador do evento.
+        :return agregados: Agregados do evento, ou None caso ainda nao existam.
+        """
+        documento = await colecaoAgregadosAvaliacao.find_one({"_id": idEvento})
+        if not documento:
+            return None
+        return AgregadosAvaliacaoEvento(**documento)
+
+    @staticmethod
+    async def calcularAgregados(idEvento: str) -> AgregadosAvaliacaoEvento:
+        """
+        Calcula os agregados de avaliacao de um evento a partir de todas as suas
+        submissoes, sem grava-los.
+
+        :param idEvento: Identificador do evento.
+        :return agregados: Agregados calculados.
+        """
+        agregados = AgregadosAvaliacaoEvento(
+            _id=idEvento,
+            totalAvaliacoes=await AvaliacaoBD.contarSubmissoesPorEvento(idEvento),
+        )
+
+        for grupo in await AvaliacaoBD.agregarRespostasPorEvento(idEvento):
+            pergunta = agregados.perguntas.setdefault(
+                grupo["idPergunta"],
+                AgregadoPerguntaAvaliacao(tipoPergunta=TipoPerguntaAvaliacao(grupo["tipoPergunta"])),
+            )
+            pergunta.somaNotas += grupo["somaNotas"]
+            pergunta.quantidadeNotas += grupo["quantidadeNotas"]
+            pergunta.quantidadeTextos += grupo["quantidadeTextos"]
+            if grupo.get("opcao"):
+                chave = codificaOpcao(grupo["opcao"])
+                pergunta.opcoes[chave] = pergunta.opcoes.get(chave, 0) + grupo["quantidade"]
+
+        return agregados
+
+    @staticmethod
+    async def reconstruirAgregados(idEvento: str) -> AgregadosAvaliacaoEvento:
+        """
+        Recalcula os agregados de avaliacao de um evento a partir de todas as suas
+        submissoes e substitui o documento armazenado.
+
+        Submissoes enviadas durante o calculo podem nao ser contabilizadas, por isso a
+        reconstrucao nao e feita durante as requisicoes, apenas pelo script
+        `scripts/reconstruirAgregadosAvaliacao.py` (que tambem verifica os agregados
+        com `--verificar`), de preferencia sem submissoes em andamento.
+
+        :param idEvento: Identificador do evento.
+        :return agregados: Agregados reconstruidos.
+        """
+        agregados = await AvaliacaoBD.calcularAgregados(idEvento)
+        await colecaoAgregadosAvaliacao.replace_one(
+            {"_id": idEvento}, agregados.model_dump(by_alias=True), upsert=True
+        )
+        return agregados
+
+    @staticmethod
+    async def criarControleSubmissao(modelo: ControleSubmissaoAvaliacao):
         """
         Registra que um usuario completou a avaliacao de um evento.
 
@@ -450,13 +1596,13 @@ class AvaliacaoBD:
         :raises JaExisteExcecao: Caso o usuario ja tenha submetido avaliacao.
         """
         try:
-            colecaoControleSubmissao.insert_one(modelo.model_dump(by_alias=True))
+            await colecaoControleSubmissao.insert_one(modelo.model_dump(by_alias=True))
         except DuplicateKeyError:
             logging.error("Usuario ja submeteu avaliacao para este evento")
             raise JaExisteExcecao(message="Avaliacao ja realizada para este evento")
 
     @staticmethod
-    def verificarSubmissaoExistente(idEvento: str, idUsuario: str) -> bool:
+    async def verificarSubmissaoExistente(idEvento: str, idUsuario: str) -> bool:
         """
         Verifica se o usuario ja submeteu avaliacao para o evento.
 
@@ -464,14 +1610,14 @@ class AvaliacaoBD:
         :param idUsuario: Identificador do usuario.
         :return: True se ja submeteu, False caso contrario.
         """
-        documento = colecaoControleSubmissao.find_one({
+        documento = await colecaoControleSubmissao.find_one({
             "idEvento": idEvento,
             "idUsuario": idUsuario,
         })
         return documento is not None
 
     @staticmethod
-    def listarSubmissoesPorEvento(idEvento: str) -> list[SubmissaoAvaliacaoAnonima]:
+    async def listarSubmissoesPorEvento(idEvento: str) -> list[SubmissaoAvaliacaoAnonima]:
         """
         Lista todas as submissoes anonimas de um evento.
 
@@ -479,10 +1625,10 @@ class AvaliacaoBD:
         :return: Lista de submissoes anonimas.
         """
         documentos = colecaoSubmissoesAvaliacao.find({"idEvento": idEvento})
-        return [SubmissaoAvaliacaoAnonima(**doc) for doc in documentos]
+        return [SubmissaoAvaliacaoAnonima(**doc) async for doc in documentos]
 
     @staticmethod
-    def buscarSubmissaoAnonima(
+    async def buscarSubmissaoAnonima(
         idEvento: str, idSubmissao: str
     ) -> SubmissaoAvaliacaoAnonima:
         """
@@ -493,7 +1639,7 @@ class AvaliacaoBD:
         :return: Submissao anonima encontrada.
         :raises NaoEncontradoExcecao: Caso a submissao nao seja encontrada.
         """
-        documento = colecaoSubmissoesAvaliacao.find_one(
+        documento = await colecaoSubmissoesAvaliacao.find_one(
             {"_id": idSubmissao, "idEvento": idEvento}
         )
         if not documento:
@@ -504,11 +1650,105 @@ class AvaliacaoBD:
         return SubmissaoAvaliacaoAnonima(**documento)
 
     @staticmethod
-    def contarSubmissoesPorEvento(idEvento: str) -> int:
+    async def agregarRespostasPorEvento(idEvento: str) -> list[dict]:
+        """
+        Agrega, no próprio banco de dados, as respostas das submissões de um evento.
+
+        As respostas são agrupadas por pergunta, tipo de pergunta e opção escolhida
+        (None para perguntas sem opções). Cada grupo contém:
+
+        - `idPergunta`, `tipoPergunta` e `opcao`: chave do grupo;
+        - `quantidade`: quantidade de respostas (ou de marcações da opção);
+        - `somaNotas` e `quantidadeNotas`: soma e quantidade das notas de escala;
+        - `quantidadeTextos`: quantidade de respostas textuais não vazias.
+
+        Apenas os grupos são devolvidos, de modo que o consumo de memória da aplicação
+        não depende da quantidade de submissões.
+
+        :param idEvento: Identificador do evento.
+        :return grupos: Lista com os grupos de respostas.
+        """
+        pipeline = [
+            {"$match": {"idEvento": idEvento}},
+            {"$unwind": "$respostas"},
+            {"$replaceRoot": {"newRoot": "$respostas"}},
+            {
+                "$project": {
+                    "idPergunta": 1,
+                    "tipoPergunta": 1,
+                    "nota": 1,
+                    # textos só com espaços (enviados antes de serem aparados na
+                    # validação) não contam como comentários
+                    "texto": {
+                        "$cond": [{"$gt": [_textoAparado("$respostaTexto"), ""]}, 1, 0]
+                    },
+                    "opcoes": {
+                        "$ifNull": [
+                            "$respostasOpcoes",
+                            {"$cond": [{"$gt": ["$respostaOpcao", ""]}, ["$respostaOpcao"], []]},
+                        ]
+                    },
+                }
+            },
+            {"$unwind": {"path": "$opcoes", "preserveNullAndEmptyArrays": True}},
+            {
+                "$group": {
+                    "_id": {
+                        "idPergunta": "$idPergunta",
+                        "tipoPergunta": "$tipoPergunta",
+                        "opcao": "$opcoes",
+                    },
+                    "quantidade": {"$sum": 1},
+                    "somaNotas": {"$sum": "$nota"},
+                    "quantidadeNotas": {"$sum": {"$cond": [{"$isNumber": "$nota"}, 1, 0]}},
+                    "quantidadeTextos": {"$sum": "$texto"},
+                }
+            },
+        ]
+
+        return [
+            {**grupo.pop("_id"), **grupo}
+            async for grupo in colecaoSubmissoesAvaliacao.aggregate(pipeline, allowDiskUse=True)
+        ]
+
+    @staticmethod
+    async def listarComentarios(
+        idEvento: str, idsPerguntas: list[str], pular: int, limite: int
+    ) -> list[str]:
+        """
+        Lista, de forma paginada, as respostas textuais enviadas para as perguntas
+        `idsPerguntas` de um evento, sem os espaços das extremidades. Respostas vazias
+        são ignoradas. As respostas são ordenadas pela submissão.
+
+        :param idEvento: Identificador do evento.
+        :param idsPerguntas: Identificadores das perguntas textuais.
+        :param pular: Quantidade de respostas a serem puladas.
+        :param limite: Quantidade máxima de respostas retornadas.
+        :return comentarios: Respostas textuais.
+        """
+        pipeline = [
+            {"$match": {"idEvento": idEvento}},
+            {"$sort": {"_id": 1}},
+            {"$project": {"respostas.idPergunta": 1, "respostas.respostaTexto": 1}},
+            {"$unwind": "$respostas"},
+            {"$match": {"respostas.idPergunta": {"$in": idsPerguntas}}},
+            {"$project": {"texto": _textoAparado("$respostas.respostaTexto")}},
+            {"$match": {"texto": {"$ne": ""}}},
+            {"$skip": pular},
+            {"$limit": limite},
+        ]
+
+        return [
+            documento["texto"]
+            async for documento in colecaoSubmissoesAvaliacao.aggregate(pipeline)
+        ]
+
+    @staticmethod
+    async def contarSubmissoesPorEvento(idEvento: str) -> int:
         """
         Conta o numero de avaliacoes submetidas para um evento.
 
         :param idEvento: Identificador do evento.
         :return: Numero de avaliacoes.
         """
-        return colecaoSubmissoesAvaliacao.count_documents({"idEvento": idEvento})
+        return await colecaoSubmissoesAvaliacao.count_documents({"idEvento": idEvento})
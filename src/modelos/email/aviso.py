@@ -0,0 +1,61 @@
+"""
+Modelos de dados dos avisos enviados por e-mail aos inscritos de um evento.
+"""
+
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class AvisoCriar(BaseModel):
+    """
+    Dados de um pedido de envio de aviso aos inscritos de um evento.
+
+    O assunto e o texto podem conter os campos `$nome` e `$evento`, substituídos em cada
+    e-mail pelo nome do inscrito e pelo título do evento.
+    """
+
+    assunto: str = Field(min_length=1, max_length=200, pattern=r"^[^\r\n]*$")
+    "Assunto do e-mail, em uma única linha."
+
+    texto: str = Field(min_length=1, max_length=20_000)
+    "Texto do e-mail."
+
+
+class Aviso(BaseModel):
+    """
+    Aviso enviado por e-mail aos inscritos de um evento.
+    """
+
+    id: str = Field(..., alias="_id")
+    "Identificador único."
+
+    idEvento: str
+    "Identificador do evento."
+
+    autor: str
+    "Identificador do usuário que enviou o aviso."
+
+    assunto: str
+    "Assunto do e-mail, antes da personalização."
+
+    texto: str
+    "Texto do e-mail, antes da personalização."
+
+    criacao: datetime
+    "Data e hora do envio do aviso."
+
+    destinatarios: int = 0
+    "Quantidade de e-mails colocados na fila de envio."
+
+    concluido: bool = False
+    "Se os e-mails de todos os inscritos já foram colocados na fila de envio."
+
+
+class AvisoLer(Aviso):
+    """
+    Aviso com o andamento do envio dos seus e-mails.
+    """
+
+    progresso: dict[str, int]
+    "Quantidade de e-mails do aviso em cada estado da fila (`pendente`, `enviado`, ...)."
@@ -0,0 +1,74 @@
+"""
+Modelos de dados da fila de envio de e-mails.
+"""
+
+from datetime import datetime
+from enum import StrEnum
+
+from pydantic import BaseModel, Field
+
+
+class EstadoEmail(StrEnum):
+    """
+    Estado de um e-mail na fila de envio.
+    """
+
+    PENDENTE = "pendente"
+    "Aguardando o envio, a partir de `proximaTentativa`."
+
+    ENVIANDO = "enviando"
+    "Reservado por um entregador até `concessaoAte`. Após esse prazo, pode ser reservado novamente."
+
+    ENVIADO = "enviado"
+    "Enviado com sucesso. Removido após `config.RETENCAO_EMAILS_ENVIADOS` dias."
+
+    FALHOU = "falhou"
+    "Descartado após `config.TENTATIVAS_MAXIMAS_EMAIL` tentativas sem sucesso."
+
+
+class EmailFila(BaseModel):
+    """
+    E-mail na fila de envio.
+    """
+
+    id: str = Field(alias="_id")
+    "Identificador do e-mail."
+
+    destino: str
+    "E-mail do destinatário."
+
+    mensagem: str
+    "Mensagem completa (cabeçalhos e corpo), como enviada ao servidor SMTP."
+
+    estado: EstadoEmail = EstadoEmail.PENDENTE
+    "Estado do e-mail na fila."
+
+    prioridade: int = 0
+    "Prioridade de envio: e-mails com menor valor são enviados antes."
+
+    aviso: str | None = None
+    "Aviso ao qual o e-mail pertence, caso tenha sido enviado a todos os inscritos de um evento."
+
+    tentativas: int = 0
+    "Quantidade de vezes que o e-mail foi reservado para envio."
+
+    criacao: datetime
+    "Data e hora em que o e-mail foi colocado na fila."
+
+    proximaTentativa: datetime
+    "Data e hora a partir da qual o e-mail pode ser enviado."
+
+    concessaoAte: datetime | None = None
+    "Fim da reserva do e-mail por um entregador."
+
+    responsavel: str | None = None
+    "Entregador que reservou o e-mail por último."
+
+    reserva: str | None = None
+    "Identificador da reserva atual, único a cada reserva. Apenas quem o possui registra o resultado."
+
+    envio: datetime | None = None
+    "Data e hora do envio."
+
+    ultimoErro: str | None = None
+    "Erro da última tentativa de envio sem sucesso."
@@ -8,6 +8,8 @@ from uuid import uuid4
 class Inscrito(BaseModel):
     """
     Dados de um inscrito em um evento.
+
+    As inscrições são armazenadas na coleção `inscricoes`, separadas do evento.
     """
 
     idUsuario: str
@@ -79,9 +81,6 @@ class Evento(BaseModel):
     vagasDisponiveisSemNote: int
     "Quantidade de vagas sem notebook disponíveis."
 
-    inscritos: list[Inscrito] = []
-    "Pessoas inscritas no evento."
-
     organizadores: list[str] = []
     "Identificadores dos petianos responsáveis pela organização do evento."
 
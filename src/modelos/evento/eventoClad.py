@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Self
 
-from pydantic import BaseModel, ValidationInfo, field_validator, model_validator
+from pydantic import BaseModel, Field, ValidationInfo, field_validator, model_validator
 
 from src.modelos.evento.enums import TipoVaga, TipoEvento, NivelConhecimento
 from src.modelos.evento.evento import Evento, Inscrito
@@ -136,7 +136,7 @@ class EventoLer(BaseModel):
     Dados de um evento expostos publicamente (sem dados internos como inscritos e crachá).
     """
 
-    id: str
+    id: str = Field(..., alias="_id")
     """Identificador único do evento."""
 
     titulo: str
@@ -194,7 +194,7 @@ class EventoLer(BaseModel):
     """Valor da inscrição."""
 
     arte: str | None = None
-    """Indicador de existência de imagem de arte do evento."""
+    """URL da imagem de arte do evento, ou None caso o evento não possua arte."""
 
 
 
@@ -170,6 +170,11 @@ class TempoLimiteExcedidoExcecao(APIExcecaoBase):
     code = status.HTTP_408_REQUEST_TIMEOUT
 
 
+class ProcessamentoOcupadoExcecao(APIExcecaoBase):
+    message = "Muitas imagens em processamento. Tente novamente em instantes."
+    code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+
 def listaRespostasExcecoes(
     *args: Type[APIExcecaoBase],
 ) -> dict[int | str, dict[str, Any]]:
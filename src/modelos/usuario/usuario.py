@@ -73,9 +73,12 @@ class EventosInscrito(BaseModel):
     "Caminho para a arte do evento."
 
 
-class Usuario(BaseModel):
+class UsuarioPerfil(BaseModel):
     """
-    Classe que representa um usuário do sistema.
+    Dados de um usuário do sistema, exceto a senha e a lista de eventos inscritos.
+
+    Utilizado em consultas que não precisam desses campos, que então não são lidos do
+    banco de dados.
     """
 
     id: str = Field(..., alias="_id")
@@ -84,9 +87,6 @@ class Usuario(BaseModel):
     email: EmailStr
     "Endereço de email do usuário."
 
-    senha: str
-    "Hash da senha do usuário."
-
     emailConfirmado: bool
     "Estado da confirmação do email. Indica se o usuário teve seu email confirmado ou não."
 
@@ -110,8 +110,6 @@ class Usuario(BaseModel):
 
     ra: str | None = None
     "Registro acadêmico do usuário. 'None' caso ele não possua"
-    eventosInscrito: list[str] = []
-    "Lista de tuplas de id de evento."
 
     dataCriacao: datetime
     "Data e hora de criação da conta."
@@ -145,6 +143,18 @@ class Usuario(BaseModel):
     apadrinhadoPor: str | None = None
     "Id do petiano que apadrinhou este petiano."
 
+
+class Usuario(UsuarioPerfil):
+    """
+    Classe que representa um usuário do sistema.
+    """
+
+    senha: str
+    "Hash da senha do usuário."
+
+    eventosInscrito: list[str] = []
+    "Lista de tuplas de id de evento."
+
 class Petiano(BaseModel):
     """
     Subconjunto dos dados de um usuário específico para a visualização de petianos.
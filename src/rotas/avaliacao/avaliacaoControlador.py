@@ -3,9 +3,12 @@ Controlador com regras de negocio para formulários e respostas de avaliacao.
 """
 
 from datetime import datetime
+import logging
 import secrets
 
 from src.modelos.avaliacao.avaliacao import (
+    AgregadosAvaliacaoEvento,
+    ComentariosAvaliacaoEvento,
     ControleSubmissaoAvaliacao,
     FormularioAvaliacaoEvento,
     PerguntaAvaliacao,
@@ -13,6 +16,7 @@ from src.modelos.avaliacao.avaliacao import (
     SecaoAvaliacao,
     SubmissaoAvaliacaoAnonima,
     TipoPerguntaAvaliacao,
+    decodificaOpcao,
 )
 from src.modelos.avaliacao.avaliacaoClad import (
     ConfiguracaoFormularioCriar,
@@ -22,6 +26,9 @@ from src.modelos.bd import AvaliacaoBD, EventoBD
 from src.modelos.excecao import ErroValidacaoExcecao, NaoEncontradoExcecao
 from src.modelos.usuario.usuario import Usuario
 
+TAMANHO_PAGINA_COMENTARIOS = 50
+"Quantidade de comentarios por pagina nos resultados da avaliacao."
+
 
 class AvaliacaoControlador:
     """
@@ -194,7 +201,7 @@ class AvaliacaoControlador:
         return perguntas
 
     @staticmethod
-    def configurarFormulario(
+    async def configurarFormulario(
         idEvento: str, dadosFormulario: ConfiguracaoFormularioCriar
     ) -> FormularioAvaliacaoEvento:
         """
@@ -209,7 +216,7 @@ class AvaliacaoControlador:
         """
         # Garante que o evento exista antes de configurar o formulario e obtem o fim
         # do evento como valor padrao para liberarApos.
-        evento = EventoBD.buscar("_id", idEvento)
+        evento = await EventoBD.buscar("_id", idEvento)
         liberar_apos = (
             dadosFormulario.liberarApos
             if dadosFormulario.liberarApos is not None
@@ -236,7 +243,7 @@ class AvaliacaoControlador:
         agora = datetime.now()
 
         try:
-            formulario_existente = AvaliacaoBD.buscarFormularioPorEvento(idEvento)
+            formulario_existente = await AvaliacaoBD.buscarFormularioPorEvento(idEvento)
             dados_formulario = formulario_existente.model_dump(by_alias=True)
             dados_formulario.update(
                 perguntas=perguntas,
@@ -245,7 +252,7 @@ class AvaliacaoControlador:
                 dataAtualizacao=agora,
             )
             formulario = FormularioAvaliacaoEvento(**dados_formulario)
-            AvaliacaoBD.atualizarFormulario(formulario)
+            await AvaliacaoBD.atualizarFormulario(formulario)
             return formulario
         except NaoEncontradoExcecao:
             formulario = FormularioAvaliacaoEvento(
@@ -257,11 +264,11 @@ class AvaliacaoControlador:
                 dataCriacao=agora,
                 dataAtualizacao=agora,
             )
-            AvaliacaoBD.criarFormulario(formulario)
+            await AvaliacaoBD.criarFormulario(formulario)
             return formulario
 
     @staticmethod
-    def enviarFormulario(
+    async def enviarFormulario(
         idEvento: str, idUsuario: str, submissao: SubmissaoAvaliacaoCriar
     ) -> SubmissaoAvaliacaoAnonima:
         """
@@ -276,7 +283,7 @@ class AvaliacaoControlador:
         :raises ErroValidacaoExcecao: Lancada quando o formulario esta desabilitado,
         fora do periodo, com respostas inconsistentes ou com submissao duplicada.
         """
-        formulario = AvaliacaoControlador.obterFormulario(idEvento)
+        formulario = await AvaliacaoControlador.obterFormulario(idEvento)
 
         if not formulario.habilitado:
             raise ErroValidacaoExcecao(message="Formulário de avaliação desabilitado.")
@@ -284,10 +291,10 @@ class AvaliacaoControlador:
         if datetime.now() < formulario.liberarApos:
             raise ErroValidacaoExcecao(message="Formulário de avaliação ainda não liberado.")
 
-        if not EventoBD.verificarInscricaoExistente(idEvento, idUsuario):
+        if not await EventoBD.verificarInscricaoExistente(idEvento, idUsuario):
           raise ErroValidacaoExcecao(message="Apenas usuários inscritos no evento podem enviar avaliação.")
 
-        if AvaliacaoBD.verificarSubmissaoExistente(idEvento, idUsuario):
+        if await AvaliacaoBD.verificarSubmissaoExistente(idEvento, idUsuario):
             raise ErroValidacaoExcecao(message="Avaliação já realizada para este evento.")
 
         perguntas_por_id = {pergunta.idPergunta: pergunta for pergunta in formulario.perguntas}
@@ -330,13 +337,13 @@ class AvaliacaoControlador:
             dataSubmissao=datetime.now(),
         )
 
-        AvaliacaoBD.criarSubmissaoAnonima(submissao_anonima)
-        AvaliacaoBD.criarControleSubmissao(controle_submissao)
+        await AvaliacaoBD.criarSubmissaoAnonima(submissao_anonima)
+        await AvaliacaoBD.criarControleSubmissao(controle_submissao)
 
         return submissao_anonima
 
     @staticmethod
-    def obterFormulario(idEvento: str) -> FormularioAvaliacaoEvento:
+    async def obterFormulario(idEvento: str) -> FormularioAvaliacaoEvento:
         """
         Recupera o formulario de avaliacao associado a um evento.
 
@@ -346,10 +353,10 @@ class AvaliacaoControlador:
 
         :raises NaoEncontradoExcecao: Lancada se o formulario nao existir.
         """
-        return AvaliacaoBD.buscarFormularioPorEvento(idEvento)
+        return await AvaliacaoBD.buscarFormularioPorEvento(idEvento)
 
     @staticmethod
-    def obterFormularioParaPreenchimento(
+    async def obterFormularioParaPreenchimento(
         idEvento: str, usuario: Usuario
     ) -> FormularioAvaliacaoEvento:
         """
@@ -363,16 +370,16 @@ class AvaliacaoControlador:
         :raises NaoEncontradoExcecao: Lancada se o formulario nao existir.
         :raises ErroValidacaoExcecao: Lancada se o usuario nao estiver inscrito no evento.
         """
-        EventoBD.buscar("_id", idEvento)
-        if not EventoBD.verificarInscricaoExistente(idEvento, usuario.id):
+        await EventoBD.buscar("_id", idEvento)
+        if not await EventoBD.verificarInscricaoExistente(idEvento, usuario.id):
             raise ErroValidacaoExcecao(
                 message="Apenas usuários inscritos no evento podem visualizar a avaliação."
             )
 
-        return AvaliacaoControlador.obterFormulario(idEvento)
+        return await AvaliacaoControlador.obterFormulario(idEvento)
 
     @staticmethod
-    def obterSituacaoUsuario(idEvento: str, idUsuario: str) -> bool:
+    async def obterSituacaoUsuario(idEvento: str, idUsuario: str) -> bool:
         """
         Verifica se o usuario ja enviou uma avaliacao para o evento.
 
@@ -381,10 +388,10 @@ class AvaliacaoControlador:
 
         :return jaRespondeu: True se o usuario ja enviou uma avaliacao, False caso contrario.
         """
-        return AvaliacaoBD.verificarSubmissaoExistente(idEvento, idUsuario)
+        return await AvaliacaoBD.verificarSubmissaoExistente(idEvento, idUsuario)
 
     @staticmethod
-    def obterRespostaFormulario(
+    async def obterRespostaFormulario(
         idEvento: str, idSubmissao: str
     ) -> SubmissaoAvaliacaoAnonima:
         """
@@ -397,10 +404,10 @@ class AvaliacaoControlador:
 
         :raises NaoEncontradoExcecao: Lancada quando a submissao nao e encontrada.
         """
-        return AvaliacaoBD.buscarSubmissaoAnonima(idEvento, idSubmissao)
+        return await AvaliacaoBD.buscarSubmissaoAnonima(idEvento, idSubmissao)
 
     @staticmethod
-    def listarSubmissoes(idEvento: str) -> list[SubmissaoAvaliacaoAnonima]:
+    async def listarSubmissoes(idEvento: str) -> list[SubmissaoAvaliacaoAnonima]:
         """
         Lista todas as submissoes anonimas de avaliacao enviadas para um evento.
 
@@ -408,66 +415,168 @@ class AvaliacaoControlador:
 
         :return submissoes: Lista de submissoes anonimas do evento.
         """
-        return AvaliacaoBD.listarSubmissoesPorEvento(idEvento)
+        return await AvaliacaoBD.listarSubmissoesPorEvento(idEvento)
 
     @staticmethod
-    def obterResultados(idEvento: str) -> ResultadoAvaliacaoEvento:
-        """ 
-        Obtem os resultados consolidados de avaliacao de um evento.
+    def _idsPerguntasTexto(formulario: FormularioAvaliacaoEvento) -> list[str]:
+        """
+        Retorna os identificadores das perguntas textuais do formulario.
+
+        :param formulario: Formulario de avaliacao.
+        :return ids: Identificadores das perguntas de resposta curta ou longa.
+        """
+        return [
+            pergunta.idPergunta
+            for pergunta in formulario.perguntas
+            if pergunta.tipo in (TipoPerguntaAvaliacao.RESPOSTA_CURTA, TipoPerguntaAvaliacao.RESPOSTA_LONGA)
+        ]
+
+    @staticmethod
+    async def _obterAgregados(idEvento: str) -> AgregadosAvaliacaoEvento:
+        """
+        Obtem os agregados de avaliacao do evento.
+
+        Os agregados sao criados junto com o formulario e nao sao reconstruidos aqui,
+        pois a reconstrucao concorrente com novas submissoes pode perde-las. Caso nao
+        existam (formulario anterior aos agregados, sem a execucao do script
+        `scripts/reconstruirAgregadosAvaliacao.py`), os resultados ficam vazios.
 
         :param idEvento: Identificador unico do evento.
+        :return agregados: Agregados de avaliacao do evento.
+        """
+        agregados = await AvaliacaoBD.buscarAgregados(idEvento)
+        if agregados is None:
+            logging.warning(f"Agregados de avaliacao nao encontrados: {idEvento}")
+            agregados = AgregadosAvaliacaoEvento(_id=idEvento)
+        return agregados
 
-        :return resultado: Estrutura agregada com os resultados do formulario.
+    @staticmethod
+    def _contarComentarios(
+        formulario: FormularioAvaliacaoEvento, agregados: AgregadosAvaliacaoEvento
+    ) -> int:
+        """
+        Conta os comentarios textuais das perguntas textuais do formulario.
 
-        :raises NaoEncontradoExcecao: Lancada quando o formulario do evento nao existe.
+        :param formulario: Formulario de avaliacao.
+        :param agregados: Agregados de avaliacao do evento.
+        :return total: Quantidade de comentarios.
         """
-        formulario = AvaliacaoControlador.obterFormulario(idEvento)
-        submissoes = AvaliacaoBD.listarSubmissoesPorEvento(idEvento)
+        total = 0
+        for pergunta in formulario.perguntas:
+            agregado = agregados.perguntas.get(pergunta.idPergunta)
+            if (
+                agregado
+                and agregado.tipoPergunta == pergunta.tipo
+                and pergunta.tipo
+                in (TipoPerguntaAvaliacao.RESPOSTA_CURTA, TipoPerguntaAvaliacao.RESPOSTA_LONGA)
+            ):
+                total += agregado.quantidadeTextos
+        return total
 
-        perguntas_por_id = {pergunta.idPergunta: pergunta for pergunta in formulario.perguntas}
-        soma_notas: dict[str, int] = {}
-        quantidade_notas: dict[str, int] = {}
+    @staticmethod
+    async def _calcularResultados(
+        formulario: FormularioAvaliacaoEvento,
+    ) -> ResultadoAvaliacaoEvento:
+        """
+        Calcula os resultados consolidados do formulario a partir dos agregados de
+        avaliacao do evento, sem carregar os comentarios.
+
+        Os agregados sao atualizados a cada submissao, entao a leitura nao depende da
+        quantidade de submissoes. Respostas de perguntas que nao fazem mais parte do
+        formulario sao ignoradas.
+
+        :param formulario: Formulario de avaliacao do evento.
+        :return resultado: Resultados consolidados, com `comentariosLivres` vazio.
+        """
+        idEvento = formulario.idEvento
+        agregados = await AvaliacaoControlador._obterAgregados(idEvento)
+
+        medias_escala: dict[str, float] = {}
         contagem_opcoes: dict[str, dict[str, int]] = {}
-        comentarios: list[str] = []
-
-        for submissao in submissoes:
-            for resposta in submissao.respostas:
-                pergunta = perguntas_por_id.get(resposta.idPergunta)
-                if not pergunta:
-                    continue
-
-                if pergunta.tipo == TipoPerguntaAvaliacao.ESCALA_UM_A_CINCO and resposta.nota is not None:
-                    soma_notas[pergunta.idPergunta] = soma_notas.get(pergunta.idPergunta, 0) + resposta.nota
-                    quantidade_notas[pergunta.idPergunta] = (
-                        quantidade_notas.get(pergunta.idPergunta, 0) + 1
-                    )
-                    continue
-
-                if pergunta.tipo == TipoPerguntaAvaliacao.MULTIPLA_ESCOLHA and resposta.respostaOpcao:
-                    contagem = contagem_opcoes.setdefault(pergunta.idPergunta, {})
-                    contagem[resposta.respostaOpcao] = contagem.get(resposta.respostaOpcao, 0) + 1
-                    continue
-
-                if pergunta.tipo == TipoPerguntaAvaliacao.CAIXAS_DE_SELECAO and resposta.respostasOpcoes:
-                    contagem = contagem_opcoes.setdefault(pergunta.idPergunta, {})
-                    for opcao in resposta.respostasOpcoes:
-                        contagem[opcao] = contagem.get(opcao, 0) + 1
-                    continue
-
-                if (pergunta.tipo in (TipoPerguntaAvaliacao.RESPOSTA_CURTA, TipoPerguntaAvaliacao.RESPOSTA_LONGA)
-                    and resposta.respostaTexto):
-                    comentarios.append(resposta.respostaTexto.strip())
-
-        medias_escala = {
-            id_pergunta: round(soma_notas[id_pergunta] / quantidade_notas[id_pergunta], 2)
-            for id_pergunta in soma_notas
-            if quantidade_notas.get(id_pergunta, 0) > 0
-        }
+
+        for pergunta in formulario.perguntas:
+            agregado = agregados.perguntas.get(pergunta.idPergunta)
+            if not agregado or agregado.tipoPergunta != pergunta.tipo:
+                continue
+
+            if pergunta.tipo == TipoPerguntaAvaliacao.ESCALA_UM_A_CINCO and agregado.quantidadeNotas > 0:
+                medias_escala[pergunta.idPergunta] = round(
+                    agregado.somaNotas / agregado.quantidadeNotas, 2
+                )
+            elif (pergunta.tipo in (TipoPerguntaAvaliacao.MULTIPLA_ESCOLHA, TipoPerguntaAvaliacao.CAIXAS_DE_SELECAO)
+                and agregado.opcoes):
+                contagem_opcoes[pergunta.idPergunta] = {
+                    decodificaOpcao(chave): quantidade
+                    for chave, quantidade in agregado.opcoes.items()
+                }
 
         return ResultadoAvaliacaoEvento(
             idEvento=idEvento,
-            totalAvaliacoes=len(submissoes),
+            totalAvaliacoes=agregados.totalAvaliacoes,
             mediasEscala=medias_escala,
             contagemOpcoes=contagem_opcoes,
-            comentariosLivres=comentarios,
+            totalComentarios=AvaliacaoControlador._contarComentarios(
+                formulario, agregados
+            ),
+        )
+
+    @staticmethod
+    async def obterResultados(idEvento: str) -> ResultadoAvaliacaoEvento:
+        """ 
+        Obtem os resultados consolidados de avaliacao de um evento.
+
+        As medias e contagens sao calculadas pelo banco de dados. Apenas a primeira
+        pagina de comentarios e incluida; as demais sao obtidas com `obterComentarios`.
+
+        :param idEvento: Identificador unico do evento.
+
+        :return resultado: Estrutura agregada com os resultados do formulario.
+
+        :raises NaoEncontradoExcecao: Lancada quando o formulario do evento nao existe.
+        """
+        formulario = await AvaliacaoControlador.obterFormulario(idEvento)
+        resultado = await AvaliacaoControlador._calcularResultados(formulario)
+
+        resultado.comentariosLivres = await AvaliacaoBD.listarComentarios(
+            idEvento,
+            AvaliacaoControlador._idsPerguntasTexto(formulario),
+            0,
+            TAMANHO_PAGINA_COMENTARIOS,
+        )
+
+        return resultado
+
+    @staticmethod
+    async def obterComentarios(
+        idEvento: str, pagina: int, tamanhoPagina: int
+    ) -> ComentariosAvaliacaoEvento:
+        """
+        Obtem uma pagina dos comentarios textuais enviados na avaliacao de um evento.
+
+        :param idEvento: Identificador unico do evento.
+        :param pagina: Numero da pagina, a partir de 1.
+        :param tamanhoPagina: Quantidade maxima de comentarios por pagina.
+
+        :return comentarios: Pagina de comentarios.
+
+        :raises NaoEncontradoExcecao: Lancada quando o formulario do evento nao existe.
+        """
+        formulario = await AvaliacaoControlador.obterFormulario(idEvento)
+        agregados = await AvaliacaoControlador._obterAgregados(idEvento)
+
+        comentarios = await AvaliacaoBD.listarComentarios(
+            idEvento,
+            AvaliacaoControlador._idsPerguntasTexto(formulario),
+            (pagina - 1) * tamanhoPagina,
+            tamanhoPagina,
+        )
+
+        return ComentariosAvaliacaoEvento(
+            idEvento=idEvento,
+            pagina=pagina,
+            tamanhoPagina=tamanhoPagina,
+            totalComentarios=AvaliacaoControlador._contarComentarios(
+                formulario, agregados
+            ),
+            comentarios=comentarios,
         )
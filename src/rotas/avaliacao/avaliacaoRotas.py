@@ -4,9 +4,10 @@ Rotas relacionadas ao modulo de avaliacao de eventos.
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 
 from src.modelos.avaliacao.avaliacao import (
+    ComentariosAvaliacaoEvento,
     FormularioAvaliacaoEvento,
     ResultadoAvaliacaoEvento,
     SubmissaoAvaliacaoAnonima,
@@ -17,7 +18,10 @@ from src.modelos.avaliacao.avaliacaoClad import (
     SubmissaoAvaliacaoCriar,
 )
 from src.modelos.usuario.usuario import Usuario
-from src.rotas.avaliacao.avaliacaoControlador import AvaliacaoControlador
+from src.rotas.avaliacao.avaliacaoControlador import (
+    TAMANHO_PAGINA_COMENTARIOS,
+    AvaliacaoControlador,
+)
 from src.rotas.usuario.usuarioRotas import getPetianoAdminAutenticado, getUsuarioAutenticado
 roteador: APIRouter = APIRouter(
     prefix="/eventos/{idEvento}/avaliacao",
@@ -31,7 +35,7 @@ roteador: APIRouter = APIRouter(
     status_code=status.HTTP_200_OK,
     response_model=FormularioAvaliacaoEvento,
 )
-def configurarFormulario(
+async def configurarFormulario(
     idEvento: str,
     dadosFormulario: ConfiguracaoFormularioCriar,
     usuario: Annotated[Usuario, Depends(getPetianoAdminAutenticado)],
@@ -44,7 +48,7 @@ def configurarFormulario(
     :param usuario: Usuario autenticado (petiano).
     :return formulario: Formulario criado ou atualizado.
     """
-    return AvaliacaoControlador.configurarFormulario(idEvento, dadosFormulario)
+    return await AvaliacaoControlador.configurarFormulario(idEvento, dadosFormulario)
 
 
 @roteador.post(
@@ -54,7 +58,7 @@ def configurarFormulario(
     status_code=status.HTTP_201_CREATED,
     response_model=SubmissaoAvaliacaoAnonima,
 )
-def enviarFormulario(
+async def enviarFormulario(
     idEvento: str,
     submissao: SubmissaoAvaliacaoCriar,
     usuario: Annotated[Usuario, Depends(getUsuarioAutenticado)],
@@ -67,7 +71,7 @@ def enviarFormulario(
     :param usuario: Usuario autenticado que enviara a avaliacao.
     :return submissao: Submissao anonima registrada.
     """
-    return AvaliacaoControlador.enviarFormulario(idEvento, usuario.id, submissao)
+    return await AvaliacaoControlador.enviarFormulario(idEvento, usuario.id, submissao)
 
 
 @roteador.get(
@@ -77,7 +81,7 @@ def enviarFormulario(
     status_code=status.HTTP_200_OK,
     response_model=FormularioAvaliacaoEvento,
 )
-def obterFormulario(
+async def obterFormulario(
     idEvento: str,
     usuario: Annotated[Usuario, Depends(getPetianoAdminAutenticado)],
 ):
@@ -88,7 +92,7 @@ def obterFormulario(
     :param usuario: Usuario autenticado.
     :return formulario: Formulario de avaliacao do evento.
     """
-    return AvaliacaoControlador.obterFormulario(idEvento)
+    return await AvaliacaoControlador.obterFormulario(idEvento)
 
 
 @roteador.get(
@@ -98,7 +102,7 @@ def obterFormulario(
     status_code=status.HTTP_200_OK,
     response_model=FormularioAvaliacaoEvento,
 )
-def obterFormularioParaPreenchimento(
+async def obterFormularioParaPreenchimento(
     idEvento: str,
     usuario: Annotated[Usuario, Depends(getUsuarioAutenticado)],
 ):
@@ -109,7 +113,7 @@ def obterFormularioParaPreenchimento(
     :param usuario: Usuario autenticado.
     :return formulario: Formulario de avaliacao do evento.
     """
-    return AvaliacaoControlador.obterFormularioParaPreenchimento(idEvento, usuario)
+    return await AvaliacaoControlador.obterFormularioParaPreenchimento(idEvento, usuario)
 
 
 @roteador.get(
@@ -119,7 +123,7 @@ def obterFormularioParaPreenchimento(
     status_code=status.HTTP_200_OK,
     response_model=SituacaoAvaliacaoUsuario,
 )
-def obterSituacaoUsuario(
+async def obterSituacaoUsuario(
     idEvento: str,
     usuario: Annotated[Usuario, Depends(getUsuarioAutenticado)],
 ):
@@ -131,7 +135,7 @@ def obterSituacaoUsuario(
     :return situacao: Situacao do usuario em relacao a avaliacao do evento.
     """
     return SituacaoAvaliacaoUsuario(
-        jaRespondeu=AvaliacaoControlador.obterSituacaoUsuario(idEvento, usuario.id)
+        jaRespondeu=await AvaliacaoControlador.obterSituacaoUsuario(idEvento, usuario.id)
     )
 
 
@@ -142,7 +146,7 @@ def obterSituacaoUsuario(
     status_code=status.HTTP_200_OK,
     response_model=list[SubmissaoAvaliacaoAnonima],
 )
-def listarRespostasFormulario(
+async def listarRespostasFormulario(
     idEvento: str,
     usuario: Annotated[Usuario, Depends(getPetianoAdminAutenticado)],
 ):
@@ -153,7 +157,7 @@ def listarRespostasFormulario(
     :param usuario: Usuario autenticado (petiano).
     :return submissoes: Lista de submissoes anonimas do evento.
     """
-    return AvaliacaoControlador.listarSubmissoes(idEvento)
+    return await AvaliacaoControlador.listarSubmissoes(idEvento)
 
 
 @roteador.get(
@@ -163,7 +167,7 @@ def listarRespostasFormulario(
     status_code=status.HTTP_200_OK,
     response_model=SubmissaoAvaliacaoAnonima,
 )
-def obterRespostaFormulario(
+async def obterRespostaFormulario(
     idEvento: str,
     idSubmissao: str,
     usuario: Annotated[Usuario, Depends(getPetianoAdminAutenticado)],
@@ -176,7 +180,7 @@ def obterRespostaFormulario(
     :param usuario: Usuario autenticado (petiano).
     :return submissao: Submissao anonima encontrada.
     """
-    return AvaliacaoControlador.obterRespostaFormulario(idEvento, idSubmissao)
+    return await AvaliacaoControlador.obterRespostaFormulario(idEvento, idSubmissao)
 
 
 @roteador.get(
@@ -186,7 +190,7 @@ def obterRespostaFormulario(
     status_code=status.HTTP_200_OK,
     response_model=ResultadoAvaliacaoEvento,
 )
-def obterResultados(
+async def obterResultados(
     idEvento: str,
     usuario: Annotated[Usuario, Depends(getPetianoAdminAutenticado)],
 ):
@@ -197,4 +201,29 @@ def obterResultados(
     :param usuario: Usuario autenticado (petiano).
     :return resultado: Resultado consolidado da avaliacao.
     """
-    return AvaliacaoControlador.obterResultados(idEvento)
+    return await AvaliacaoControlador.obterResultados(idEvento)
+
+
+@roteador.get(
+    "/resultados/comentarios",
+    name="Listar comentarios da avaliacao",
+    description="Recupera, de forma paginada, os comentarios textuais enviados na avaliacao do evento.",
+    status_code=status.HTTP_200_OK,
+    response_model=ComentariosAvaliacaoEvento,
+)
+async def obterComentarios(
+    idEvento: str,
+    usuario: Annotated[Usuario, Depends(getPetianoAdminAutenticado)],
+    pagina: Annotated[int, Query(ge=1)] = 1,
+    tamanhoPagina: Annotated[int, Query(ge=1, le=200)] = TAMANHO_PAGINA_COMENTARIOS,
+):
+    """
+    Recupera uma pagina dos comentarios textuais da avaliacao de um evento.
+
+    :param idEvento: Identificador unico do evento.
+    :param usuario: Usuario autenticado (petiano).
+    :param pagina: Numero da pagina, a partir de 1.
+    :param tamanhoPagina: Quantidade maxima de comentarios por pagina.
+    :return comentarios: Pagina de comentarios.
+    """
+    return await AvaliacaoControlador.obterComentarios(idEvento, pagina, tamanhoPagina)
@@ -1,23 +1,28 @@
+import functools
 import logging
 import secrets
 from typing import BinaryIO
 from bson.objectid import ObjectId
 from fastapi import File, UploadFile
+from fastapi.concurrency import run_in_threadpool
 
 # Importações dos módulos internos
 from src.config import config
-from src.img.criaPastas import criaPastaEvento
-from src.img.operacoesImagem import (
-    armazenaArteEvento,
-    armazenaCrachaEvento,
-    deletaImagem,
-    validaImagem,
+from src.img.armazenamento import (
+    armazena,
+    libera,
+    processaImagemArmazenada,
+    substitui,
 )
-from src.modelos.bd import EventoBD, UsuarioBD, cliente
+from src.img.indiceImagens import TipoImagem
+from src.img.operacoesImagem import armazenaImagem, deletaPastaEvento
+from src.modelos.bd import AvisoBD, EventoBD, FilaEmailBD, UsuarioBD, cliente
+from src.modelos.email.aviso import Aviso, AvisoCriar, AvisoLer
 from src.modelos.evento.evento import Evento, Inscrito, TipoVaga
 from src.modelos.evento.eventoClad import (
     EventoAtualizarAdmin,
     EventoCriar,
+    EventoLer,
     InscritoAtualizar,
     InscritoCriar,
     InscritoLer,
@@ -45,8 +50,9 @@ from fastapi import BackgroundTasks, UploadFile
 from PIL import Image
 
 from src.config import config
-from src.email.operacoesEmail import enviarEmailConfirmacaoEvento
-from src.img.operacoesImagem import armazenaComprovante, deletaImagem, validaComprovante
+from src.email.modelosEmail import invalidaEventoEmail
+from src.email.operacoesEmail import distribuirAviso, enviarEmailConfirmacaoEvento
+from src.img.operacoesImagem import armazenaComprovante
 from src.modelos.usuario.usuario import Usuario
 
 
@@ -57,7 +63,7 @@ class EventoControlador:
     """
 
     @staticmethod
-    def getEventos(query: IntervaloBusca) -> list[Evento]:
+    async def getEventos(query: IntervaloBusca) -> list[Evento]:
         """
         Lista todos os eventos de acordo com os parâmetros de busca.
 
@@ -65,10 +71,10 @@ class EventoControlador:
 
         :return eventos: Lista de eventos que correspondem aos filtros aplicados.
         """
-        return EventoBD.listar(query)
+        return await EventoBD.listar(query)
 
     @staticmethod
-    def getEvento(id: str) -> Evento:
+    async def getEvento(id: str) -> Evento:
         """
         Recupera um evento específico pelo seu ID.
 
@@ -78,10 +84,34 @@ class EventoControlador:
 
         :raises NaoEncontradoExcecao: Lançada se o evento com o ID especificado não for encontrado.
         """
-        return EventoBD.buscar("_id", id)
+        return await EventoBD.buscar("_id", id)
 
     @staticmethod
-    def deletarEvento(id: str):
+    async def getEventosPublicos(query: IntervaloBusca | None) -> list[EventoLer]:
+        """
+        Lista os dados públicos dos eventos de acordo com os parâmetros de busca.
+
+        :param query: Objeto contendo os parâmetros de busca para filtrar eventos.
+
+        :return eventos: Dados públicos dos eventos que correspondem aos filtros aplicados.
+        """
+        return await EventoBD.listarPublico(query)
+
+    @staticmethod
+    async def getEventoPublico(id: str) -> EventoLer:
+        """
+        Recupera os dados públicos de um evento específico pelo seu ID.
+
+        :param id: Identificador único do evento.
+
+        :return evento: Dados públicos do evento encontrado.
+
+        :raises NaoEncontradoExcecao: Lançada se o evento com o ID especificado não for encontrado.
+        """
+        return await EventoBD.buscarPublico(id)
+
+    @staticmethod
+    async def deletarEvento(id: str):
         """
         Deleta um evento do banco de dados.
 
@@ -89,11 +119,16 @@ class EventoControlador:
 
         :raises NaoEncontradoExcecao: Lançada se o evento com o ID especificado não for encontrado.
         """
-        EventoControlador.getEvento(id)
-        EventoBD.deletar(id)
+        await EventoControlador.getEvento(id)
+        for imagem in await EventoBD.deletar(id):
+            await libera(imagem)
+        invalidaEventoEmail(id)
+
+        # pasta das imagens armazenadas antes do repositório de objetos
+        await run_in_threadpool(deletaPastaEvento, id)
 
     @staticmethod
-    def editarEvento(id: str, dadosEvento: EventoAtualizarAdmin) -> Evento:
+    async def editarEvento(id: str, dadosEvento: EventoAtualizarAdmin) -> Evento:
         """
         Edita um evento existente com base nos novos dados fornecidos.
 
@@ -106,7 +141,7 @@ class EventoControlador:
         :raises ErroNaAlteracaoExcecao: Lançada se o número de vagas especificado é inferior ao número de inscritos existentes.
         """
         # Obtém evento
-        eventoOld: Evento = EventoControlador.getEvento(id)
+        eventoOld: Evento = await EventoControlador.getEvento(id)
 
         qtdInscritosNote: int = (
             eventoOld.vagasComNote - eventoOld.vagasDisponiveisComNote
@@ -163,61 +198,84 @@ class EventoControlador:
 
         evento = Evento(**d)
 
-        EventoBD.atualizar(evento)
+        await EventoBD.atualizar(evento)
+        invalidaEventoEmail(id)
 
         return evento
 
     @staticmethod
-    def atualizarImagensEvento(
-        id: str, arte: UploadFile | None, cracha: UploadFile | None
+    async def atualizarImagensEvento(
+        id: str,
+        arte: UploadFile | None,
+        cracha: UploadFile | None,
+        tasks: BackgroundTasks,
     ):
         """
         Atualiza as imagens de arte e crachá associadas ao evento.
 
+        As variantes da arte (tamanhos reduzidos e WebP) são geradas em segundo plano.
+
         :param id: Identificador do evento.
         :param arte: Imagem opcional para a arte do evento.
         :param cracha: Imagem opcional para o crachá do evento.
+        :param tasks: Tarefas em segundo plano.
 
         :raises NaoEncontradoExcecao: Lançada se o evento com o ID especificado não for encontrado.
         :raises ImagemInvalidaExcecao: Lançada se a imagem fornecida for inválida.
         :raises ImagemNaoSalvaExcecao: Lançada se houver erro ao salvar a imagem.
+        :raises ErroNaAlteracaoExcecao: Lançada se a imagem foi alterada repetidamente
+            por outras requisições durante a troca.
         """
-        # obtém evento
-        evento: Evento = EventoControlador.getEvento(id)
+        # valida a existência do evento
+        await EventoControlador.getEvento(id)
 
         if arte:
-            if not validaImagem(arte.file):
-                raise ImagemInvalidaExcecao()
-
-            deletaImagem(evento.id, ["eventos", evento.id, "arte"])
-
-            caminhoArte = armazenaArteEvento(evento.id, arte.file)
+            # a imagem é validada pelo cabeçalho e gravada como enviada
+            caminhoArte = await armazena(armazenaImagem, await arte.read())
 
             if not caminhoArte:
-                raise ImagemNaoSalvaExcecao()
+                raise ImagemInvalidaExcecao()
 
-            evento.arte = str(caminhoArte)
+            # a arte anterior só é liberada se for de fato substituída
+            await EventoControlador._substituiImagem(
+                id, TipoImagem.ARTE_EVENTO, caminhoArte
+            )
 
-            # atualiza no bd
-            EventoBD.atualizar(evento)
+            tasks.add_task(
+                processaImagemArmazenada,
+                caminhoArte,
+                functools.partial(EventoBD.trocarImagem, id, TipoImagem.ARTE_EVENTO),
+            )
 
         if cracha:
-            if not validaImagem(cracha.file):
+            caminhoCracha = await armazena(armazenaImagem, await cracha.read())
+
+            if not caminhoCracha:
                 raise ImagemInvalidaExcecao()
 
-            deletaImagem(evento.id, ["eventos", evento.id, "cracha"])
-            caminhoCracha = armazenaCrachaEvento(evento.id, cracha.file)
+            await EventoControlador._substituiImagem(
+                id, TipoImagem.CRACHA_EVENTO, caminhoCracha
+            )
 
-            if not caminhoCracha:
-                raise ImagemNaoSalvaExcecao()
+    @staticmethod
+    async def _substituiImagem(id: str, tipo: TipoImagem, caminho: str) -> None:
+        """
+        Troca a arte ou o crachá de um evento pela imagem recém-armazenada, liberando a
+        anterior (ver `substitui`).
+
+        :raises ErroNaAlteracaoExcecao: Se a imagem foi alterada repetidamente por
+            outras requisições durante a troca.
+        """
 
-            evento.cracha = str(caminhoCracha)
+        async def imagemAtual() -> str | None:
+            return (await EventoBD.buscarImagens(id))[tipo]
 
-            # atualiza no bd
-            EventoBD.atualizar(evento)
+        troca = functools.partial(EventoBD.trocarImagem, id, tipo)
+        if not await substitui(caminho, imagemAtual, troca):
+            raise ErroNaAlteracaoExcecao()
 
     @staticmethod
-    def cadastrarEvento(dadosEvento: EventoCriar):
+    async def cadastrarEvento(dadosEvento: EventoCriar):
         """
         Cadastra um novo evento e cria a estrutura de diretórios associada.
 
@@ -243,20 +301,16 @@ class EventoControlador:
             fimEvento=dadosEvento.dias[-1][1],
         )
 
-        EventoBD.criar(evento)
-
-        # cria pastas evento
-        criaPastaEvento(evento.id)
+        await EventoBD.criar(evento)
 
         return evento
 
     @staticmethod
-    def cadastrarInscrito(
+    async def cadastrarInscrito(
         idEvento: str,
         idUsuario: str,
         dadosInscrito: InscritoCriar,
         comprovante: UploadFile | None,
-        tasks: BackgroundTasks,
     ):
         """
         Cadastra um inscrito em um evento.
@@ -265,7 +319,6 @@ class EventoControlador:
         :param idUsuario: identificador único do usuário que será inscrito.
         :param dadosInscrito: informações do inscrito a ser cadastrado.
         :param comprovante: comprovante de pagamento, no caso do evento ser pago.
-        :param tasks: gerenciador de tarefas.
         
         :raises ForaDoPeriodoDeInscricaoExcecao: Caso não esteja no período de inscrição.
         :raises SemVagasDisponiveisExcecao: Se não houver vagas disponíveis.
@@ -274,10 +327,10 @@ class EventoControlador:
         :raises ErroInternoExcecao: Se houver problema no Banco de Dados.
         """
         # Recupera o evento
-        evento: Evento = EventoControlador.getEvento(idEvento)
+        evento: Evento = await EventoControlador.getEvento(idEvento)
 
         # Valida a duplicidade antes de substituir ou armazenar o comprovante.
-        if EventoBD.verificarInscricaoExistente(idEvento, idUsuario):
+        if await EventoBD.verificarInscricaoExistente(idEvento, idUsuario):
             raise JaExisteExcecao(message="Usuário já está inscrito neste evento.")
 
         # Verifica se está no período de inscrição
@@ -297,13 +350,12 @@ class EventoControlador:
         
         if evento.valor != 0:
             if comprovante:
-                if not validaComprovante(comprovante.file):
-                    raise ComprovanteInvalido(message="Comprovante inválido.")
-
-                deletaImagem(idUsuario, ["eventos", evento.id, "comprovantes"])
-                caminhoComprovante = armazenaComprovante(
-                    evento.id, idUsuario, comprovante.file
+                # A validação e a conversão de PDFs são executadas no pool de processos
+                caminhoComprovante = await armazena(
+                    armazenaComprovante, await comprovante.read(), processoSeparado=True
                 )
+                if not caminhoComprovante:
+                    raise ComprovanteInvalido(message="Comprovante inválido.")
             else:
                 raise ComprovanteObrigatorioExcecao(
                     message="Comprovante obrigatório para eventos pagos."
@@ -332,22 +384,22 @@ class EventoControlador:
             evento.vagasDisponiveisSemNote -= 1
 
         # Recupera o usuário
-        usuario: Usuario = UsuarioBD.buscar("_id", idUsuario)
+        usuario: Usuario = await UsuarioBD.buscarPorId(idUsuario)
 
         # Adiciona o evento na lista de eventos inscritos do usuário
         usuario.eventosInscrito.append(idEvento)
 
         # Realiza as operações no BD usando uma transação
-        session = cliente.start_session()
+        session = await cliente.start_session()
         try:
             session.start_transaction()
 
-            EventoBD.criarInscrito(idEvento, inscrito)
-            UsuarioBD.atualizar(usuario)
+            await EventoBD.criarInscrito(idEvento, inscrito)
+            await UsuarioBD.atualizar(usuario)
 
             # Commita a transação se der tudo certo
-            session.commit_transaction()
-            session.end_session()
+            await session.commit_transaction()
+            await session.end_session()
 
         # Aborta a transação caso ocorra algum erro
         except Exception as e:
@@ -355,23 +407,19 @@ class EventoControlador:
                 f"Erro ao inscrever usuário em {evento.titulo}. Erro: {str(e)}"
             )
 
-            session.abort_transaction()
-            session.end_session()
+            await session.abort_transaction()
+            await session.end_session()
+
+            # o comprovante armazenado não será referenciado por nenhuma inscrição
+            await libera(caminhoComprovante)
             raise ErroInternoExcecao(message="Erro ao criar inscrito (Banco de Dados).")
 
         # Envia email de confirmação de inscrição
-        """
-        tasks.add_task(
-            enviarEmailConfirmacaoEvento,
-            usuario.email,
-            evento.id,
-            dadosInscrito.tipoVaga,
-        )
-        """
+        await enviarEmailConfirmacaoEvento(usuario.email, evento.id, dadosInscrito.tipoVaga)
 
     # Métodos adicionados do InscritosControlador
     @staticmethod
-    def getInscritos(idEvento: str) -> list[InscritoLer]:
+    async def getInscritos(idEvento: str) -> list[InscritoLer]:
         """
         Recupera os inscritos de um evento.
 
@@ -379,11 +427,21 @@ class EventoControlador:
 
         :return: Lista de inscritos do evento.
         """
-        inscritos = EventoBD.listarInscritosEvento(idEvento)
+        inscritos = await EventoBD.listarInscritosEvento(idEvento)
+        usuarios = await UsuarioBD.buscarVarios(
+            [inscrito.idUsuario for inscrito in inscritos],
+            ["nome", "cpf", "email", "curso"],
+        )
         resultado = []
 
         for inscrito in inscritos:
-            usuario = UsuarioBD.buscar("_id", inscrito.idUsuario)
+            usuario = usuarios.get(inscrito.idUsuario)
+            if usuario is None:
+                logging.warning(
+                    f"Inscrito {inscrito.idUsuario} do evento {idEvento} não possui usuário."
+                )
+                continue
+
             comprovante = (
                 f"{config.CAMINHO_BASE}/img/eventos/{idEvento}/inscritos/"
                 f"{inscrito.idUsuario}/comprovante"
@@ -395,17 +453,17 @@ class EventoControlador:
                 InscritoLer(
                     **inscrito.model_dump(exclude={"comprovante"}),
                     comprovante=comprovante,
-                    nome=usuario.nome,
-                    cpf=usuario.cpf,
-                    email=str(usuario.email),
-                    curso=usuario.curso,
+                    nome=usuario["nome"],
+                    cpf=usuario["cpf"],
+                    email=usuario["email"],
+                    curso=usuario.get("curso"),
                 )
             )
 
         return resultado
 
     @staticmethod
-    def getInscrito(idEvento: str, idUsuario: str) -> Inscrito:
+    async def getInscrito(idEvento: str, idUsuario: str) -> Inscrito:
         """
         Recupera um inscrito em um evento.
 
@@ -414,25 +472,19 @@ class EventoControlador:
 
         :return: Inscrição do inscrito no evento.
         """
-        return EventoBD.buscarInscrito(idEvento, idUsuario)
+        return await EventoBD.buscarInscrito(idEvento, idUsuario)
 
     @staticmethod
-    def verificarInscricao(
+    async def verificarInscricao(
         idEvento: str, idUsuario: str, estadoDeVerificacao: bool
     ) -> None:
         """Registra a aceitação ou rejeição do comprovante de uma inscrição."""
-        evento = EventoControlador.getEvento(idEvento)
-
-        for inscrito in evento.inscritos:
-            if inscrito.idUsuario == idUsuario:
-                inscrito.estadoDeVerificacao = estadoDeVerificacao
-                EventoBD.atualizar(evento)
-                return
-
-        raise NaoEncontradoExcecao(message="O inscrito não foi encontrado.")
+        await EventoBD.atualizarVerificacaoInscrito(
+            idEvento, idUsuario, estadoDeVerificacao
+        )
 
     @staticmethod
-    def editarInscrito(
+    async def editarInscrito(
         idEvento: str, idUsuario: str, inscritoAtualizar: InscritoAtualizar
     ):
         """
@@ -445,8 +497,8 @@ class EventoControlador:
         :raises SemVagasDisponiveisExcecao: Se não houver vaga disponível no novo tipo.
         """
         # Recupera o evento e o inscrito
-        evento = EventoControlador.getEvento(idEvento)
-        inscrito = EventoBD.buscarInscrito(idEvento, idUsuario)
+        evento = await EventoControlador.getEvento(idEvento)
+        inscrito = await EventoBD.buscarInscrito(idEvento, idUsuario)
 
         # Atualiza o tipo de vaga se necessário
         if (
@@ -466,19 +518,16 @@ class EventoControlador:
                 evento.vagasDisponiveisComNote += 1
             inscrito.tipoVaga = inscritoAtualizar.tipoVaga
 
-        # Atualiza o inscrito na lista de inscritos do evento
-        for idx, inscrito_item in enumerate(evento.inscritos):
-            if inscrito_item.idUsuario == idUsuario:
-                evento.inscritos[idx] = inscrito
-                break
+            # Atualiza as vagas disponíveis do evento
+            await EventoBD.atualizar(evento)
 
-        # Atualiza o evento no banco de dados
-        EventoBD.atualizar(evento)
+        # Atualiza a inscrição no banco de dados
+        await EventoBD.atualizarInscrito(idEvento, inscrito)
 
         return inscrito
 
     @staticmethod
-    def removerInscrito(idEvento: str, idUsuario: str):
+    async def removerInscrito(idEvento: str, idUsuario: str):
         """
         Remove um inscrito de um evento.
 
@@ -488,13 +537,67 @@ class EventoControlador:
         :raises NaoEncontradoExcecao: Se o inscrito não for encontrado no evento.
         """
         # Recupera o evento (valida a existência)
-        EventoControlador.getEvento(idEvento)
+        await EventoControlador.getEvento(idEvento)
 
         # Remove o inscrito de forma atômica (ajusta também as vagas disponíveis)
-        EventoBD.deletarInscrito(idEvento, idUsuario)
+        inscrito = await EventoBD.deletarInscrito(idEvento, idUsuario)
+        await libera(inscrito.get("comprovante"))
 
         # Atualiza a lista de eventos inscritos do usuário
-        usuario = UsuarioBD.buscar("_id", idUsuario)
+        usuario = await UsuarioBD.buscarPorId(idUsuario)
         if idEvento in usuario.eventosInscrito:
             usuario.eventosInscrito.remove(idEvento)
-            UsuarioBD.atualizar(usuario)
+            await UsuarioBD.atualizar(usuario)
+
+    @staticmethod
+    async def enviarAviso(
+        idEvento: str, dadosAviso: AvisoCriar, autor: Usuario, tasks: BackgroundTasks
+    ) -> AvisoLer:
+        """
+        Envia um aviso por e-mail a todos os inscritos de um evento.
+
+        O aviso é registrado e os e-mails são colocados na fila de envio em segundo
+        plano (ver `distribuirAviso`), então a resposta não depende da quantidade de
+        inscritos. Caso a distribuição seja interrompida, ela é retomada pela rotina de
+        avisos interrompidos. O envio é feito pelo entregador da fila, respeitando o
+        limite de e-mails por minuto; o andamento pode ser consultado por `getAviso`.
+
+        :param idEvento: Identificador único do evento.
+        :param dadosAviso: Assunto e texto do aviso.
+        :param autor: Usuário que envia o aviso.
+        :param tasks: Tarefas em segundo plano (distribuição do aviso).
+
+        :return: Aviso registrado, com o andamento do envio.
+        :raises NaoEncontradoExcecao: Se o evento não for encontrado.
+        """
+        # valida a existência do evento
+        await EventoBD.buscarDadosEmail(idEvento)
+
+        aviso = Aviso(
+            _id=secrets.token_hex(16),
+            idEvento=idEvento,
+            autor=autor.id,
+            assunto=dadosAviso.assunto,
+            texto=dadosAviso.texto,
+            criacao=datetime.now(),
+        )
+        await AvisoBD.criar(aviso)
+        tasks.add_task(distribuirAviso, aviso)
+
+        logging.info(f"Aviso {aviso.id} do evento {idEvento} enviado por {autor.id}")
+        return AvisoLer(**aviso.model_dump(by_alias=True), progresso={})
+
+    @staticmethod
+    async def getAviso(idEvento: str, idAviso: str) -> AvisoLer:
+        """
+        Recupera um aviso de um evento e o andamento do envio dos seus e-mails.
+
+        :param idEvento: Identificador único do evento.
+        :param idAviso: Identificador único do aviso.
+
+        :return: Aviso, com a quantidade de e-mails em cada estado da fila.
+        :raises NaoEncontradoExcecao: Se o aviso não for encontrado.
+        """
+        aviso = await AvisoBD.buscar(idEvento, idAviso)
+        progresso = await FilaEmailBD.contarPorEstado(aviso=idAviso)
+        return AvisoLer(**aviso.model_dump(by_alias=True), progresso=progresso)
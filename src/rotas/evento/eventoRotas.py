@@ -2,11 +2,13 @@ from typing import Annotated
 from typing import Optional
 
 from fastapi import APIRouter, Depends, UploadFile, status, BackgroundTasks, Form, File
+from src.modelos.email.aviso import AvisoCriar, AvisoLer
 from src.modelos.evento.evento import NivelConhecimento, TipoVaga
 from src.modelos.evento.evento import Evento
 from src.modelos.evento.eventoClad import (
     EventoAtualizarAdmin,
     EventoCriar,
+    EventoLer,
     InscritoAtualizar,
     InscritoCriar,
     InscritoLer,
@@ -30,15 +32,15 @@ roteador = APIRouter(prefix="/eventos", tags=["Eventos"])
     name="Recuperar eventos",
     description="Retorna todos os eventos cadastrados no banco de dados filtrados pelo parâmetro 'query'.",
 )
-def getEventos(query: Optional[IntervaloBusca] = None) -> list[Evento]:
+async def getEventos(query: Optional[IntervaloBusca] = None) -> list[EventoLer]:
     """
     Retorna todos os eventos cadastrados no banco de dados, aplicando filtros conforme o parâmetro 'query'.
 
     :param query (IntervaloBusca): Parâmetro de filtro para busca dos eventos.
 
-    :return list[Evento]: Lista de objetos Evento que correspondem aos filtros especificados.
+    :return list[EventoLer]: Dados públicos dos eventos que correspondem aos filtros especificados.
     """
-    return EventoControlador.getEventos(query)
+    return await EventoControlador.getEventosPublicos(query)
 
 
 @roteador.get(
@@ -49,18 +51,17 @@ def getEventos(query: Optional[IntervaloBusca] = None) -> list[Evento]:
         Falha, caso o evento não exista.
     """,
 )
-def getEvento(id: str) -> Evento:
+async def getEvento(id: str) -> EventoLer:
     """
     Recupera um evento específico pelo ID.
 
     :param id (str): O identificador único do evento a ser recuperado.
 
-    :return Evento: Objeto do tipo Evento correspondente ao ID fornecido.
+    :return EventoLer: Dados públicos do evento correspondente ao ID fornecido.
 
     :raises HTTPException: Lançada se o evento com o ID especificado não for encontrado.
     """
-    evento: Evento = EventoControlador.getEvento(id)
-    return evento.model_dump(by_alias=True)  # type: ignore
+    return await EventoControlador.getEventoPublico(id)
 
 
 @roteador.post(
@@ -69,7 +70,7 @@ def getEvento(id: str) -> Evento:
     description="Cadastra um novo evento.",
     status_code=status.HTTP_201_CREATED,
 )
-def cadastrarEvento(
+async def cadastrarEvento(
     evento: EventoCriar, usuario: Annotated[Usuario, Depends(getPetianoAdminAutenticado)]
 ) -> Evento:
     """
@@ -80,7 +81,7 @@ def cadastrarEvento(
                     Apenas um petiano ou o administrador podem criar um evento.
     """
     # Despacha para o controlador
-    return EventoControlador.cadastrarEvento(evento)
+    return await EventoControlador.cadastrarEvento(evento)
 
 
 @roteador.patch(
@@ -88,7 +89,7 @@ def cadastrarEvento(
     name="Editar evento",
     description="Edita um evento.",
 )
-def editarEvento(
+async def editarEvento(
     id: str,
     evento: EventoAtualizarAdmin,
     usuario: Annotated[Usuario, Depends(getPetianoAdminAutenticado)],
@@ -102,7 +103,7 @@ def editarEvento(
                     Apenas um petiano ou o administrador podem editar um evento.
     """
     # Despacha para o controlador
-    return EventoControlador.editarEvento(id, evento)
+    return await EventoControlador.editarEvento(id, evento)
 
 
 # TODO tem que ser opcional
@@ -111,9 +112,10 @@ def editarEvento(
     name="Atualizar imagens do evento",
     description="Atualiza as imagens do evento.",
 )
-def atualizarImagensEvento(
+async def atualizarImagensEvento(
     id: str,
     usuario: Annotated[Usuario, Depends(getPetianoAdminAutenticado)],
+    tasks: BackgroundTasks,
     arte: UploadFile | None = None,
     cracha: UploadFile | None = None,
 ):
@@ -125,9 +127,10 @@ def atualizarImagensEvento(
                     Apenas um petiano ou o administrador podem atualizar as imagens de um evento.
     :param arte: Arquivo opcional de imagem para arte.
     :param cracha: Arquivo opcional de imagem para crachá.
+    :param tasks: Tarefas em segundo plano (geração das variantes da arte).
     """
     # Despacha para o controlador
-    EventoControlador.atualizarImagensEvento(id, arte, cracha)
+    await EventoControlador.atualizarImagensEvento(id, arte, cracha, tasks)
 
 
 @roteador.delete(
@@ -135,7 +138,7 @@ def atualizarImagensEvento(
     name="Deletar evento",
     description="Deleta um evento.",
 )
-def deletarEvento(
+async def deletarEvento(
     id: str,
     usuario: Annotated[Usuario, Depends(getPetianoAdminAutenticado)],
 ):
@@ -147,7 +150,7 @@ def deletarEvento(
                     Apenas um petiano ou o administrador podem deletar um evento.
     """
     # Despacha para o controlador
-    EventoControlador.deletarEvento(id)
+    await EventoControlador.deletarEvento(id)
 
 
 ##########################################################INSCRITOS
@@ -160,8 +163,7 @@ def deletarEvento(
     "- nivelConhecimento 1-5",
     status_code=status.HTTP_201_CREATED,
 )
-def cadastrarInscrito(
-    tasks: BackgroundTasks,
+async def cadastrarInscrito(
     usuario: Annotated[Usuario, Depends(getUsuarioAutenticado)],
     idEvento: str,
     tipoVaga: TipoVaga = Form(...),
@@ -173,9 +175,7 @@ def cadastrarInscrito(
         nivelConhecimento=nivelConhecimento,
     )
 
-    EventoControlador.cadastrarInscrito(
-        idEvento, usuario.id, inscrito, comprovante, tasks
-    )
+    await EventoControlador.cadastrarInscrito(idEvento, usuario.id, inscrito, comprovante)
 
 
 @roteador.get(
@@ -184,7 +184,7 @@ def cadastrarInscrito(
     description="Recupera os inscritos de um evento.",
     response_model=list[InscritoLer],
 )
-def getInscritos(
+async def getInscritos(
     idEvento: str, usuario: Annotated[Usuario, Depends(getPetianoAdminAutenticado)]
 ):
     """
@@ -194,7 +194,7 @@ def getInscritos(
     :param usuario: Usuário autenticado como petiano ou administrador.
     """
     # Despacha para o controlador
-    return EventoControlador.getInscritos(idEvento)
+    return await EventoControlador.getInscritos(idEvento)
 
 
 @roteador.patch(
@@ -202,13 +202,13 @@ def getInscritos(
     name="Verificar comprovante de inscrição",
     description="Aceita ou rejeita o comprovante enviado por um inscrito.",
 )
-def verificarInscricao(
+async def verificarInscricao(
     idEvento: str,
     idInscrito: str,
     verificacao: VerificacaoInscricao,
     usuario: Annotated[Usuario, Depends(getPetianoAdminAutenticado)],
 ):
-    EventoControlador.verificarInscricao(
+    await EventoControlador.verificarInscricao(
         idEvento, idInscrito, verificacao.estadoDeVerificacao
     )
 
@@ -218,7 +218,7 @@ def verificarInscricao(
     name="Editar inscrito",
     description="Edita um inscrito.",
 )
-def editarInscrito(
+async def editarInscrito(
     idEvento: str,
     idInscrito: str,
     inscrito: InscritoAtualizar,
@@ -234,7 +234,7 @@ def editarInscrito(
     """
     if usuario.id != idInscrito and not temPermissaoPetianoAdmin(usuario):
         raise NaoAutorizadoExcecao()
-    return EventoControlador.editarInscrito(idEvento, idInscrito, inscrito)
+    return await EventoControlador.editarInscrito(idEvento, idInscrito, inscrito)
 
 
 @roteador.delete(
@@ -242,7 +242,7 @@ def editarInscrito(
     name="Remover inscrito",
     description="Remove um inscrito.",
 )
-def removerInscrito(
+async def removerInscrito(
     idEvento: str,
     idInscrito: str,
     usuario: Annotated[Usuario, Depends(getUsuarioAutenticado)],
@@ -258,4 +258,59 @@ def removerInscrito(
     """
     if usuario.id != idInscrito and not temPermissaoPetianoAdmin(usuario):
         raise NaoAutorizadoExcecao()
-    return EventoControlador.removerInscrito(idEvento, idInscrito)
+    return await EventoControlador.removerInscrito(idEvento, idInscrito)
+
+
+##########################################################AVISOS
+@roteador.post(
+    "/{idEvento}/avisos",
+    name="Enviar aviso aos inscritos",
+    description="""
+        Envia um e-mail a todos os inscritos do evento. O assunto e o texto podem conter
+        `$nome` e `$evento`, substituídos pelo nome do inscrito e pelo título do evento.
+
+        O aviso é registrado e a resposta é retornada imediatamente; os e-mails são
+        colocados na fila de envio e enviados em segundo plano, respeitando o limite de
+        e-mails por minuto. O andamento pode ser consultado em
+        `GET /eventos/{idEvento}/avisos/{idAviso}`.
+    """,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def enviarAviso(
+    idEvento: str,
+    aviso: AvisoCriar,
+    usuario: Annotated[Usuario, Depends(getPetianoAdminAutenticado)],
+    tasks: BackgroundTasks,
+) -> AvisoLer:
+    """
+    Envia um aviso por e-mail aos inscritos de um evento.
+
+    :param idEvento: Identificador único do evento.
+    :param aviso: Assunto e texto do aviso.
+    :param usuario: Usuário autenticado como petiano ou administrador.
+    :param tasks: Tarefas em segundo plano (distribuição do aviso).
+
+    :return AvisoLer: Aviso registrado; os destinatários são contados durante a
+        distribuição.
+    """
+    return await EventoControlador.enviarAviso(idEvento, aviso, usuario, tasks)
+
+
+@roteador.get(
+    "/{idEvento}/avisos/{idAviso}",
+    name="Recuperar andamento de aviso",
+    description="Retorna um aviso e a quantidade de e-mails dele em cada estado da fila de envio.",
+)
+async def getAviso(
+    idEvento: str,
+    idAviso: str,
+    usuario: Annotated[Usuario, Depends(getPetianoAdminAutenticado)],
+) -> AvisoLer:
+    """
+    Recupera o andamento do envio de um aviso.
+
+    :param idEvento: Identificador único do evento.
+    :param idAviso: Identificador único do aviso.
+    :param usuario: Usuário autenticado como petiano ou administrador.
+    """
+    return await EventoControlador.getAviso(idEvento, idAviso)
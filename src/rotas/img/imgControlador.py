@@ -1,40 +1,282 @@
-from pathlib import Path
+import hashlib
+import mimetypes
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path, PurePosixPath
+from typing import Awaitable, Callable, TypeVar
+from urllib.parse import quote
 
-from fastapi.responses import FileResponse
+from fastapi import Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
 
+from src.config import config
+from src.img.indiceImagens import TipoImagem, obtemImagem, registraImagem
+from src.img.operacoesImagem import TamanhoImagem, caminhoVariante, idObjeto, versaoImagem
+from src.img.repositorio import obtemRepositorio
+from src.modelos.bd import EventoBD
 from src.modelos.excecao import NaoEncontradoExcecao
 from src.rotas.evento.eventoControlador import EventoControlador
 from src.rotas.usuario.usuarioControlador import UsuarioControlador
 
+CACHE_IMUTAVEL = "public, max-age=31536000, immutable"
+"""Cache de URLs versionadas (`?v=`), cujo conteúdo nunca muda."""
 
-def getFileResponse(caminho: str | None):
-    if caminho and caminho != "" and Path(caminho).exists():
-        return FileResponse(caminho)
+CACHE_REVALIDAR = "public, no-cache"
+"""Cache de URLs sem versão: podem ser armazenadas, mas devem ser revalidadas (304)."""
 
-    raise NaoEncontradoExcecao(message="A imagem não foi encontrada")
+CACHE_PRIVADO = "private, no-cache"
+"""Cache de arquivos privados, como comprovantes: apenas no navegador, revalidando."""
 
+R = TypeVar("R")
 
-class ImagemControlador:
-    @staticmethod
-    def getImagemUsuario(id: str):
-        usuario = UsuarioControlador.getUsuario(id)
 
-        return getFileResponse(usuario.foto)
+async def _noRepositorio(funcao: Callable[..., R], *args) -> R:
+    """
+    Executa uma operação do repositório de arquivos. No repositório local, a operação é
+    uma chamada de sistema rápida e é executada diretamente; nos demais, é uma requisição
+    de rede e é executada em uma thread, para não bloquear o event loop.
+    """
+    if obtemRepositorio().local:
+        return funcao(*args)
+    return await run_in_threadpool(funcao, *args)
 
-    @staticmethod
-    def getImagemEvento(id: str):
-        evento = EventoControlador.getEvento(id)
 
-        return getFileResponse(evento.arte)
+def _naoModificado(request: Request, etag: str, modificacao: float) -> bool:
+    """
+    Retorna se a requisição condicional pode ser respondida com 304, comparando os
+    cabeçalhos If-None-Match (prioritário) e If-Modified-Since com os validadores do arquivo.
+    """
+    ifNoneMatch = request.headers.get("if-none-match")
+    if ifNoneMatch is not None:
+        etags = [e.strip().removeprefix("W/") for e in ifNoneMatch.split(",")]
+        return "*" in etags or etag in etags
+
+    ifModifiedSince = request.headers.get("if-modified-since")
+    if ifModifiedSince:
+        try:
+            return int(modificacao) <= parsedate_to_datetime(ifModifiedSince).timestamp()
+        except (TypeError, ValueError):
+            return False
+
+    return False
+
+
+def _respostaArquivoLocal(caminho: Path, cabecalhos: dict[str, str]) -> Response:
+    """
+    Retorna a resposta com um arquivo do disco local. Conforme `config.ENVIO_ARQUIVOS`,
+    o arquivo é enviado pela própria API ou apenas indicado ao servidor web por um
+    cabeçalho, para que ele o envie sem ocupar um worker da API durante a transferência.
+    """
+    tipo = mimetypes.guess_type(caminho.name)[0] or "application/octet-stream"
+
+    if config.ENVIO_ARQUIVOS == "x-sendfile":
+        return Response(
+            media_type=tipo, headers={**cabecalhos, "X-Sendfile": str(caminho.resolve())}
+        )
+
+    if config.ENVIO_ARQUIVOS == "x-accel-redirect":
+        try:
+            relativo = caminho.resolve().relative_to(config.CAMINHO_IMAGEM.resolve())
+        except ValueError:
+            # arquivo fora da location interna do nginx: enviado pela API
+            relativo = None
+        if relativo is not None:
+            uri = config.PREFIXO_ACCEL_REDIRECT + quote(relativo.as_posix())
+            return Response(media_type=tipo, headers={**cabecalhos, "X-Accel-Redirect": uri})
+
+    return FileResponse(caminho, headers=cabecalhos)
+
+
+async def getFileResponse(
+    caminho: str | None,
+    request: Request | None = None,
+    cacheControl: str = CACHE_REVALIDAR,
+) -> Response:
+    """
+    Retorna a resposta com o arquivo em `caminho`, com os validadores ETag e
+    Last-Modified. Caso a requisição seja condicional e o arquivo não tenha mudado,
+    retorna 304 sem ler o arquivo.
+
+    Arquivos do disco local podem ser enviados pelo servidor web (ver
+    `config.ENVIO_ARQUIVOS`). Arquivos fora dele (armazenamento S3) são servidos por
+    redirecionamento a uma URL assinada, caso `config.S3_URL_ASSINADA`, ou lidos do
+    repositório em blocos.
+
+    :param caminho: Chave do arquivo no repositório.
+    :param request: Requisição, usada para avaliar os cabeçalhos condicionais.
+    :param cacheControl: Valor do cabeçalho Cache-Control.
+    :return resposta: Resposta com o arquivo, redirecionamento ou 304.
+    :raises NaoEncontradoExcecao: Se o arquivo não existir.
+    """
+    repositorio = obtemRepositorio()
+    info = await _noRepositorio(repositorio.info, caminho) if caminho else None
+
+    if caminho is None or info is None:
+        raise NaoEncontradoExcecao(message="A imagem não foi encontrada")
+
+    nome = PurePosixPath(caminho).name
+    if idObjeto(caminho) is not None:
+        # arquivos do repositório de objetos são nomeados pelo hash do conteúdo
+        etag = f'"{nome}"'
+    else:
+        # O nome do arquivo entra no ETag pois, pela negociação de formato e tamanho, uma
+        # mesma URL pode servir arquivos diferentes
+        base = f"{nome}-{info.tamanho}-{info.etag or info.modificacao}"
+        etag = f'"{hashlib.md5(base.encode(), usedforsecurity=False).hexdigest()}"'
+    cabecalhos = {
+        "ETag": etag,
+        "Last-Modified": formatdate(info.modificacao, usegmt=True),
+        "Cache-Control": cacheControl,
+    }
+
+    if request is not None and _naoModificado(request, etag, info.modificacao):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cabecalhos)
+
+    caminhoLocal = repositorio.caminhoLocal(caminho)
+    if caminhoLocal is not None:
+        return _respostaArquivoLocal(caminhoLocal, cabecalhos)
+
+    if config.S3_URL_ASSINADA:
+        url = await run_in_threadpool(
+            repositorio.urlAssinada, caminho, config.VALIDADE_URL_ASSINADA
+        )
+        if url is not None:
+            # o redirecionamento pode ser reaproveitado enquanto a URL for válida, o que
+            # também permite ao navegador reaproveitar a resposta do repositório
+            cache = "private, no-cache"
+            if cacheControl == CACHE_IMUTAVEL:
+                cache = f"private, max-age={config.VALIDADE_URL_ASSINADA // 2}"
+            return RedirectResponse(
+                url, status.HTTP_307_TEMPORARY_REDIRECT, headers={"Cache-Control": cache}
+            )
+
+    cabecalhos["Content-Length"] = str(info.tamanho)
+    return StreamingResponse(
+        repositorio.blocos(caminho),
+        media_type=mimetypes.guess_type(nome)[0] or "application/octet-stream",
+        headers=cabecalhos,
+    )
+
 
+async def getVarianteResponse(
+    caminho: str | None, tamanho: TamanhoImagem, versao: str | None, request: Request
+) -> Response:
+    """
+    Retorna a variante mais adequada de uma imagem: em WebP, caso o cliente aceite, e no
+    tamanho pedido. Caso a variante ainda não tenha sido gerada (ou a imagem seja anterior
+    às variantes), retorna a imagem original.
+
+    Se a URL informar a versão atual da imagem (`?v=`) e o arquivo retornado estiver no
+    tamanho pedido, a resposta pode ser armazenada em cache indefinidamente; caso
+    contrário (ex: a variante ainda está sendo gerada), deve ser revalidada.
+
+    :param caminho: Chave da imagem original.
+    :param tamanho: Tamanho pedido.
+    :param versao: Versão da imagem informada na URL, se houver.
+    :param request: Requisição.
+    :return resposta: Resposta com o arquivo da imagem, ou 304.
+    :raises NaoEncontradoExcecao: Se a imagem original não existir.
+    """
+    cacheControl = CACHE_REVALIDAR
+
+    if caminho:
+        versaoAtual = versao is not None and versao == versaoImagem(caminho)
+        # a original só é a resposta definitiva se foi ela a pedida
+        noTamanhoPedido = tamanho == TamanhoImagem.ORIGINAL
+
+        candidatos: list[str] = []
+        if "image/webp" in request.headers.get("accept", ""):
+            candidatos.append(caminhoVariante(caminho, tamanho, "webp"))
+        if tamanho != TamanhoImagem.ORIGINAL:
+            candidatos.append(caminhoVariante(caminho, tamanho))
+
+        repositorio = obtemRepositorio()
+        for candidato in candidatos:
+            if await _noRepositorio(repositorio.existe, candidato):
+                caminho = candidato
+                noTamanhoPedido = True
+                break
+
+        if versaoAtual and noTamanhoPedido:
+            cacheControl = CACHE_IMUTAVEL
+
+    resposta = await getFileResponse(caminho, request, cacheControl)
+    # a resposta varia conforme o cabeçalho Accept, o que deve ser considerado por caches
+    resposta.headers["Vary"] = "Accept"
+    return resposta
+
+
+async def _caminhoImagem(tipo: TipoImagem, id: str, usarIndice: bool = True) -> str | None:
+    """
+    Retorna o caminho de uma imagem de usuário ou evento pelo índice de imagens,
+    consultando o banco de dados apenas se ela não estiver indexada ou se `usarIndice`
+    for falso.
+    """
+    if usarIndice:
+        caminho = obtemImagem(tipo, id)
+        if caminho is not None:
+            return caminho or None
+
+    if tipo == TipoImagem.FOTO_USUARIO:
+        usuario = await UsuarioControlador.getPerfilUsuario(id)
+        registraImagem(tipo, id, usuario.foto)
+        return usuario.foto
+
+    return (await EventoBD.buscarImagens(id))[tipo]
+
+
+async def _respostaImagem(
+    tipo: TipoImagem, id: str, responde: Callable[[str | None], Awaitable[Response]]
+) -> Response:
+    """
+    Retorna a resposta de `responde` com o caminho de uma imagem obtido do índice. Caso
+    o arquivo indexado não exista mais (a imagem foi trocada por outro processo), busca o
+    caminho atual no banco de dados e tenta novamente.
+    """
+    caminho = await _caminhoImagem(tipo, id)
+    try:
+        return await responde(caminho)
+    except NaoEncontradoExcecao:
+        if caminho is None:
+            raise
+        atual = await _caminhoImagem(tipo, id, usarIndice=False)
+        if atual == caminho:
+            raise
+
+    return await responde(atual)
+
+
+class ImagemControlador:
     @staticmethod
-    def getCrachaEvento(id: str):
-        evento = EventoControlador.getEvento(id)
+    async def getImagemUsuario(
+        id: str, tamanho: TamanhoImagem, versao: str | None, request: Request
+    ):
+        return await _respostaImagem(
+            TipoImagem.FOTO_USUARIO,
+            id,
+            lambda caminho: getVarianteResponse(caminho, tamanho, versao, request),
+        )
 
-        return getFileResponse(evento.cracha)
+    @staticmethod
+    async def getImagemEvento(
+        id: str, tamanho: TamanhoImagem, versao: str | None, request: Request
+    ):
+        return await _respostaImagem(
+            TipoImagem.ARTE_EVENTO,
+            id,
+            lambda caminho: getVarianteResponse(caminho, tamanho, versao, request),
+        )
+
+    @staticmethod
+    async def getCrachaEvento(id: str, request: Request):
+        return await _respostaImagem(
+            TipoImagem.CRACHA_EVENTO,
+            id,
+            lambda caminho: getFileResponse(caminho, request),
+        )
 
     @staticmethod
-    def getComprovanteInscrito(idEvento: str, idUsuario: str):
-        inscrito = EventoControlador.getInscrito(idEvento, idUsuario)
+    async def getComprovanteInscrito(idEvento: str, idUsuario: str, request: Request):
+        inscrito = await EventoControlador.getInscrito(idEvento, idUsuario)
 
-        return getFileResponse(inscrito.comprovante)
+        return await getFileResponse(inscrito.comprovante, request, CACHE_PRIVADO)
@@ -1,7 +1,8 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 
+from src.img.operacoesImagem import TamanhoImagem
 from src.modelos.excecao import NaoAutorizadoExcecao
 from src.modelos.usuario.usuario import TipoConta, Usuario
 from src.rotas.img.imgControlador import ImagemControlador
@@ -13,19 +14,29 @@ roteador = APIRouter(prefix="/img", tags=["Imagens"])
 @roteador.get(
     "/usuarios/{id}/foto",
     name="Recuperar imagem por ID",
-    description="Recupera a imagem de um usuário por ID",
+    description="Recupera a imagem de um usuário por ID. O parâmetro `tamanho` permite obter uma versão reduzida, e clientes que aceitam WebP a recebem nesse formato. URLs com a versão da imagem (`v`) podem ser armazenadas em cache indefinidamente.",
 )
-def getImagemUsuario(id: str):
-    return ImagemControlador.getImagemUsuario(id)
+async def getImagemUsuario(
+    id: str,
+    request: Request,
+    tamanho: TamanhoImagem = TamanhoImagem.ORIGINAL,
+    v: str | None = None,
+):
+    return await ImagemControlador.getImagemUsuario(id, tamanho, v, request)
 
 
 @roteador.get(
     "/eventos/{id}/arte",
     name="Recuperar imagem por ID",
-    description="Recupera a arte (capa) de um evento por ID",
+    description="Recupera a arte (capa) de um evento por ID. O parâmetro `tamanho` permite obter uma versão reduzida, e clientes que aceitam WebP a recebem nesse formato. URLs com a versão da imagem (`v`) podem ser armazenadas em cache indefinidamente.",
 )
-def getImagemEvento(id: str):
-    return ImagemControlador.getImagemEvento(id)
+async def getImagemEvento(
+    id: str,
+    request: Request,
+    tamanho: TamanhoImagem = TamanhoImagem.ORIGINAL,
+    v: str | None = None,
+):
+    return await ImagemControlador.getImagemEvento(id, tamanho, v, request)
 
 
 @roteador.get(
@@ -33,8 +44,8 @@ def getImagemEvento(id: str):
     name="Recuperar template do crachá do evento",
     description="Recupera o template do crachá do evento com o ID `id`",
 )
-def getCrachaEvento(id: str):
-    return ImagemControlador.getCrachaEvento(id)
+async def getCrachaEvento(id: str, request: Request):
+    return await ImagemControlador.getCrachaEvento(id, request)
 
 
 @roteador.get(
@@ -42,12 +53,13 @@ def getCrachaEvento(id: str):
     name="Recuperar comprovante de inscrição",
     description="Recupera o comprovante de inscrição de um inscrito em um evento. O comprovante deve ser do próprio usuário, ou o usuário deve ser petiano.",
 )
-def getComprovanteInscrito(
+async def getComprovanteInscrito(
     usuario: Annotated[Usuario, Depends(getUsuarioAutenticado)],
     idEvento: str,
     idInscrito: str,
+    request: Request,
 ):
     if usuario.tipoConta in [TipoConta.PETIANO, TipoConta.ADMIN] or usuario.id == idInscrito:
-        return ImagemControlador.getComprovanteInscrito(idEvento, idInscrito)
+        return await ImagemControlador.getComprovanteInscrito(idEvento, idInscrito, request)
     else:
         raise NaoAutorizadoExcecao()
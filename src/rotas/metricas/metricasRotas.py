@@ -0,0 +1,44 @@
+"""
+Rotas de observabilidade da aplicação.
+"""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+
+from src.autenticacao.cacheAutenticacao import estatisticasCacheAutenticacao
+from src.email.conexaoSmtp import estatisticasSmtp
+from src.email.filaEmails import estatisticasFilaEmails
+from src.email.modelosEmail import estatisticasCacheEventosEmail
+from src.img.indiceImagens import estatisticasIndiceImagens
+from src.img.processamento import estatisticasProcessamento
+from src.modelos.usuario.usuario import Usuario
+from src.rotas.usuario.usuarioRotas import getPetianoAdminAutenticado
+
+roteador: APIRouter = APIRouter(prefix="/metricas", tags=["Métricas"])
+
+
+@roteador.get(
+    "/",
+    name="Recuperar métricas",
+    description="Recupera as métricas do processo: fila de processamento de imagens, cache de autenticação, índice de imagens, conexões SMTP, fila de e-mails e cache dos e-mails de eventos.",
+)
+async def getMetricas(
+    usuario: Annotated[Usuario, Depends(getPetianoAdminAutenticado)],
+) -> dict[str, dict]:
+    """
+    Recupera as métricas do processo que atendeu a requisição.
+
+    :param usuario: Usuário autenticado (petiano ou administrador).
+    :return metricas: Métricas do pool de processamento de imagens, do cache de
+        autenticação, do índice de imagens, do pool de conexões SMTP, da fila de e-mails e
+        do cache dos dados de eventos usados nos e-mails.
+    """
+    return {
+        "processamentoImagens": estatisticasProcessamento(),
+        "cacheAutenticacao": estatisticasCacheAutenticacao(),
+        "indiceImagens": estatisticasIndiceImagens(),
+        "smtp": estatisticasSmtp(),
+        "filaEmails": await estatisticasFilaEmails(),
+        "cacheEventosEmail": estatisticasCacheEventosEmail(),
+    }
@@ -3,11 +3,13 @@ Controladores para rotas de gerenciamento de usuários.
 """
 
 from enum import StrEnum
+import functools
 import logging
 import secrets
 from datetime import datetime, timedelta
 
 from fastapi import BackgroundTasks, UploadFile
+from fastapi.concurrency import run_in_threadpool
 
 from src.autenticacao.autenticacao import conferirHashSenha, hashSenha
 from src.autenticacao.jwtoken import (
@@ -16,6 +18,7 @@ from src.autenticacao.jwtoken import (
     processaTokenAtivaConta,
     processaTokenTrocaSenha,
 )
+from src.autenticacao.cacheAutenticacao import cacheTokens, cacheUsuarios
 from src.config import config
 from src.email.operacoesEmail import (
     DadoAlterado,
@@ -23,7 +26,13 @@ from src.email.operacoesEmail import (
     enviarEmailResetSenha,
     enviarEmailVerificacao,
 )
-from src.img.operacoesImagem import armazenaFotoUsuario, deletaImagem, validaImagem
+from src.img.armazenamento import (
+    armazena,
+    libera,
+    processaImagemArmazenada,
+    substitui,
+)
+from src.img.operacoesImagem import TamanhoImagem, armazenaImagem, urlImagem
 from src.modelos.bd import RegistroLoginBD, TokenAutenticacaoBD, UsuarioBD, EventoBD, cliente
 from src.modelos.excecao import (
     APIExcecaoBase,
@@ -37,7 +46,7 @@ from src.modelos.excecao import (
     UsuarioNaoEncontradoExcecao,
 )
 from src.modelos.registro.registroLogin import RegistroLogin
-from src.modelos.usuario.usuario import Petiano, TipoConta, EventosInscrito, EventoResumido, Usuario
+from src.modelos.usuario.usuario import Petiano, TipoConta, EventosInscrito, EventoResumido, Usuario, UsuarioPerfil
 from src.modelos.usuario.usuarioClad import (
     UsuarioAtualizar,
     UsuarioAtualizarEmail,
@@ -49,7 +58,7 @@ from src.modelos.usuario.validacaoCadastro import ValidacaoCadastro
 
 class UsuarioControlador:
     @staticmethod
-    def ativarConta(token: str) -> None:
+    async def ativarConta(token: str) -> None:
         """
         Recebe um token de ativação de conta e ativa a conta associada ao token, caso válido.
 
@@ -67,25 +76,22 @@ class UsuarioControlador:
         id: str = msg["idUsuario"]
         email: str = msg["email"]
 
-        usuario = UsuarioControlador.getUsuario(id)
+        usuario = await UsuarioControlador.getUsuario(id)
         if usuario.email == email:
             usuario.emailConfirmado = True
-            UsuarioBD.atualizar(usuario)
+            await UsuarioBD.atualizar(usuario)
 
     @staticmethod
-    def cadastrarUsuario(dadosUsuario: UsuarioCriar, tasks: BackgroundTasks) -> str:
+    async def cadastrarUsuario(dadosUsuario: UsuarioCriar) -> str:
         """
         Cria uma conta com os dados `dadosUsuario` fornecidos, e envia um email
         de confirmação de criação de conta ao endereço fornecido.
-        
-        Um objeto `BackgroundTasks` deve ser fornecido para o envio do email.
 
             A criação da conta pode não suceder por erro na validação de dados,
             por já haver uma conta cadastrada com tal CPF ou email ou por falha
             de conexão com o banco de dados.
         
         :param dadosUsuario: Dados do usuário a serem cadastrados.
-        :param tasks: Objeto `BackgroundTasks` para envio de email.
 
         :return id: ID do usuário criado.
         :raises JaExisteExcecao: Se já houver uma conta cadastrada com o CPF ou email fornecidos.
@@ -98,7 +104,9 @@ class UsuarioControlador:
         dadosUsuario.curso = dadosUsuario.curso.strip()
 
         # hash senha
-        dadosUsuario.senha = hashSenha(dadosUsuario.senha.get_secret_value())  # type: ignore
+        dadosUsuario.senha = await run_in_threadpool(  # type: ignore
+            hashSenha, dadosUsuario.senha.get_secret_value()
+        )
 
         d = {
             "_id": secrets.token_hex(16),
@@ -122,41 +130,40 @@ class UsuarioControlador:
             config.CAMINHO_BASE + "/usuarios/confirma-email?token=" + token
         )
 
-        tasks.add_task(enviarEmailVerificacao, dadosUsuario.email, linkConfirmacao)
-
         # cria o usuário no bd
-        UsuarioBD.criar(usuario)
+        await UsuarioBD.criar(usuario)
+
+        # o email só é enviado se o usuário foi criado
+        await enviarEmailVerificacao(dadosUsuario.email, linkConfirmacao)
 
         return usuario.id
 
     # Envia um email para trocar de senha se o email estiver cadastrado no bd
     @staticmethod
-    def recuperarConta(email: str, tasks: BackgroundTasks) -> None:
+    async def recuperarConta(email: str) -> None:
         """
         Envia um email de recuperação de senha para o endereço fornecido, se o endereço
         estiver associado a uma conta cadastrada. Se o endereço não estiver associado a
         uma conta, a função não faz nada.
 
         :param email: Endereço de email associado à conta.
-        :param tasks: Objeto `BackgroundTasks` para envio de email.
         """
         try:
-            UsuarioBD.buscar("email", email)
+            await UsuarioBD.buscarPorEmail(email, UsuarioPerfil)
             # Gera o link e envia o email se o usuário estiver cadastrado
             link: str = geraLinkEsqueciSenha(email)
-            tasks.add_task(enviarEmailResetSenha, email, link)  # Envia o email
+            await enviarEmailResetSenha(email, link)  # Envia o email
         except NaoEncontradoExcecao:
             pass
 
     @staticmethod
-    def trocarSenha(token: str, senha: str, tasks: BackgroundTasks) -> None:
+    async def trocarSenha(token: str, senha: str) -> None:
         """
         Realiza a troca de senha de um usuário com o token JWT de troca de senha fornecido.
         O usuário tem sua senha alterada para a senha fornecida.
 
         :param token: Token JWT de troca de senha.
         :param senha: Nova senha do usuário.
-        :param tasks: Objeto `BackgroundTasks` para envio de email.
 
         :raises ValueError: Se a senha fornecida for inválida.
         :raises TokenInvalidoExcecao: Se o token fornecido for inválido.
@@ -165,21 +172,21 @@ class UsuarioControlador:
         # Verifica o token e recupera o email
         email: str = processaTokenTrocaSenha(token)
 
-        usuario: Usuario = UsuarioBD.buscar("email", email)
+        usuario: Usuario = await UsuarioBD.buscarPorEmail(email)
 
         if not ValidacaoCadastro.senha(senha):
             raise ValueError("Senha inválida")
 
-        usuario.senha = hashSenha(senha)
+        usuario.senha = await run_in_threadpool(hashSenha, senha)
 
-        UsuarioBD.atualizar(usuario)
+        await UsuarioBD.atualizar(usuario)
 
-        tasks.add_task(enviarEmailAlteracaoDados, usuario.email, DadoAlterado.SENHA)
+        await enviarEmailAlteracaoDados(usuario.email, DadoAlterado.SENHA)
 
         logging.info("Senha atualizada para o usuário com ID: " + str(usuario.id))
 
     @staticmethod
-    def autenticarUsuario(email: str, senha: str) -> dict[str, str]:
+    async def autenticarUsuario(email: str, senha: str) -> dict[str, str]:
         """
         Verifica se o email e senha fornecidos correspondem a um usuário cadastrado e ativo e
         retorna um novo token de autenticação, neste caso.
@@ -196,7 +203,7 @@ class UsuarioControlador:
 
         # verifica senha e usuario
         try:
-            usuario: Usuario = UsuarioBD.buscar("email", email)
+            usuario: Usuario = await UsuarioBD.buscarPorEmail(email)
         except NaoEncontradoExcecao:
             raise EmailSenhaIncorretoExcecao()
 
@@ -204,12 +211,12 @@ class UsuarioControlador:
         if usuario.emailConfirmado != True:
             raise EmailNaoConfirmadoExcecao()
 
-        if not conferirHashSenha(senha, usuario.senha):
+        if not await run_in_threadpool(conferirHashSenha, senha, usuario.senha):
             raise EmailSenhaIncorretoExcecao()
 
         # cria token
         tk: str = secrets.token_urlsafe()
-        TokenAutenticacaoBD.criar(
+        await TokenAutenticacaoBD.criar(
             tk,
             usuario.id,
             datetime.now() + timedelta(days=2),
@@ -219,32 +226,58 @@ class UsuarioControlador:
         return {"access_token": tk, "token_type": "bearer"}
 
     @staticmethod
-    def getUsuarioAutenticado(token: str) -> Usuario:
+    async def getUsuarioAutenticado(token: str) -> Usuario:
         """
         Obtém dados do usuário dono do token fornecido. Falha se o token estiver expirado
         ou for inválido.
 
+        Os resultados são mantidos no cache de autenticação
+        (`src.autenticacao.cacheAutenticacao`), de modo que, no caso comum, a função não
+        acessa o banco de dados. Por isso, o usuário retornado pode estar desatualizado
+        (ex: alterado por outro processo) e não deve ser gravado no banco de dados; quem
+        o altera deve ler o usuário novamente ou gravar apenas os campos alterados.
+
         :param token: Token de autenticação do usuário.
         :return usuario: Dados do usuário autenticado.
         :raises NaoAutenticadoExcecao: Se o token fornecido for inválido ou se o usuário não existir.
         :raises EmailNaoConfirmadoExcecao: Se o email do usuário associado ao token não estiver confirmado.
         """
 
-        try:
-            id: str = TokenAutenticacaoBD.buscar(token).idUsuario
-        except NaoEncontradoExcecao:
-            raise NaoAutenticadoExcecao()
+        # o token e o usuário são buscados primeiro no cache de autenticação
+        entradaToken = cacheTokens.obter(token)
+        if entradaToken is None:
+            # obtida antes da leitura, para não armazenar um token removido durante ela
+            geracao = cacheTokens.geracao()
+            try:
+                tokenAutenticacao = await TokenAutenticacaoBD.buscar(token)
+            except NaoEncontradoExcecao:
+                raise NaoAutenticadoExcecao()
 
-        if usuario := UsuarioBD.buscar("_id", id):
-            if not usuario.emailConfirmado:
-                raise EmailNaoConfirmadoExcecao()
+            entradaToken = (tokenAutenticacao.idUsuario, tokenAutenticacao.validade)
+            cacheTokens.inserir(token, entradaToken, geracao)
 
-            return usuario
-        else:
+        id, validade = entradaToken
+        if validade < datetime.now():
             raise NaoAutenticadoExcecao()
 
+        usuario = cacheUsuarios.obter(id)
+        if usuario is None:
+            geracao = cacheUsuarios.geracao()
+            try:
+                usuario = await UsuarioBD.buscarPorId(id)
+            except NaoEncontradoExcecao:
+                raise NaoAutenticadoExcecao()
+
+            cacheUsuarios.inserir(id, usuario, geracao)
+
+        if not usuario.emailConfirmado:
+            raise EmailNaoConfirmadoExcecao()
+
+        # as rotas podem alterar o usuário recebido; a cópia protege a entrada do cache
+        return usuario.model_copy(deep=True)
+
     @staticmethod
-    def getUsuario(id: str) -> Usuario:
+    async def getUsuario(id: str) -> Usuario:
         """
         Obtém dados do usuário com o id fornecido.
 
@@ -253,40 +286,52 @@ class UsuarioControlador:
         :raises UsuarioNaoEncontradoExcecao: Se o usuário com o ID fornecido não existir.
         """
 
-        if usuario := UsuarioBD.buscar("_id", id):
+        if usuario := await UsuarioBD.buscarPorId(id):
             return usuario
 
         raise UsuarioNaoEncontradoExcecao()
 
     @staticmethod
-    def getUsuarios() -> list[Usuario]:
+    async def getPerfilUsuario(id: str) -> UsuarioPerfil:
+        """
+        Obtém dados do usuário com o id fornecido, sem carregar a senha e a lista de
+        eventos inscritos.
+
+        :param id: ID do usuário a ser obtido.
+        :return usuario: Dados do usuário.
+        :raises NaoEncontradoExcecao: Se o usuário com o ID fornecido não existir.
+        """
+        return await UsuarioBD.buscarPorId(id, UsuarioPerfil)
+
+    @staticmethod
+    async def getUsuarios() -> list[Usuario]:
         """
         Retorna uma lista de todos os usuários cadastrados.
 
         :return usuarios: Lista de usuários.
         """
-        return UsuarioBD.listar()
+        return await UsuarioBD.listar()
 
     @staticmethod
-    def getPetianos() -> list[Petiano]:
+    async def getPetianos() -> list[Petiano]:
         """
         Retorna uma lista de todos os petianos cadastrados.
 
         :return petianos: Lista de petianos.
         """
         petianos = []
-        for petiano in UsuarioBD.listarPetianos():
+        for petiano in await UsuarioBD.listarPetianos():
             # define a url da foto do petiano
             urlFoto = None
             if petiano.foto:
-                urlFoto = f"{config.CAMINHO_BASE}/img/usuarios/{petiano.id}/foto"
+                urlFoto = urlImagem(f"usuarios/{petiano.id}/foto", petiano.foto, TamanhoImagem.MEDIO)
 
             eventos = []
             for evento_id in petiano.eventosInscrito:
                 try:
-                    evento = EventoBD.buscar("_id", evento_id)
+                    evento = await EventoBD.buscar("_id", evento_id)
                     url_arte = (
-                        f"{config.CAMINHO_BASE}/img/eventos/{evento.id}/arte"
+                        urlImagem(f"eventos/{evento.id}/arte", evento.arte, TamanhoImagem.PEQUENO)
                         if evento.arte
                         else None
                     )
@@ -318,26 +363,30 @@ class UsuarioControlador:
         return petianos
 
     @staticmethod
-    def getPetianosAndEgressos() -> list[Petiano]:
+    async def getPetianosAndEgressos() -> list[Petiano]:
         """
         Retorna uma lista de todos os petianos e egressos cadastrados.
 
         :return petianos: Lista de petianos e egressos.
         """
         petianos = []
-        for petiano in UsuarioBD.listarPetianosAndEgressos():
+        for petiano in await UsuarioBD.listarPetianosAndEgressos():
             # define a url da foto do petiano ou egresso
             urlFoto = None
             if petiano.foto:
-                urlFoto = f"{config.CAMINHO_BASE}/img/usuarios/{petiano.id}/foto"
+                urlFoto = urlImagem(f"usuarios/{petiano.id}/foto", petiano.foto, TamanhoImagem.MEDIO)
 
             # transforma os IDs em objetos EventoResumido
             eventos: list[EventoResumido] = []
 
             for evento_id in petiano.eventosInscrito:
                 try:
-                    ev: Evento = EventoBD.buscar("_id", evento_id)
-                    url_arte = f"{config.CAMINHO_BASE}/img/eventos/{ev.id}/arte" if ev.arte else None
+                    ev: Evento = await EventoBD.buscar("_id", evento_id)
+                    url_arte = (
+                        urlImagem(f"eventos/{ev.id}/arte", ev.arte, TamanhoImagem.PEQUENO)
+                        if ev.arte
+                        else None
+                    )
 
                     eventos.append({
                         "id": ev.id,
@@ -368,7 +417,7 @@ class UsuarioControlador:
         return petianos
 
     @staticmethod
-    def editarUsuario(
+    async def editarUsuario(
         id: str,
         dadosUsuario: UsuarioAtualizar,
     ) -> Usuario:
@@ -386,7 +435,7 @@ class UsuarioControlador:
         """
 
         # obtém usuário
-        usuario: Usuario = UsuarioControlador.getUsuario(id)
+        usuario: Usuario = await UsuarioControlador.getUsuario(id)
 
         # verifica se o usuário é petiano
         if usuario.tipoConta not in [TipoConta.PETIANO, TipoConta.EGRESSO]:
@@ -405,25 +454,26 @@ class UsuarioControlador:
         d.update(dadosUsuario.model_dump(exclude_none=True))
         usuario = Usuario(**d)  # type: ignore
 
-        UsuarioBD.atualizar(usuario)
+        await UsuarioBD.atualizar(usuario)
 
         return usuario
 
     @staticmethod
-    def deletarUsuario(id: str) -> None:
+    async def deletarUsuario(id: str) -> None:
         """
         Deleta um usuário existente (*hard delete*).
 
         :param id: ID do usuário a ser deletado.
         :raises UsuarioNaoEncontradoExcecao: Se o usuário com o ID fornecido não existir.
         """
-        UsuarioControlador.getUsuario(id)
+        await UsuarioControlador.getPerfilUsuario(id)
 
-        UsuarioBD.deletar(id)
+        # a foto liberada é a do documento removido, e não a lida acima
+        await libera(await UsuarioBD.deletar(id))
 
     @staticmethod
-    def editaSenha(
-        dadosSenha: UsuarioAtualizarSenha, usuario: Usuario, tasks: BackgroundTasks
+    async def editaSenha(
+        dadosSenha: UsuarioAtualizarSenha, usuario: Usuario
     ) -> None:
         """
         Atualiza a senha de um usuário existente caso a senha antiga seja correta.
@@ -433,21 +483,28 @@ class UsuarioControlador:
 
         :param dadosSenha: Dados de senha a serem atualizados.
         :param usuario: Usuário a ser atualizado.
-        :param tasks: Objeto `BackgroundTasks` para envio de email.
 
         :raises NaoAutenticadoExcecao: Se a senha antiga fornecida estiver incorreta.
         """
-        if conferirHashSenha(dadosSenha.senha.get_secret_value(), usuario.senha):
-            usuario.senha = hashSenha(dadosSenha.novaSenha.get_secret_value())
-            UsuarioBD.atualizar(usuario)
-            tasks.add_task(enviarEmailAlteracaoDados, usuario.email, DadoAlterado.SENHA)
+        # o usuário autenticado pode vir do cache e estar desatualizado: a senha é
+        # conferida com a do banco de dados, e apenas ela é gravada
+        usuario = await UsuarioControlador.getUsuario(usuario.id)
+
+        if await run_in_threadpool(
+            conferirHashSenha, dadosSenha.senha.get_secret_value(), usuario.senha
+        ):
+            senha = await run_in_threadpool(
+                hashSenha, dadosSenha.novaSenha.get_secret_value()
+            )
+            await UsuarioBD.atualizarSenha(usuario.id, senha)
+            await enviarEmailAlteracaoDados(usuario.email, DadoAlterado.SENHA)
 
         else:
             raise NaoAutenticadoExcecao(message="Senha incorreta")
 
     @staticmethod
-    def editarEmail(
-        dadosEmail: UsuarioAtualizarEmail, id: str, tasks: BackgroundTasks
+    async def editarEmail(
+        dadosEmail: UsuarioAtualizarEmail, id: str
     ) -> None:
         """
         Atualiza o email de um usuário existente.
@@ -460,28 +517,29 @@ class UsuarioControlador:
 
         :param dadosEmail: Dados de email a serem atualizados.
         :param id: ID do usuário a ser atualizado.
-        :param tasks: Objeto `BackgroundTasks` para envio de email.
         :raises NaoAutenticadoExcecao: Se a senha fornecida estiver incorreta.
         """
-        usuario = UsuarioControlador.getUsuario(id)
+        usuario = await UsuarioControlador.getUsuario(id)
 
-        if conferirHashSenha(dadosEmail.senha.get_secret_value(), usuario.senha):
+        if await run_in_threadpool(
+            conferirHashSenha, dadosEmail.senha.get_secret_value(), usuario.senha
+        ):
             emailAntigo = usuario.email
             usuario.email = dadosEmail.novoEmail
             usuario.emailConfirmado = False
 
-            UsuarioBD.atualizar(usuario)
+            await UsuarioBD.atualizar(usuario)
             mensagemEmail: str = (
                 f"{config.CAMINHO_BASE}/usuarios/confirma-email?token={geraTokenAtivaConta(usuario.id, usuario.email, timedelta(hours=24))}"
             )
 
-            tasks.add_task(enviarEmailVerificacao, usuario.email, mensagemEmail)
-            tasks.add_task(enviarEmailAlteracaoDados, emailAntigo, DadoAlterado.EMAIL)
+            await enviarEmailVerificacao(usuario.email, mensagemEmail)
+            await enviarEmailAlteracaoDados(emailAntigo, DadoAlterado.EMAIL)
         else:
             raise NaoAutenticadoExcecao(message="Senha incorreta")
 
     @staticmethod
-    def editarFoto(usuario: Usuario, foto: UploadFile) -> None:
+    async def editarFoto(usuario: Usuario, foto: UploadFile, tasks: BackgroundTasks) -> None:
         """
         Atualiza a foto de perfil de um usuário existente.
 
@@ -491,25 +549,28 @@ class UsuarioControlador:
 
         :param usuario: Usuário a ser atualizado.
         :param foto: Foto a ser atualizada.
+        :param tasks: Tarefas em segundo plano (geração das variantes da foto).
         :raises ImagemInvalidaExcecao: Se a imagem fornecida for inválida.
         :raises ImagemNaoSalvaExcecao: Se a imagem fornecida não puder ser salva.
+        :raises NaoAtualizadaExcecao: Se a foto foi alterada repetidamente por outras
+            requisições durante a troca.
         """
-        if not validaImagem(foto.file):
-            raise ImagemInvalidaExcecao()
-
-        deletaImagem(usuario.id, ["usuarios"])
-
-        caminhoFotoPerfil = armazenaFotoUsuario(usuario.id, foto.file)
+        # a foto é validada pelo cabeçalho e gravada como enviada
+        caminhoFotoPerfil = await armazena(armazenaImagem, await foto.read())
         if not caminhoFotoPerfil:
-            raise ImagemNaoSalvaExcecao()
+            raise ImagemInvalidaExcecao()
 
-        usuario.foto = str(caminhoFotoPerfil)
+        # a foto atual é lida do banco de dados, e não do usuário autenticado (que pode
+        # estar desatualizado), e só é liberada se for de fato substituída
+        trocarFoto = functools.partial(UsuarioBD.trocarFoto, usuario.id)
+        fotoAtual = functools.partial(UsuarioBD.buscarFoto, usuario.id)
+        if not await substitui(caminhoFotoPerfil, fotoAtual, trocarFoto):
+            raise NaoAtualizadaExcecao()
 
-        # atualiza no bd
-        UsuarioBD.atualizar(usuario)
+        tasks.add_task(processaImagemArmazenada, caminhoFotoPerfil, trocarFoto)
 
     @staticmethod
-    def promoverPetiano(id: str) -> None:
+    async def promoverPetiano(id: str) -> None:
         """
         Promove um usuário a petiano (altera seu tipo de conta para TipoConta.PETIANO).
 
@@ -517,15 +578,15 @@ class UsuarioControlador:
         :raises UsuarioNaoEncontradoExcecao: Se o usuário com o id fornecido não existir.
         """
 
-        usuario = UsuarioControlador.getUsuario(id)
+        usuario = await UsuarioControlador.getUsuario(id)
 
         logging.info(f"Promovendo usuário {usuario.id} a petiano")
         usuario.tipoConta = TipoConta.PETIANO
 
-        UsuarioBD.atualizar(usuario)
+        await UsuarioBD.atualizar(usuario)
 
         # desautentica o usuário para evitar que tokens antigas ganhem permissões novas
-        TokenAutenticacaoBD.deletarTokensUsuario(id)
+        await TokenAutenticacaoBD.deletarTokensUsuario(id)
     
     class DemitirPetianoPara(StrEnum):
         """
@@ -543,7 +604,7 @@ class UsuarioControlador:
         """
 
     @staticmethod
-    def demitirPetiano(id: str, egresso: DemitirPetianoPara) -> None:
+    async def demitirPetiano(id: str, egresso: DemitirPetianoPara) -> None:
         """
         Demite um usuário petiano ou egresso a egresso, caso `egresso` seja verdadeiro, ou a externo caso contrário.
 
@@ -553,7 +614,7 @@ class UsuarioControlador:
         :raises NaoAtualizadaExcecao: Se o usuário não for petiano nem egresso.
         """
 
-        usuario = UsuarioControlador.getUsuario(id)
+        usuario = await UsuarioControlador.getUsuario(id)
 
         if (
             usuario.tipoConta != TipoConta.PETIANO
@@ -568,20 +629,20 @@ class UsuarioControlador:
             logging.info(f"Demitindo usuário {usuario.id} a externo")
             usuario.tipoConta = TipoConta.EXTERNO
 
-        UsuarioBD.atualizar(usuario)
+        await UsuarioBD.atualizar(usuario)
 
         # desautentica o usuário para forçar ressincronização
-        TokenAutenticacaoBD.deletarTokensUsuario(id)
+        await TokenAutenticacaoBD.deletarTokensUsuario(id)
 
     @staticmethod
-    def getHistoricoLogin(email: str) -> list[RegistroLogin]:
+    async def getHistoricoLogin(email: str) -> list[RegistroLogin]:
         """
         Retorna o histórico de logins do usuário com o email fornecido.
 
         :param email: Email do usuário.
         :return historico: Lista de registros de login.
         """
-        return RegistroLoginBD.listarRegistrosUsuario(email)
+        return await RegistroLoginBD.listarRegistrosUsuario(email)
     
 
 
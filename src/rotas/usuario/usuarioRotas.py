@@ -74,7 +74,9 @@ Se especificado como dependência de uma rota, torna-a autenticada.
 """
 
 
-def getUsuarioAutenticado(token: Annotated[str, Depends(tokenAcesso)]):
+async def getUsuarioAutenticado(
+    request: Request, token: Annotated[str, Depends(tokenAcesso)]
+):
     """
     Recupera o token de acesso fornecido na solicitação e retorna um objeto usuário cujo
     token lhe pertence.
@@ -84,12 +86,18 @@ def getUsuarioAutenticado(token: Annotated[str, Depends(tokenAcesso)]):
     Pode ser especificada como dependência para obter o usuário autenticado em rotas
     que precisam de autorização.
 
+    O identificador do usuário é guardado em `request.state.idUsuario`, para que os
+    middlewares (como o de logs) possam usá-lo sem consultar o banco novamente.
+
+    :param request: Requisição HTTP.
     :param token: Token de acesso.
     :return Usuario: Objeto contendo informações do usuário autenticado.
     :raises NaoAutenticadoExcecao: Caso o token seja inválido ou não exista.
     """
     try:
-        return UsuarioControlador.getUsuarioAutenticado(token)
+        usuario = await UsuarioControlador.getUsuarioAutenticado(token)
+        request.state.idUsuario = usuario.id
+        return usuario
     except NaoAutenticadoExcecao:
         # esse HTTPException é necessário devido ao header incluso.
         raise HTTPException(
@@ -99,7 +107,7 @@ def getUsuarioAutenticado(token: Annotated[str, Depends(tokenAcesso)]):
         )
 
 
-def getPetianoAdminAutenticado(usuario: Annotated[Usuario, Depends(getUsuarioAutenticado)]):
+async def getPetianoAdminAutenticado(usuario: Annotated[Usuario, Depends(getUsuarioAutenticado)]):
     """
     Verifica se o usuário autenticado é um petiano ou o administrador e retorna o usuário.
 
@@ -141,11 +149,9 @@ def temPermissaoPetianoAdmin(usuario: Usuario):
     responses=listaRespostasExcecoes(JaExisteExcecao, APIExcecaoBase),
 )
 @limiter.limit("3/minute")
-def cadastrarUsuario(
-    tasks: BackgroundTasks, request: Request, usuario: UsuarioCriar
-) -> str:
+async def cadastrarUsuario(request: Request, usuario: UsuarioCriar) -> str:
     # despacha para controlador
-    usuarioCadastrado = UsuarioControlador.cadastrarUsuario(usuario, tasks)
+    usuarioCadastrado = await UsuarioControlador.cadastrarUsuario(usuario)
 
     # retorna os dados do usuario cadastrado
     return usuarioCadastrado
@@ -157,10 +163,10 @@ def cadastrarUsuario(
     description="Rota apenas para petianos e administrador.\n\n" "Lista todos os usuários cadastrados.",
     response_model=list[UsuarioLerAdmin],
 )
-def listarUsuarios(
+async def listarUsuarios(
     usuario: Annotated[Usuario, Depends(getPetianoAdminAutenticado)],
 ):
-    return UsuarioControlador.getUsuarios()
+    return await UsuarioControlador.getUsuarios()
 
 
 @roteador.get(
@@ -169,8 +175,8 @@ def listarUsuarios(
     description="Lista todos os petianos e egressos cadastrados.",
     response_model=list[Petiano],
 )
-def listarPetianos():
-    return UsuarioControlador.getPetianosAndEgressos()
+async def listarPetianos():
+    return await UsuarioControlador.getPetianosAndEgressos()
 
 
 @roteador.get(
@@ -185,8 +191,8 @@ def listarPetianos():
         JaExisteExcecao,
     ),
 )
-def confirmaEmail(token: str):
-    UsuarioControlador.ativarConta(token)
+async def confirmaEmail(token: str):
+    await UsuarioControlador.ativarConta(token)
 
 
 @roteador.get(
@@ -199,7 +205,7 @@ def confirmaEmail(token: str):
     response_model=UsuarioLerAdmin,
     responses=listaRespostasExcecoes(UsuarioNaoEncontradoExcecao),
 )
-def getEu(usuario: Annotated[Usuario, Depends(getUsuarioAutenticado)]):
+async def getEu(usuario: Annotated[Usuario, Depends(getUsuarioAutenticado)]):
     return usuario
 
 
@@ -211,15 +217,13 @@ def getEu(usuario: Annotated[Usuario, Depends(getUsuarioAutenticado)]):
     """,
 )
 @limiter.limit("3/minute")
-def recuperaConta(
-    tasks: BackgroundTasks, request: Request, email: Annotated[EmailStr, Form()]
-):
+async def recuperaConta(request: Request, email: Annotated[EmailStr, Form()]):
     # Verifica se o email é válido
     if not ValidacaoCadastro.email(email):
         raise ErroValidacaoExcecao(message="Email inválido.")
 
     # Passa o email para o controlador
-    UsuarioControlador.recuperarConta(email, tasks)
+    await UsuarioControlador.recuperarConta(email)
 
 
 @roteador.post(
@@ -231,13 +235,13 @@ def recuperaConta(
     status_code=status.HTTP_200_OK,
     responses=listaRespostasExcecoes(NaoAutenticadoExcecao),
 )
-def trocaSenha(tasks: BackgroundTasks, token: str, senha: Annotated[SecretStr, Form()]):
+async def trocaSenha(token: str, senha: Annotated[SecretStr, Form()]):
     # Validacao basica da senha
     if not ValidacaoCadastro.senha(senha.get_secret_value()):
         raise ErroValidacaoExcecao(message="Senha inválida.")
 
     # Despacha o token para o controlador
-    UsuarioControlador.trocarSenha(token, senha.get_secret_value(), tasks)
+    await UsuarioControlador.trocarSenha(token, senha.get_secret_value())
 
 
 @roteador.post(
@@ -251,7 +255,7 @@ def trocaSenha(tasks: BackgroundTasks, token: str, senha: Annotated[SecretStr, F
     responses=listaRespostasExcecoes(NaoAutenticadoExcecao),
 )
 @limiter.limit("3/minute")
-def autenticar(
+async def autenticar(
     request: Request, dados: Annotated[OAuth2PasswordRequestForm, Depends()]
 ):
     # obtém dados
@@ -263,7 +267,7 @@ def autenticar(
 
     # chama controlador
     try:
-        token = UsuarioControlador.autenticarUsuario(email, senha)
+        token = await UsuarioControlador.autenticarUsuario(email, senha)
 
         reg: RegistroLogin = RegistroLogin(
             emailUsuario=email,
@@ -271,7 +275,7 @@ def autenticar(
             dataHora=datetime.now(UTC),
             sucesso=True,
         )
-        RegistroLoginBD.criar(reg)
+        await RegistroLoginBD.criar(reg)
 
         return token
     except Exception as e:
@@ -282,7 +286,7 @@ def autenticar(
             sucesso=False,
             motivo=str(e),
         )
-        RegistroLoginBD.criar(reg)
+        await RegistroLoginBD.criar(reg)
 
         raise e
 
@@ -298,14 +302,16 @@ def autenticar(
     status_code=status.HTTP_200_OK,
     responses=listaRespostasExcecoes(NaoAutenticadoExcecao),
 )
-def desautenticar(
-    token: Annotated[str, Depends(tokenAcesso)], todos: bool | None = False
+async def desautenticar(
+    request: Request,
+    token: Annotated[str, Depends(tokenAcesso)],
+    todos: bool | None = False,
 ):
-    usuario = getUsuarioAutenticado(token)
+    usuario = await getUsuarioAutenticado(request, token)
     if todos:
-        TokenAutenticacaoBD.deletarTokensUsuario(usuario.id)
+        await TokenAutenticacaoBD.deletarTokensUsuario(usuario.id)
     else:
-        TokenAutenticacaoBD.deletar(token)
+        await TokenAutenticacaoBD.deletar(token)
 
 
 @roteador.put(
@@ -313,8 +319,7 @@ def desautenticar(
     name="Editar email do usuário autenticado",
     description="""Realiza a troca de email do usuário autenticado.""",
 )
-def editarEmail(
-    tasks: BackgroundTasks,
+async def editarEmail(
     id: str,
     dadosEmail: UsuarioAtualizarEmail,
     usuario: Annotated[Usuario, Depends(getUsuarioAutenticado)] = ...,  # type: ignore
@@ -326,9 +331,9 @@ def editarEmail(
         novoEmail = dadosEmail.novoEmail.lower().strip()
         dadosEmail.novoEmail = novoEmail
 
-        UsuarioControlador.editarEmail(dadosEmail, id, tasks)
+        await UsuarioControlador.editarEmail(dadosEmail, id)
 
-        TokenAutenticacaoBD.deletarTokensUsuario(usuario.id)
+        await TokenAutenticacaoBD.deletarTokensUsuario(usuario.id)
     else:
         raise NaoAutenticadoExcecao()
 
@@ -339,8 +344,7 @@ def editarEmail(
     description="""Realiza a troca de senha do usuário autenticado. Caso a opção deslogarAoTrocarSenha 
     seja selecionada, todos as sessões serão deslogadas ao trocar a senha.""",
 )
-def editarSenha(
-    tasks: BackgroundTasks,
+async def editarSenha(
     id: str,
     dadosSenha: UsuarioAtualizarSenha,
     deslogarAoTrocarSenha: bool,
@@ -348,15 +352,11 @@ def editarSenha(
 ):
     if usuario.id == id or usuario.tipoConta == TipoConta.ADMIN:
         # efetua troca de senha
-        UsuarioControlador.editaSenha(
-            dadosSenha,
-            usuario,
-            tasks,
-        )
+        await UsuarioControlador.editaSenha(dadosSenha, usuario)
 
         # efetua logout de todas as sessões, caso o usuário desejar
         if deslogarAoTrocarSenha:
-            TokenAutenticacaoBD.deletarTokensUsuario(usuario.id)
+            await TokenAutenticacaoBD.deletarTokensUsuario(usuario.id)
     else:
         raise NaoAutorizadoExcecao()
 
@@ -366,16 +366,17 @@ def editarSenha(
     name="Atualizar foto de perfil",
     description="Edita a foto de perfil do usuário autenticado. O usuário deve ser um petiano, petiano egresso ou administrador.",
 )
-def editarFoto(
+async def editarFoto(
     id: str,
     foto: UploadFile,
+    tasks: BackgroundTasks,
     usuario: Annotated[Usuario, Depends(getUsuarioAutenticado)] = ...,  # type: ignore
 ) -> None:
     podeEditarFoto = usuario.tipoConta in [TipoConta.PETIANO, TipoConta.ADMIN, TipoConta.EGRESSO]
     if not podeEditarFoto:
         raise NaoAutorizadoExcecao()
     if usuario.id == id or usuario.tipoConta == TipoConta.ADMIN:
-        UsuarioControlador.editarFoto(usuario=usuario, foto=foto)
+        await UsuarioControlador.editarFoto(usuario=usuario, foto=foto, tasks=tasks)
     else:
         raise NaoAutorizadoExcecao()
 
@@ -385,10 +386,10 @@ def editarFoto(
     name="Promover usuário a petiano",
     description="Promove o usuário especificado a petiano. O usuário deve ser um petiano ou o administrador.",
 )
-def promoverPetiano(
+async def promoverPetiano(
     id: str, _usuario: Annotated[Usuario, Depends(getPetianoAdminAutenticado)] = ...
 ):
-    UsuarioControlador.promoverPetiano(id)
+    await UsuarioControlador.promoverPetiano(id)
 
 
 @roteador.delete(
@@ -397,12 +398,12 @@ def promoverPetiano(
     description="""Remove o status de petiano do usuário especificado.
         Por padrão, a conta passa a ser do tipo egresso, mas caso o parâmetro egresso seja falso, o usuário é rebaixado a externo.""",
 )
-def demitirPetiano(
+async def demitirPetiano(
     id: str,
     egresso: bool | None = True,
     _usuario: Annotated[Usuario, Depends(getPetianoAdminAutenticado)] = ...,
 ):
-    UsuarioControlador.demitirPetiano(id, UsuarioControlador.DemitirPetianoPara.EXTERNO if egresso is not None else UsuarioControlador.DemitirPetianoPara.EGRESSO)
+    await UsuarioControlador.demitirPetiano(id, UsuarioControlador.DemitirPetianoPara.EXTERNO if egresso is not None else UsuarioControlador.DemitirPetianoPara.EGRESSO)
 
 
 @roteador.get(
@@ -414,11 +415,11 @@ def demitirPetiano(
     response_model=UsuarioLerAdmin,
     responses=listaRespostasExcecoes(UsuarioNaoEncontradoExcecao),
 )
-def getUsuario(usuario: Annotated[Usuario, Depends(getUsuarioAutenticado)], id: str):
+async def getUsuario(usuario: Annotated[Usuario, Depends(getUsuarioAutenticado)], id: str):
     if usuario.id == id:
         return usuario
     elif temPermissaoPetianoAdmin(usuario):
-        vitima: Usuario = UsuarioControlador.getUsuario(id)
+        vitima: Usuario = await UsuarioControlador.getUsuario(id)
         return vitima
     else:
         raise NaoAutorizadoExcecao()
@@ -433,13 +434,13 @@ def getUsuario(usuario: Annotated[Usuario, Depends(getUsuarioAutenticado)], id:
     response_model=UsuarioLer,
     responses=listaRespostasExcecoes(UsuarioNaoEncontradoExcecao),
 )
-def patchUsuario(
+async def patchUsuario(
     usuario: Annotated[Usuario, Depends(getUsuarioAutenticado)],
     dados: UsuarioAtualizar,
     id: str,
 ):
     if usuario.id == id or temPermissaoPetianoAdmin(usuario):
-        return UsuarioControlador.editarUsuario(id, dados)
+        return await UsuarioControlador.editarUsuario(id, dados)
     else:
         raise NaoAutorizadoExcecao()
 
@@ -453,12 +454,12 @@ def patchUsuario(
     Usuários não petianos só podem excluir seus próprios perfis.
     """,
 )
-def deletaUsuario(
+async def deletaUsuario(
     usuario: Annotated[Usuario, Depends(getUsuarioAutenticado)],
     id: str,
 ):
     if usuario.id == id or temPermissaoPetianoAdmin(usuario):
-        UsuarioControlador.deletarUsuario(id)
+        await UsuarioControlador.deletarUsuario(id)
     else:
         raise NaoAutorizadoExcecao()
 
@@ -474,10 +475,10 @@ def deletaUsuario(
     status_code=status.HTTP_200_OK,
     response_model=list[RegistroLogin],
 )
-def getHistoricoLogin(
+async def getHistoricoLogin(
     usuario: Annotated[Usuario, Depends(getUsuarioAutenticado)], id: str
 ):
     if usuario.id != id and not temPermissaoPetianoAdmin(usuario):
         raise NaoAutorizadoExcecao()
 
-    return UsuarioControlador.getHistoricoLogin(usuario.email)
+    return await UsuarioControlador.getHistoricoLogin(usuario.email)
@@ -0,0 +1,124 @@
+import asyncio
+import functools
+
+import pytest
+
+from src.img import armazenamento
+from src.modelos import bd
+from src.modelos.bd import UsuarioBD
+from src.modelos.excecao import NaoEncontradoExcecao
+
+
+@pytest.fixture
+def usuarios(monkeypatch):
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    colecao = mongomock_motor.AsyncMongoMockClient()["petBD-teste"]["usuarios"]
+    monkeypatch.setattr(bd, "colecaoUsuarios", colecao)
+    return colecao
+
+
+@pytest.fixture
+def liberadas(monkeypatch):
+    # chaves liberadas, no lugar da remoção dos arquivos
+    chaves = []
+
+    async def libera(caminho):
+        if caminho:
+            chaves.append(caminho)
+
+    monkeypatch.setattr(armazenamento, "libera", libera)
+    return chaves
+
+
+def _substitui(id: str, caminho: str, atual=None):
+    return armazenamento.substitui(
+        caminho,
+        atual or functools.partial(UsuarioBD.buscarFoto, id),
+        functools.partial(UsuarioBD.trocarFoto, id),
+    )
+
+
+def test_substitui_libera_anterior(usuarios, liberadas):
+    async def teste():
+        await usuarios.insert_one({"_id": "u", "foto": "antiga"})
+
+        assert await _substitui("u", "nova")
+
+        assert (await usuarios.find_one({"_id": "u"}))["foto"] == "nova"
+        assert liberadas == ["antiga"]
+
+    asyncio.run(teste())
+
+
+def test_substitui_sem_foto_anterior(usuarios, liberadas):
+    async def teste():
+        await usuarios.insert_one({"_id": "u"})
+
+        assert await _substitui("u", "nova")
+
+        assert (await usuarios.find_one({"_id": "u"}))["foto"] == "nova"
+        assert liberadas == []
+
+    asyncio.run(teste())
+
+
+def test_substitui_mesma_foto_libera_uma_referencia(usuarios, liberadas):
+    async def teste():
+        await usuarios.insert_one({"_id": "u", "foto": "foto"})
+
+        assert await _substitui("u", "foto")
+
+        # a referência adicionada pelo novo envio é liberada uma única vez
+        assert liberadas == ["foto"]
+
+    asyncio.run(teste())
+
+
+def test_substitui_le_novamente_apos_troca_concorrente(usuarios, liberadas):
+    async def teste():
+        await usuarios.insert_one({"_id": "u", "foto": "antiga"})
+        leituras = []
+
+        async def atual():
+            foto = await UsuarioBD.buscarFoto("u")
+            if not leituras:
+                # outra requisição troca a foto após a primeira leitura
+                await usuarios.update_one({"_id": "u"}, {"$set": {"foto": "outra"}})
+            leituras.append(foto)
+            return foto
+
+        assert await _substitui("u", "nova", atual)
+
+        assert leituras == ["antiga", "outra"]
+        # a foto antiga é liberada por quem a trocou, e não por esta requisição
+        assert liberadas == ["outra"]
+
+    asyncio.run(teste())
+
+
+def test_substitui_libera_nova_se_nao_trocar(usuarios, liberadas, monkeypatch):
+    monkeypatch.setattr(armazenamento.config, "TENTATIVAS_TROCA_IMAGEM", 2)
+
+    async def teste():
+        await usuarios.insert_one({"_id": "u", "foto": "antiga"})
+
+        async def atual():
+            # a foto lida nunca é a atual
+            return "desatualizada"
+
+        assert not await _substitui("u", "nova", atual)
+
+        assert (await usuarios.find_one({"_id": "u"}))["foto"] == "antiga"
+        assert liberadas == ["nova"]
+
+    asyncio.run(teste())
+
+
+def test_substitui_usuario_inexistente(usuarios, liberadas):
+    async def teste():
+        with pytest.raises(NaoEncontradoExcecao):
+            await _substitui("u", "nova")
+
+        assert liberadas == ["nova"]
+
+    asyncio.run(teste())
@@ -0,0 +1,82 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from src.modelos import bd
+from src.modelos.avaliacao.avaliacao import (
+    FormularioAvaliacaoEvento,
+    RespostaPerguntaAvaliacao,
+    SubmissaoAvaliacaoAnonima,
+    TipoPerguntaAvaliacao,
+)
+from src.modelos.bd import AvaliacaoBD
+from src.rotas.avaliacao.avaliacaoControlador import AvaliacaoControlador
+
+
+@pytest.fixture
+def colecoes(monkeypatch):
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    banco = mongomock_motor.AsyncMongoMockClient()["petBD-teste"]
+    monkeypatch.setattr(bd, "colecaoFormulariosAvaliacao", banco["formularios"])
+    monkeypatch.setattr(bd, "colecaoSubmissoesAvaliacao", banco["submissoes"])
+    monkeypatch.setattr(bd, "colecaoAgregadosAvaliacao", banco["agregados"])
+    return banco
+
+
+def _formulario() -> FormularioAvaliacaoEvento:
+    agora = datetime.now()
+    return FormularioAvaliacaoEvento(
+        _id="formulario",
+        idEvento="evento",
+        perguntas=AvaliacaoControlador._montar_perguntas_fixas(),
+        liberarApos=agora,
+        dataCriacao=agora,
+        dataAtualizacao=agora,
+    )
+
+
+def test_agregados_criados_com_o_formulario(colecoes):
+    async def teste():
+        formulario = _formulario()
+        await AvaliacaoBD.criarFormulario(formulario)
+
+        agregados = await AvaliacaoBD.buscarAgregados("evento")
+        assert agregados is not None
+        assert agregados.totalAvaliacoes == 0
+
+        escala = next(
+            p
+            for p in formulario.perguntas
+            if p.tipo == TipoPerguntaAvaliacao.ESCALA_UM_A_CINCO
+        )
+        for nota in (3, 5):
+            await AvaliacaoBD.criarSubmissaoAnonima(
+                SubmissaoAvaliacaoAnonima(
+                    _id=f"s{nota}",
+                    idEvento="evento",
+                    respostas=[
+                        RespostaPerguntaAvaliacao(
+                            idPergunta=escala.idPergunta,
+                            tipoPergunta=escala.tipo,
+                            nota=nota,
+                        )
+                    ],
+                )
+            )
+
+        agregados = await AvaliacaoBD.buscarAgregados("evento")
+        assert agregados.totalAvaliacoes == 2
+        assert agregados.perguntas[escala.idPergunta].somaNotas == 8
+
+    asyncio.run(teste())
+
+
+def test_agregados_ausentes_nao_sao_reconstruidos_na_leitura(colecoes):
+    async def teste():
+        agregados = await AvaliacaoControlador._obterAgregados("evento")
+
+        assert agregados.totalAvaliacoes == 0
+        assert await colecoes["agregados"].count_documents({}) == 0
+
+    asyncio.run(teste())
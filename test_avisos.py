@@ -0,0 +1,101 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.config import config
+from src.email import operacoesEmail
+from src.modelos import bd
+from src.modelos.bd import AvisoBD, EventoBD, FilaEmailBD
+from src.modelos.email.aviso import Aviso
+
+INSCRITOS = [
+    {"idUsuario": str(i), "nome": f"Inscrito {i}", "email": f"inscrito{i}@a.com"}
+    for i in range(5)
+]
+
+
+@pytest.fixture
+def colecoes(monkeypatch):
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    banco = mongomock_motor.AsyncMongoMockClient()["petBD-teste"]
+    monkeypatch.setattr(bd, "colecaoFilaEmails", banco["filaEmails"])
+    monkeypatch.setattr(bd, "colecaoAvisos", banco["avisos"])
+    monkeypatch.setattr(config, "LOTE_AVISOS", 2)
+
+    async def buscarDadosEmail(id: str) -> dict:
+        return {"_id": id, "titulo": "Evento", "local": "Sala", "dias": []}
+
+    async def iterarDestinatarios(idEvento: str, tamanhoLote: int):
+        for i in range(0, len(inscritos), tamanhoLote):
+            yield inscritos[i : i + tamanhoLote]
+
+    inscritos = list(INSCRITOS)
+    monkeypatch.setattr(EventoBD, "buscarDadosEmail", buscarDadosEmail)
+    monkeypatch.setattr(EventoBD, "iterarDestinatarios", iterarDestinatarios)
+    return banco, inscritos
+
+
+def _aviso(criacao: datetime | None = None) -> Aviso:
+    return Aviso(
+        _id="aviso",
+        idEvento="evento",
+        autor="autor",
+        assunto="Olá, $nome",
+        texto="Aviso do $evento",
+        criacao=criacao or datetime.now(),
+    )
+
+
+def test_distribuir_aviso(colecoes):
+    banco, _ = colecoes
+
+    async def teste():
+        aviso = _aviso()
+        await AvisoBD.criar(aviso)
+
+        assert await operacoesEmail.distribuirAviso(aviso) == len(INSCRITOS)
+
+        salvo = await AvisoBD.buscar("evento", "aviso")
+        assert salvo.destinatarios == len(INSCRITOS)
+        assert salvo.concluido
+        progresso = await FilaEmailBD.contarPorEstado(aviso="aviso")
+        assert sum(progresso.values()) == len(INSCRITOS)
+
+    asyncio.run(teste())
+
+
+def test_distribuicao_refeita_nao_repete_inscritos(colecoes):
+    banco, inscritos = colecoes
+
+    async def teste():
+        aviso = _aviso(datetime.now() - timedelta(hours=1))
+        await AvisoBD.criar(aviso)
+
+        # a primeira distribuição é interrompida após o primeiro lote
+        await FilaEmailBD.enfileirarVarios(
+            [(i["email"], "m") for i in inscritos[:2]], 1, aviso.id
+        )
+        await AvisoBD.somarDestinatarios(aviso.id, 2)
+        assert [a.id for a in await AvisoBD.buscarInterrompidos(datetime.now())] == [
+            "aviso"
+        ]
+
+        assert await operacoesEmail.distribuirAviso(aviso) == len(INSCRITOS) - 2
+
+        salvo = await AvisoBD.buscar("evento", "aviso")
+        assert salvo.destinatarios == len(INSCRITOS)
+        assert await banco["filaEmails"].count_documents({}) == len(INSCRITOS)
+        assert await AvisoBD.buscarInterrompidos(datetime.now()) == []
+
+    asyncio.run(teste())
+
+
+def test_avisos_recentes_nao_sao_retomados(colecoes):
+    async def teste():
+        await AvisoBD.criar(_aviso())
+
+        antes = datetime.now() - timedelta(minutes=config.INTERVALO_ROTINAS)
+        assert await AvisoBD.buscarInterrompidos(antes) == []
+
+    asyncio.run(teste())
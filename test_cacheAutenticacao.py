@@ -0,0 +1,107 @@
+import pytest
+
+from src.autenticacao import cacheAutenticacao
+from src.autenticacao.cacheAutenticacao import CacheTTL
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    # relógio controlado pelo teste, usado no lugar de time.monotonic
+    agora = [1000.0]
+    monkeypatch.setattr(cacheAutenticacao.time, "monotonic", lambda: agora[0])
+    return agora
+
+
+def test_descarta_menos_usado(relogio):
+    cache = CacheTTL(2, 60)
+    cache.inserir("a", 1)
+    cache.inserir("b", 2)
+    assert cache.obter("a") == 1
+
+    cache.inserir("c", 3)
+
+    assert cache.obter("b") is None
+    assert cache.obter("a") == 1
+    assert cache.obter("c") == 3
+
+
+def test_expira_apos_ttl(relogio):
+    cache = CacheTTL(10, 60)
+    cache.inserir("a", 1)
+
+    relogio[0] += 59
+    assert cache.obter("a") == 1
+
+    relogio[0] += 2
+    assert cache.obter("a") is None
+    assert cache.estatisticas() == {
+        "acertos": 1,
+        "falhas": 1,
+        "descartes": 0,
+        "tamanho": 0,
+    }
+
+
+def test_remover_e_removerSe(relogio):
+    cache = CacheTTL(10, 60)
+    cache.inserir("a", ("u1", 1))
+    cache.inserir("b", ("u1", 2))
+    cache.inserir("c", ("u2", 3))
+
+    cache.remover("c")
+    assert cache.obter("c") is None
+
+    cache.removerSe(lambda valor: valor[0] == "u1")
+    assert cache.obter("a") is None
+    assert cache.obter("b") is None
+
+
+def test_descarta_insercao_invalidada_durante_leitura(relogio):
+    cache = CacheTTL(10, 60)
+
+    geracao = cache.geracao()
+    # a entrada é invalidada enquanto o valor é lido do banco de dados
+    cache.remover("a")
+    cache.inserir("a", "antigo", geracao)
+    assert cache.obter("a") is None
+
+    # uma leitura iniciada após a invalidação é armazenada
+    cache.inserir("a", "novo", cache.geracao())
+    assert cache.obter("a") == "novo"
+    assert cache.estatisticas()["descartes"] == 1
+
+
+def test_invalidacao_de_outra_chave_nao_descarta(relogio):
+    cache = CacheTTL(10, 60)
+
+    geracao = cache.geracao()
+    cache.remover("b")
+    cache.inserir("a", 1, geracao)
+
+    assert cache.obter("a") == 1
+
+
+@pytest.mark.parametrize(
+    "invalida", [lambda c: c.removerSe(lambda v: True), CacheTTL.limpar]
+)
+def test_removerSe_e_limpar_descartam_leituras_em_andamento(relogio, invalida):
+    cache = CacheTTL(10, 60)
+
+    geracao = cache.geracao()
+    invalida(cache)
+    cache.inserir("a", 1, geracao)
+
+    assert cache.obter("a") is None
+
+
+def test_invalidacoes_esquecidas_descartam_leituras_antigas(relogio):
+    cache = CacheTTL(2, 60)
+
+    geracao = cache.geracao()
+    cache.remover("a")
+    # com mais chaves invalidadas que o tamanho do cache, a de "a" é esquecida
+    cache.remover("b")
+    cache.remover("c")
+    cache.inserir("a", 1, geracao)
+
+    assert cache.obter("a") is None
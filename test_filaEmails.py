@@ -0,0 +1,128 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.config import config
+from src.email import filaEmails
+from src.modelos import bd
+from src.modelos.bd import FilaEmailBD
+from src.modelos.email.filaEmail import EstadoEmail
+
+
+@pytest.fixture
+def espera(monkeypatch):
+    monkeypatch.setattr(config, "TENTATIVAS_MAXIMAS_EMAIL", 5)
+    monkeypatch.setattr(config, "ESPERA_INICIAL_EMAIL", 10)
+    monkeypatch.setattr(config, "ESPERA_MAXIMA_EMAIL", 60)
+    # sem a variação aleatória
+    monkeypatch.setattr(filaEmails.random, "uniform", lambda a, b: 0)
+
+
+def _segundosAte(instante: datetime) -> float:
+    return round((instante - datetime.now()).total_seconds())
+
+
+def test_proxima_tentativa_espera_exponencial(espera):
+    assert _segundosAte(filaEmails._proximaTentativa(1)) == 10
+    assert _segundosAte(filaEmails._proximaTentativa(2)) == 20
+    assert _segundosAte(filaEmails._proximaTentativa(3)) == 40
+
+
+def test_proxima_tentativa_limitada(espera):
+    assert _segundosAte(filaEmails._proximaTentativa(4)) == 60
+
+
+def test_proxima_tentativa_descarta_apos_maximo(espera):
+    assert filaEmails._proximaTentativa(5) is None
+    assert filaEmails._proximaTentativa(6) is None
+
+
+def test_proxima_tentativa_variacao(espera, monkeypatch):
+    monkeypatch.setattr(filaEmails.random, "uniform", lambda a, b: b)
+
+    assert _segundosAte(filaEmails._proximaTentativa(1)) == 11
+
+
+@pytest.fixture
+def fila(monkeypatch):
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    colecao = mongomock_motor.AsyncMongoMockClient()["petBD-teste"]["filaEmails"]
+    monkeypatch.setattr(bd, "colecaoFilaEmails", colecao)
+    return colecao
+
+
+def test_reservar_prioridade_e_exclusividade(fila):
+    async def teste():
+        await FilaEmailBD.enfileirarVarios([("massa@a.com", "m")], prioridade=1)
+        await FilaEmailBD.enfileirar("urgente@a.com", "m")
+
+        primeiro = await FilaEmailBD.reservar("a", 1, timedelta(minutes=1))
+        segundo = await FilaEmailBD.reservar("b", 5, timedelta(minutes=1))
+        terceiro = await FilaEmailBD.reservar("c", 5, timedelta(minutes=1))
+
+        assert [e.destino for e in primeiro] == ["urgente@a.com"]
+        assert [e.destino for e in segundo] == ["massa@a.com"]
+        assert terceiro == []
+        assert primeiro[0].estado == EstadoEmail.ENVIANDO
+        assert primeiro[0].tentativas == 1
+        assert primeiro[0].reserva != segundo[0].reserva
+
+    asyncio.run(teste())
+
+
+def test_reserva_expirada_nao_registra_resultado(fila):
+    async def teste():
+        await FilaEmailBD.enfileirar("a@a.com", "m")
+
+        # a concessão expira e o mesmo entregador reserva o e-mail de novo
+        (antiga,) = await FilaEmailBD.reservar("a", 1, timedelta(seconds=-1))
+        (nova,) = await FilaEmailBD.reservar("a", 1, timedelta(minutes=1))
+
+        assert nova.tentativas == 2
+        assert not await FilaEmailBD.marcarEnviado(antiga.id, antiga.reserva)
+        assert not await FilaEmailBD.marcarFalha(antiga.id, antiga.reserva, "x", None)
+
+        assert await FilaEmailBD.marcarEnviado(nova.id, nova.reserva)
+        documento = await fila.find_one({"_id": nova.id})
+        assert documento["estado"] == EstadoEmail.ENVIADO
+        assert "reserva" not in documento
+        assert "mensagem" not in documento
+
+    asyncio.run(teste())
+
+
+def test_falha_devolve_a_fila(fila):
+    async def teste():
+        await FilaEmailBD.enfileirar("a@a.com", "m")
+        (email,) = await FilaEmailBD.reservar("a", 1, timedelta(minutes=1))
+
+        depois = datetime.now() + timedelta(minutes=5)
+        assert await FilaEmailBD.marcarFalha(email.id, email.reserva, "erro", depois)
+
+        # pendente, mas só pode ser reservado após a próxima tentativa
+        assert await FilaEmailBD.reservar("a", 1, timedelta(minutes=1)) == []
+        documento = await fila.find_one({"_id": email.id})
+        assert documento["estado"] == EstadoEmail.PENDENTE
+        assert documento["ultimoErro"] == "erro"
+
+    asyncio.run(teste())
+
+
+def test_falha_definitiva(fila):
+    async def teste():
+        await FilaEmailBD.enfileirar("a@a.com", "m")
+        (email,) = await FilaEmailBD.reservar("a", 1, timedelta(minutes=1))
+
+        assert await FilaEmailBD.marcarFalha(email.id, email.reserva, "erro", None)
+
+        assert (await FilaEmailBD.contarPorEstado())[EstadoEmail.FALHOU] == 1
+        assert await FilaEmailBD.reservar("a", 1, timedelta(minutes=1)) == []
+
+    asyncio.run(teste())
+
+
+def test_para_entregador_sem_entregador():
+    # sem entregador em execução, os sinais ainda não existem
+    filaEmails.paraEntregador()
+    filaEmails._acorda()
@@ -4,15 +4,22 @@ import os
 os.environ["PET_API_MOCK_EMAIL"] = "true"
 os.environ["PET_API_MOCK_BD"] = "true"
 
+import pytest
 from fastapi.testclient import TestClient
 
 from main import petBack
 
 
-testClient = TestClient(petBack)
+@pytest.fixture(scope="module")
+def testClient():
+    # o gerenciador de contexto executa o ciclo de vida da aplicação (criação
+    # dos índices e do banco de testes) e mantém um único event loop entre as
+    # requisições, ao qual o cliente do banco de dados fica associado.
+    with TestClient(petBack) as cliente:
+        yield cliente
 
 
-def test_criar_usuario():
+def test_criar_usuario(testClient: TestClient):
     response = testClient.post(
         "/usuarios",
         json={
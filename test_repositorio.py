@@ -0,0 +1,104 @@
+import io
+
+import pytest
+
+from src.config import config
+from src.img.repositorio import Repositorio, RepositorioLocal, RepositorioS3
+
+
+class ArquivoComFalha(io.BytesIO):
+    """Arquivo cuja leitura falha após o primeiro bloco."""
+
+    def __init__(self, conteudo: bytes) -> None:
+        super().__init__(conteudo)
+        self.lidos = 0
+
+    def read(self, tamanho: int = -1) -> bytes:
+        if self.lidos:
+            raise OSError("falha de leitura")
+        self.lidos += 1
+        return super().read(tamanho)
+
+
+def test_repositorio_e_abstrato():
+    with pytest.raises(TypeError):
+        Repositorio()
+
+
+def test_local_grava_e_le(tmp_path):
+    repositorio = RepositorioLocal(tmp_path)
+
+    repositorio.grava("objetos/ab/abc.png", io.BytesIO(b"conteudo"))
+
+    assert repositorio.existe("objetos/ab/abc.png")
+    assert repositorio.info("objetos/ab/abc.png").tamanho == len(b"conteudo")
+    assert b"".join(repositorio.blocos("objetos/ab/abc.png")) == b"conteudo"
+    assert repositorio.remove("objetos/ab/abc.png")
+    assert not repositorio.existe("objetos/ab/abc.png")
+    assert not repositorio.remove("objetos/ab/abc.png")
+    assert repositorio.info("objetos/ab/abc.png") is None
+
+
+def test_local_gravacao_interrompida_preserva_arquivo(tmp_path):
+    repositorio = RepositorioLocal(tmp_path)
+    repositorio.grava("foto.png", io.BytesIO(b"antigo"))
+
+    with pytest.raises(OSError):
+        repositorio.grava("foto.png", ArquivoComFalha(b"x" * 200_000))
+
+    # o arquivo anterior continua inteiro e o temporário é removido
+    assert (tmp_path / "foto.png").read_bytes() == b"antigo"
+    assert [p.name for p in tmp_path.iterdir()] == ["foto.png"]
+
+
+def test_local_gravacao_substitui_arquivo(tmp_path):
+    repositorio = RepositorioLocal(tmp_path)
+    repositorio.grava("foto.png", io.BytesIO(b"antigo"))
+
+    repositorio.grava("foto.png", io.BytesIO(b"novo"))
+
+    assert (tmp_path / "foto.png").read_bytes() == b"novo"
+    assert [p.name for p in tmp_path.iterdir()] == ["foto.png"]
+
+
+@pytest.fixture
+def repositorioS3(monkeypatch):
+    moto = pytest.importorskip("moto")
+    boto3 = pytest.importorskip("boto3")
+
+    monkeypatch.setattr(config, "S3_BUCKET", "pet-teste")
+    monkeypatch.setattr(config, "S3_ENDPOINT", None)
+    monkeypatch.setattr(config, "S3_REGIAO", "us-east-1")
+    monkeypatch.setattr(config, "S3_CHAVE_ACESSO", "teste")
+    monkeypatch.setattr(config, "S3_SEGREDO", "teste")
+
+    with moto.mock_aws():
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket="pet-teste")
+        yield RepositorioS3()
+
+
+def test_s3_grava_e_le(repositorioS3):
+    repositorioS3.grava("objetos/ab/abc.png", io.BytesIO(b"conteudo"), "image/png")
+
+    assert repositorioS3.existe("objetos/ab/abc.png")
+    info = repositorioS3.info("objetos/ab/abc.png")
+    assert info.tamanho == len(b"conteudo")
+    assert info.etag
+    assert b"".join(repositorioS3.blocos("objetos/ab/abc.png")) == b"conteudo"
+    assert "objetos/ab/abc.png" in repositorioS3.urlAssinada("objetos/ab/abc.png", 60)
+    assert repositorioS3.caminhoLocal("objetos/ab/abc.png") is None
+
+
+def test_s3_arquivo_inexistente(repositorioS3):
+    assert not repositorioS3.existe("nao/existe.png")
+    assert repositorioS3.info("nao/existe.png") is None
+    assert not repositorioS3.remove("nao/existe.png")
+    with pytest.raises(FileNotFoundError):
+        repositorioS3.abre("nao/existe.png")
+
+
+def test_s3_remove(repositorioS3):
+    repositorioS3.grava("foto.png", io.BytesIO(b"conteudo"))
+
+    assert repositorioS3.remove("foto.png")
+    assert not repositorioS3.existe("foto.png")
@@ -0,0 +1,193 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+import rotinas
+from src.config import config
+from src.modelos import bd
+from src.modelos.bd import AvaliacaoBD, EventoBD, RotinaBD
+from src.modelos.excecao import NaoEncontradoExcecao
+
+# sem os microssegundos, que o MongoDB não armazena
+AGORA = datetime.now().replace(microsecond=0)
+
+
+class Avancos:
+    """Registra as chamadas de `avanca` feitas por uma rotina."""
+
+    def __init__(self) -> None:
+        self.marcas: list[datetime] = []
+        self.renovacoes = 0
+
+    async def __call__(self, marca: datetime | None = None) -> None:
+        self.renovacoes += 1
+        if marca is not None:
+            self.marcas.append(marca)
+
+
+@pytest.fixture
+def inscritos(monkeypatch):
+    monkeypatch.setattr(config, "LOTE_AVISOS", 2)
+
+    async def iterarDestinatarios(idEvento: str, tamanhoLote: int):
+        destinatarios = [{"nome": "Inscrito", "email": f"{idEvento}@a.com"}] * 3
+        for i in range(0, len(destinatarios), tamanhoLote):
+            yield destinatarios[i : i + tamanhoLote]
+
+    monkeypatch.setattr(EventoBD, "iterarDestinatarios", iterarDestinatarios)
+
+
+@pytest.fixture
+def lembretes(monkeypatch, inscritos):
+    eventos = [
+        {"_id": "a", "inicioEvento": AGORA + timedelta(hours=1)},
+        {"_id": "b", "inicioEvento": AGORA + timedelta(hours=2)},
+        {"_id": "c", "inicioEvento": AGORA + timedelta(hours=2)},
+        {"_id": "d", "inicioEvento": AGORA + timedelta(hours=3)},
+    ]
+
+    async def buscarIniciandoEntre(inicio: datetime, fim: datetime) -> list[dict]:
+        return [e for e in eventos if inicio < e["inicioEvento"] <= fim]
+
+    enviados = []
+
+    async def enviarEmailsLembreteEvento(destinatarios: list, evento: dict) -> int:
+        if evento["_id"] == falhaEm[0]:
+            raise RuntimeError("falha no envio")
+        enviados.append(evento["_id"])
+        return len(destinatarios)
+
+    falhaEm = [None]
+    monkeypatch.setattr(EventoBD, "buscarIniciandoEntre", buscarIniciandoEntre)
+    monkeypatch.setattr(
+        rotinas, "enviarEmailsLembreteEvento", enviarEmailsLembreteEvento
+    )
+    return eventos, enviados, falhaEm
+
+
+def test_lembretes_avancam_marca_por_inicio(lembretes):
+    eventos, enviados, _ = lembretes
+    avanca = Avancos()
+
+    marca = asyncio.run(rotinas.enviaLembretesEventos(AGORA, avanca))
+
+    assert sorted(set(enviados)) == ["a", "b", "c", "d"]
+    # eventos com o mesmo início avançam a marca juntos
+    assert avanca.marcas == [eventos[0]["inicioEvento"], eventos[1]["inicioEvento"]]
+    assert avanca.renovacoes == 2 + 4 * 2
+    assert marca > eventos[3]["inicioEvento"]
+
+
+def test_lembretes_retomados_apos_a_marca(lembretes):
+    eventos, enviados, falhaEm = lembretes
+    avanca = Avancos()
+
+    falhaEm[0] = "c"
+    with pytest.raises(RuntimeError):
+        asyncio.run(rotinas.enviaLembretesEventos(AGORA, avanca))
+    assert avanca.marcas == [eventos[0]["inicioEvento"]]
+
+    # a execução seguinte recomeça dos eventos após a última marca registrada
+    enviados.clear()
+    falhaEm[0] = None
+    asyncio.run(rotinas.enviaLembretesEventos(avanca.marcas[-1], Avancos()))
+    assert sorted(set(enviados)) == ["b", "c", "d"]
+
+
+def test_avisos_avaliacao_avancam_marca(monkeypatch, inscritos):
+    formularios = [
+        {"idEvento": "a", "liberarApos": AGORA - timedelta(minutes=3)},
+        {"idEvento": "removido", "liberarApos": AGORA - timedelta(minutes=2)},
+        {"idEvento": "b", "liberarApos": AGORA - timedelta(minutes=1)},
+    ]
+
+    async def buscarFormulariosLiberadosEntre(inicio: datetime, fim: datetime):
+        return [f for f in formularios if inicio < f["liberarApos"] <= fim]
+
+    async def buscarDadosEmail(id: str) -> dict:
+        if id == "removido":
+            raise NaoEncontradoExcecao(message="O evento não foi encontrado.")
+        return {"_id": id, "titulo": f"Evento {id}", "local": "", "dias": []}
+
+    titulos = []
+
+    async def enviarEmailsAvaliacaoLiberada(destinatarios: list, titulo: str) -> int:
+        titulos.append(titulo)
+        return len(destinatarios)
+
+    monkeypatch.setattr(
+        AvaliacaoBD, "buscarFormulariosLiberadosEntre", buscarFormulariosLiberadosEntre
+    )
+    monkeypatch.setattr(EventoBD, "buscarDadosEmail", buscarDadosEmail)
+    monkeypatch.setattr(
+        rotinas, "enviarEmailsAvaliacaoLiberada", enviarEmailsAvaliacaoLiberada
+    )
+    avanca = Avancos()
+
+    marca = asyncio.run(
+        rotinas.enviaAvisosAvaliacao(AGORA - timedelta(minutes=5), avanca)
+    )
+
+    assert titulos == ["Evento a", "Evento a", "Evento b", "Evento b"]
+    assert avanca.marcas == [f["liberarApos"] for f in formularios[:2]]
+    assert marca >= formularios[2]["liberarApos"]
+
+
+@pytest.fixture
+def colecaoRotinas(monkeypatch):
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    colecao = mongomock_motor.AsyncMongoMockClient()["petBD-teste"]["rotinas"]
+    monkeypatch.setattr(bd, "colecaoRotinas", colecao)
+    return colecao
+
+
+def test_executa_rotina_registra_marca_parcial(colecaoRotinas):
+    parcial, final = AGORA - timedelta(minutes=1), AGORA
+
+    async def rotina(marca, avanca):
+        await avanca(parcial)
+        documento = await colecaoRotinas.find_one({"_id": "teste"})
+        assert documento["marca"] == parcial
+        assert documento["concessaoAte"] > datetime.now()
+        return final
+
+    async def teste():
+        await rotinas.executaRotina("teste", timedelta(minutes=15), rotina)
+        documento = await colecaoRotinas.find_one({"_id": "teste"})
+        assert documento["marca"] == final
+        assert "concessaoAte" not in documento
+
+    asyncio.run(teste())
+
+
+def test_executa_rotina_para_se_reserva_perdida(colecaoRotinas):
+    async def rotina(marca, avanca):
+        # a reserva expira e outro processo assume a rotina
+        await colecaoRotinas.update_one(
+            {"_id": "teste"}, {"$set": {"responsavel": "outro"}}
+        )
+        await avanca(AGORA)
+        raise AssertionError("a rotina deveria ter sido interrompida")
+
+    async def teste():
+        await rotinas.executaRotina("teste", timedelta(minutes=15), rotina)
+        documento = await colecaoRotinas.find_one({"_id": "teste"})
+        assert documento["responsavel"] == "outro"
+        assert "marca" not in documento
+        assert "ultimaExecucao" not in documento
+
+    asyncio.run(teste())
+
+
+def test_renovar_apos_liberar(colecaoRotinas):
+    async def teste():
+        concessao = timedelta(minutes=1)
+        await RotinaBD.adquirir("teste", "eu", concessao, timedelta(0))
+        assert await RotinaBD.renovar("teste", "eu", concessao)
+        assert not await RotinaBD.renovar("teste", "outro", concessao)
+
+        await RotinaBD.liberar("teste", "eu")
+        assert not await RotinaBD.renovar("teste", "eu", concessao)
+
+    asyncio.run(teste())
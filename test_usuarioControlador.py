@@ -0,0 +1,72 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from src.autenticacao.autenticacao import conferirHashSenha, hashSenha
+from src.modelos import bd
+from src.modelos.bd import UsuarioBD
+from src.modelos.usuario.usuario import TipoConta, Usuario
+from src.modelos.usuario.usuarioClad import UsuarioAtualizarSenha
+from src.rotas.usuario import usuarioControlador
+from src.rotas.usuario.usuarioControlador import UsuarioControlador
+
+
+@pytest.fixture
+def usuarios(monkeypatch):
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    colecao = mongomock_motor.AsyncMongoMockClient()["petBD-teste"]["usuarios"]
+    monkeypatch.setattr(bd, "colecaoUsuarios", colecao)
+
+    async def enviarEmailAlteracaoDados(*args):
+        pass
+
+    monkeypatch.setattr(
+        usuarioControlador, "enviarEmailAlteracaoDados", enviarEmailAlteracaoDados
+    )
+    return colecao
+
+
+def _usuario(**campos) -> Usuario:
+    dados = {
+        "_id": "u",
+        "email": "u@a.com",
+        "emailConfirmado": True,
+        "cpf": "00000000000",
+        "nome": "Usuário",
+        "tipoConta": TipoConta.EXTERNO,
+        "dataCriacao": datetime(2024, 1, 1),
+        "senha": hashSenha("Senha@antiga1"),
+    }
+    return Usuario(**(dados | campos))
+
+
+def test_edita_senha_nao_grava_usuario_desatualizado(usuarios):
+    async def teste():
+        # o usuário autenticado foi lido antes de ser promovido por outro processo
+        desatualizado = _usuario()
+        await usuarios.insert_one(
+            _usuario(tipoConta=TipoConta.PETIANO).model_dump(by_alias=True)
+        )
+
+        dados = UsuarioAtualizarSenha(senha="Senha@antiga1", novaSenha="Senha@nova12")
+        await UsuarioControlador.editaSenha(dados, desatualizado)
+
+        documento = await usuarios.find_one({"_id": "u"})
+        assert documento["tipoConta"] == TipoConta.PETIANO
+        assert conferirHashSenha("Senha@nova12", documento["senha"])
+
+    asyncio.run(teste())
+
+
+def test_atualizar_nao_grava_foto(usuarios):
+    async def teste():
+        await usuarios.insert_one(_usuario(foto="nova").model_dump(by_alias=True))
+
+        await UsuarioBD.atualizar(_usuario(foto="antiga", nome="Outro nome"))
+
+        documento = await usuarios.find_one({"_id": "u"})
+        assert documento["foto"] == "nova"
+        assert documento["nome"] == "Outro nome"
+
+    asyncio.run(teste())